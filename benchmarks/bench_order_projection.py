@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark for field-projected decoding of ordersBulk pages.
+
+Compares, over one or more recorded pages (a whole day, say):
+- decode time of full orders (server.json_backend) against each order projection in
+  server/order_projection.py, decoded whole and, when ijson is installed, streamed
+- memory retained by the decoded orders of all pages, and the peak memory of decoding
+  one page (measured with tracemalloc)
+
+Usage examples:
+- Synthetic page of 100 orders: python benchmarks/bench_order_projection.py
+- Recorded pages: python benchmarks/bench_order_projection.py --page day1_page1.json day1_page2.json
+- Every ordersBulk page in a cassette: python benchmarks/bench_order_projection.py --cassette cassettes/june.jsonl.gz
+"""
+import os
+import sys
+import gzip
+import json
+import base64
+import timeit
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from server import json_backend
+from server import order_projection
+from benchmarks.bench_response_decoding import synthetic_page
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark projected decoding of ordersBulk pages")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--page", nargs="+", help="Recorded ordersBulk response bodies (JSON). Defaults to a synthetic page.")
+    source.add_argument("--cassette", help="Cassette recorded with TOAST_TRANSPORT_MODE=record; its ordersBulk responses are used")
+    parser.add_argument("--orders", type=int, default=100, help="Orders in the synthetic page (default: 100)")
+    parser.add_argument("--repeat", type=int, default=20, help="Decode iterations per measurement (default: 20)")
+    return parser.parse_args()
+
+
+def cassette_pages(path: str) -> list:
+    """Read the successful ordersBulk response bodies from a cassette."""
+    pages = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            interaction = json_backend.loads(line)
+            if "/orders/v2/ordersBulk" not in interaction["url"] or interaction["status"] != 200:
+                continue
+            if interaction.get("body_encoding") == "base64":
+                pages.append(base64.b64decode(interaction["body"]))
+            else:
+                pages.append(interaction["body"].encode("utf-8"))
+    return pages
+
+
+def measure(decode, pages: list, repeat: int):
+    """
+    Time and trace decoding every page.
+
+    Returns:
+        Tuple of (ms per page, KiB retained by the decoded pages, peak KiB while decoding one page)
+    """
+    seconds = timeit.timeit(lambda: [decode(body) for body in pages], number=repeat)
+
+    tracemalloc.start()
+    peak = 0
+    decoded = []
+    for body in pages:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        decoded.append(decode(body))
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / repeat / len(pages) * 1000, retained / 1024, peak / 1024
+
+
+def main():
+    args = parse_args()
+
+    if args.page:
+        pages = []
+        for path in args.page:
+            with open(path, "rb") as f:
+                pages.append(f.read())
+        source = ", ".join(args.page)
+    elif args.cassette:
+        pages = cassette_pages(args.cassette)
+        source = args.cassette
+        if not pages:
+            sys.exit(f"No ordersBulk responses in {args.cassette}")
+    else:
+        pages = [json.dumps(synthetic_page(args.orders)).encode("utf-8")]
+        source = f"synthetic page of {args.orders} orders"
+
+    decoded = [json_backend.loads(body) for body in pages]
+    order_count = sum(len(page if isinstance(page, list) else page.get("orders", [])) for page in decoded)
+    del decoded
+    print(f"Pages: {source}")
+    print(f"{len(pages)} pages, {order_count:,} orders, {sum(len(body) for body in pages):,} bytes")
+    print()
+
+    rows = [("full orders", json_backend.loads)]
+    for projection in order_projection.PROJECTIONS.values():
+        rows.append((f"{projection.name}", lambda body, p=projection: p.parse(body)))
+        if order_projection.ijson is not None:
+            rows.append((f"{projection.name}, streamed", lambda body, p=projection: p.parse(body, streaming=True)))
+    if order_projection.ijson is None:
+        print("(ijson not installed: streamed projections skipped)")
+
+    print(f"{'':<26}{'ms/page':>10}{'retained KiB':>15}{'per order':>11}{'peak KiB/page':>15}")
+    full_ms = full_retained = None
+    for name, decode in rows:
+        ms, retained, peak = measure(decode, pages, args.repeat)
+        if full_ms is None:
+            full_ms, full_retained = ms, retained
+            versus = ""
+        else:
+            versus = f"  ({ms / full_ms:.2f}x time, {retained / full_retained:.0%} memory)"
+        print(f"  {name + ':':<24}{ms:10.3f}{retained:15,.0f}{retained * 1024 / max(1, order_count):10,.0f}B"
+              f"{peak:15,.0f}{versus}")
+    print()
+    print(f"JSON backend: {json_backend.BACKEND}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for Toast response transfer size and JSON decoding.
+
+Compares, for one ordersBulk page:
+- bytes on the wire uncompressed, with gzip, and with brotli (when installed)
+- decode time of the old path (bytes -> str -> json.loads, as response.json() does)
+  against the server.json_backend path (orjson on raw bytes, when installed)
+
+Usage examples:
+- Synthetic page of 100 orders: python benchmarks/bench_response_decoding.py
+- Recorded page: python benchmarks/bench_response_decoding.py --page ordersBulk_page1.json
+"""
+import os
+import sys
+import gzip
+import json
+import random
+import timeit
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from server import json_backend
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark compressed transfer and JSON decoding of an ordersBulk page")
+    parser.add_argument("--page", help="Recorded ordersBulk response body (JSON). Defaults to a synthetic page.")
+    parser.add_argument("--orders", type=int, default=100, help="Orders in the synthetic page (default: 100)")
+    parser.add_argument("--repeat", type=int, default=200, help="Decode iterations per measurement (default: 200)")
+    return parser.parse_args()
+
+
+def synthetic_page(order_count: int) -> list:
+    """Build a deterministic ordersBulk page shaped like real Toast orders."""
+    rng = random.Random(0)
+
+    def guid():
+        return "%08x-%04x-%04x-%04x-%012x" % (rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(16),
+                                              rng.getrandbits(16), rng.getrandbits(48))
+
+    def ref():
+        return {"guid": guid(), "entityType": "MenuItem", "externalId": None}
+
+    orders = []
+    for _ in range(order_count):
+        checks = []
+        for _ in range(rng.randint(1, 3)):
+            selections = [{
+                "guid": guid(),
+                "entityType": "MenuItemSelection",
+                "item": ref(),
+                "itemGroup": ref(),
+                "salesCategory": ref(),
+                "displayName": rng.choice(["Burger", "Caesar Salad", "IPA Draft", "House Red", "Fries", "Espresso"]),
+                "quantity": rng.randint(1, 3),
+                "price": round(rng.uniform(3, 40), 2),
+                "preDiscountPrice": round(rng.uniform(3, 40), 2),
+                "tax": round(rng.uniform(0, 4), 2),
+                "voided": False,
+                "appliedDiscounts": [],
+                "modifiers": [],
+                "createdDate": "2025-06-24T19:12:45.123+0000",
+                "modifiedDate": "2025-06-24T19:12:45.123+0000",
+            } for _ in range(rng.randint(1, 8))]
+            amount = round(sum(s["price"] for s in selections), 2)
+            tip = round(amount * rng.choice([0, 0.15, 0.18, 0.2]), 2)
+            checks.append({
+                "guid": guid(),
+                "entityType": "Check",
+                "amount": amount,
+                "totalAmount": round(amount * 1.0875 + tip, 2),
+                "taxAmount": round(amount * 0.0875, 2),
+                "selections": selections,
+                "appliedServiceCharges": [],
+                "payments": [{
+                    "guid": guid(),
+                    "entityType": "OrderPayment",
+                    "type": "CREDIT",
+                    "amount": round(amount * 1.0875, 2),
+                    "tipAmount": tip,
+                    "paymentStatus": "CAPTURED",
+                    "paidDate": "2025-06-24T20:02:11.456+0000",
+                    "paidBusinessDate": 20250624,
+                    "server": {"guid": guid(), "entityType": "RestaurantUser"},
+                    "voidInfo": None,
+                }],
+            })
+        orders.append({
+            "guid": guid(),
+            "entityType": "Order",
+            "openedDate": "2025-06-24T18:55:02.000+0000",
+            "paidDate": "2025-06-24T20:02:11.456+0000",
+            "businessDate": 20250624,
+            "voided": False,
+            "server": {"guid": guid(), "entityType": "RestaurantUser"},
+            "diningOption": ref(),
+            "revenueCenter": ref(),
+            "checks": checks,
+        })
+    return orders
+
+
+def time_decode(func, body: bytes, repeat: int) -> float:
+    """Average milliseconds per decode."""
+    return timeit.timeit(lambda: func(body), number=repeat) / repeat * 1000
+
+
+def main():
+    args = parse_args()
+
+    if args.page:
+        with open(args.page, "rb") as f:
+            body = f.read()
+        source = args.page
+    else:
+        body = json.dumps(synthetic_page(args.orders)).encode("utf-8")
+        source = f"synthetic page of {args.orders} orders"
+
+    print(f"Page: {source}")
+    print()
+    print("Bytes on the wire")
+    print(f"  identity: {len(body):>10,}")
+    gzipped = gzip.compress(body, compresslevel=6)
+    print(f"  gzip:     {len(gzipped):>10,}  ({len(gzipped) / len(body):.1%})")
+    if brotli is not None:
+        brotlied = brotli.compress(body, quality=5)
+        print(f"  br:       {len(brotlied):>10,}  ({len(brotlied) / len(body):.1%})")
+    else:
+        print("  br:       (brotli not installed)")
+
+    print()
+    print(f"Decode time per page ({args.repeat} iterations)")
+    before = time_decode(lambda b: json.loads(b.decode("utf-8")), body, args.repeat)
+    after = time_decode(json_backend.loads, body, args.repeat)
+    gunzip = time_decode(gzip.decompress, gzipped, args.repeat)
+    print(f"  {'before (str + json.loads):':<34}{before:8.3f} ms")
+    print(f"  {f'after (json_backend, {json_backend.BACKEND}):':<34}{after:8.3f} ms  ({before / after:.1f}x)")
+    print(f"  {'gzip decompression overhead:':<34}{gunzip:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
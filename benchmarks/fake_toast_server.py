@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Toast API, serving deterministic synthetic restaurants.
+
+Implements the endpoints ToastAPIClient uses:
+- POST /authentication/v1/authentication/login
+- GET  /orders/v2/ordersBulk   (page, pageSize, businessDate or startDate/endDate)
+- GET  /labor/v1/employees     (optional employeeIds)
+- GET  /labor/v1/jobs          (optional jobIds)
+- GET  /labor/v1/timeEntries   (startDate/endDate or businessDate)
+- GET  /menus/v2/menus
+
+Every restaurant GUID sent in Toast-Restaurant-External-ID gets its own synthetic
+restaurant, generated from the seed and the GUID, so the same request always gets the
+same data. Orders only appear once they are closed, so the current business day fills
+in as the day goes on, and startDate/endDate select orders by modification time as on
+the real API. Responses are gzip-compressed when the client accepts it, directory endpoints
+answer If-None-Match with 304, and 429s, 5xx errors and latency can be injected.
+
+Usage examples:
+- Start the server: python benchmarks/fake_toast_server.py --port 8766 --orders-per-day 800
+- With faults:      python benchmarks/fake_toast_server.py --error-rate-429 0.05 --error-rate-5xx 0.02 --latency-ms 150
+- Point the client at it:
+    TOAST_API_BASE_URL=http://127.0.0.1:8766 \\
+    TOAST_AUTH_URL=http://127.0.0.1:8766/authentication/v1/authentication/login \\
+    TOAST_CLIENT_ID=local TOAST_CLIENT_SECRET=local TOAST_LOCATION_INDEX=1 \\
+    python functions/get_tips/get_tips.py --dates 2025-06-01 2025-06-07 --output tips.json
+"""
+import os
+import sys
+import gzip
+import time
+import uuid
+import random
+import hashlib
+import datetime
+import argparse
+import threading
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from flask import Flask, Response, request
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from server import json_backend
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("fake-toast")
+
+# Synthetic restaurants keep business hours in this UTC offset (Pacific daylight time)
+UTC_OFFSET_HOURS = -7
+
+# Largest pageSize ordersBulk accepts, as on the real API
+MAX_PAGE_SIZE = 100
+
+JOB_TITLES = ["Server", "Bartender", "Host", "Busser", "Line Cook", "Dishwasher", "Manager"]
+TIPPED_JOB_TITLES = {"Server", "Bartender", "Busser"}
+FIRST_NAMES = ["Ana", "Ben", "Carla", "Dev", "Elena", "Femi", "Gus", "Hana", "Ivan", "Jo", "Kai", "Lena",
+               "Marco", "Nia", "Omar", "Pia", "Quinn", "Rosa", "Sam", "Tara", "Uma", "Vic", "Wes", "Yara"]
+LAST_NAMES = ["Alvarez", "Brooks", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Jones",
+              "Khan", "Lopez", "Moreau", "Nguyen", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Weber"]
+MENU = {
+    "Food": ["Burger", "Caesar Salad", "Fries", "Margherita Pizza", "Steak Frites", "Fish Tacos", "Soup of the Day"],
+    "NA Beverage": ["Espresso", "Iced Tea", "Lemonade", "Sparkling Water"],
+    "Liquor": ["Margarita", "Old Fashioned", "Negroni"],
+    "Draft Beer": ["IPA Draft", "Pilsner Draft"],
+    "Wine": ["House Red", "House White", "Prosecco"]
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local Toast API stand-in with deterministic synthetic data")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on (default: 8766)")
+    parser.add_argument("--seed", default="toast", help="Seed for the synthetic data (default: toast)")
+
+    size = parser.add_argument_group("restaurant size")
+    size.add_argument("--orders-per-day", type=int, default=300, help="Orders per business day (default: 300)")
+    size.add_argument("--max-checks", type=int, default=2, help="Most checks per order (default: 2)")
+    size.add_argument("--max-payments", type=int, default=2, help="Most payments per check (default: 2)")
+    size.add_argument("--max-selections", type=int, default=6, help="Most selections per check (default: 6)")
+    size.add_argument("--employees", type=int, default=40, help="Employees per restaurant (default: 40)")
+
+    faults = parser.add_argument_group("fault injection (data endpoints only)")
+    faults.add_argument("--error-rate-429", type=float, default=0.0, help="Fraction of requests answered with 429 (default: 0)")
+    faults.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with injected 429s (default: 1)")
+    faults.add_argument("--error-rate-5xx", type=float, default=0.0, help="Fraction of requests answered with 500/502/503 (default: 0)")
+    faults.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every request (default: 0)")
+    faults.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Random extra latency up to this much (default: 0)")
+    faults.add_argument("--latency-per-order-ms", type=float, default=0.0,
+                        help="Extra latency per order on an ordersBulk page, to model page size cost (default: 0)")
+    faults.add_argument("--latency-per-entry-ms", type=float, default=0.0,
+                        help="Extra latency per time entry in a timeEntries response, to model range size cost (default: 0)")
+    faults.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of requests that are very slow (default: 0)")
+    faults.add_argument("--tail-latency-ms", type=float, default=5000.0, help="Latency of the slow requests (default: 5000)")
+    return parser.parse_args()
+
+
+def _guid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _toast_timestamp(moment: datetime.datetime) -> str:
+    """Format a UTC datetime the way Toast does (2025-06-24T19:12:45.123+0000)."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}+0000"
+
+
+def _parse_iso(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 query parameter into a naive UTC datetime."""
+    value = value.strip().replace("Z", "+00:00")
+    if len(value) > 5 and value[-5] in "+-" and value[-3] != ":":
+        value = f"{value[:-2]}:{value[-2:]}"
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+class SyntheticRestaurant:
+    """Deterministic employees, jobs, menu, orders and time entries for one restaurant GUID."""
+
+    def __init__(self, restaurant_guid: str, settings: argparse.Namespace):
+        self.guid = restaurant_guid
+        self.settings = settings
+        rng = self._rng("directory")
+
+        self.jobs = [{
+            "guid": _guid(rng),
+            "entityType": "RestaurantJob",
+            "title": title,
+            "tipped": title in TIPPED_JOB_TITLES,
+            "deleted": False
+        } for title in JOB_TITLES]
+
+        self.employees = []
+        for i in range(settings.employees):
+            # Every job gets one employee first; the rest lean front-of-house (Server, Bartender, Host)
+            job = self.jobs[i] if i < len(self.jobs) else rng.choice(self.jobs[:3] + self.jobs)
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            self.employees.append({
+                "guid": _guid(rng),
+                "entityType": "RestaurantUser",
+                "firstName": first_name,
+                "lastName": last_name,
+                "chosenName": first_name if rng.random() < 0.1 else None,
+                "email": f"{first_name.lower()}.{last_name.lower()}{i}@example.com",
+                "externalEmployeeId": f"E{1000 + i}",
+                "jobReferences": [{"guid": job["guid"], "entityType": "RestaurantJob", "externalId": None}],
+                "deleted": False
+            })
+        jobs_by_guid = {job["guid"]: job for job in self.jobs}
+        self.servers = [employee for employee in self.employees
+                        if jobs_by_guid[employee["jobReferences"][0]["guid"]]["title"] in ("Server", "Bartender")]
+
+        self.sales_categories = {name: _guid(rng) for name in MENU}
+        self.menu_items = []
+        menu_groups = []
+        for category, names in MENU.items():
+            items = [{
+                "guid": _guid(rng),
+                "name": name,
+                "price": round(rng.uniform(4, 38), 2),
+                "salesCategory": {"guid": self.sales_categories[category], "name": category}
+            } for name in names]
+            self.menu_items.extend(items)
+            menu_groups.append({"guid": _guid(rng), "name": category, "menuItems": items})
+        self.menus = {
+            "restaurantGuid": restaurant_guid,
+            "lastUpdated": "2025-01-01T00:00:00.000+0000",
+            "menus": [{"guid": _guid(rng), "name": "All Day", "menuGroups": menu_groups}]
+        }
+
+    def _rng(self, *parts: Any) -> random.Random:
+        """Random generator seeded by the server seed, this restaurant and parts."""
+        return random.Random(":".join(str(part) for part in (self.settings.seed, self.guid) + parts))
+
+    @staticmethod
+    def _local_to_utc(business_date: datetime.date, hours: float) -> datetime.datetime:
+        """Convert hours after local midnight of a business date to naive UTC."""
+        return datetime.datetime.combine(business_date, datetime.time()) + datetime.timedelta(hours=hours - UTC_OFFSET_HOURS)
+
+    @lru_cache(maxsize=64)
+    def orders_for_day(self, business_date: datetime.date) -> List[Dict[str, Any]]:
+        """Every order for a business date, sorted by opened time."""
+        settings = self.settings
+        rng = self._rng("orders", business_date.isoformat())
+        date_int = int(business_date.strftime("%Y%m%d"))
+        opened_hours = sorted(rng.uniform(11, 22.5) for _ in range(settings.orders_per_day))
+        dining_option = {"guid": _guid(rng), "entityType": "DiningOption"}
+        revenue_center = {"guid": _guid(rng), "entityType": "RevenueCenter"}
+
+        orders = []
+        for opened_hour in opened_hours:
+            opened = self._local_to_utc(business_date, opened_hour)
+            paid = opened + datetime.timedelta(minutes=rng.uniform(20, 90))
+            server = rng.choice(self.servers) if self.servers else None
+            server_ref = {"guid": server["guid"], "entityType": "RestaurantUser"} if server else None
+
+            checks = []
+            for _ in range(rng.randint(1, max(1, settings.max_checks))):
+                selections = []
+                for _ in range(rng.randint(1, max(1, settings.max_selections))):
+                    item = rng.choice(self.menu_items)
+                    quantity = rng.choice([1, 1, 1, 2, 3])
+                    pre_discount = round(item["price"] * quantity, 2)
+                    discounts = []
+                    if rng.random() < 0.08:
+                        discounts.append({
+                            "guid": _guid(rng),
+                            "entityType": "SelectionAppliedDiscount",
+                            "name": "Happy Hour",
+                            "discountAmount": round(pre_discount * 0.2, 2),
+                            "processingState": "APPLIED"
+                        })
+                    price = round(pre_discount - sum(d["discountAmount"] for d in discounts), 2)
+                    selections.append({
+                        "guid": _guid(rng),
+                        "entityType": "MenuItemSelection",
+                        "item": {"guid": item["guid"], "entityType": "MenuItem"},
+                        "salesCategory": {"guid": item["salesCategory"]["guid"], "entityType": "SalesCategory"},
+                        "displayName": item["name"],
+                        "quantity": quantity,
+                        "preDiscountPrice": pre_discount,
+                        "price": price,
+                        "receiptLinePrice": item["price"],
+                        "tax": round(price * 0.0875, 2),
+                        "voided": rng.random() < 0.01,
+                        "appliedDiscounts": discounts,
+                        "modifiers": [],
+                        "createdDate": _toast_timestamp(opened),
+                        "modifiedDate": _toast_timestamp(paid)
+                    })
+
+                amount = round(sum(s["price"] for s in selections if not s["voided"]), 2)
+                tax = round(amount * 0.0875, 2)
+                service_charges = []
+                if rng.random() < 0.05:
+                    service_charges.append({
+                        "guid": _guid(rng),
+                        "entityType": "AppliedServiceCharge",
+                        "name": "Large Party Gratuity",
+                        "chargeAmount": round(amount * 0.18, 2),
+                        "gratuity": True
+                    })
+                tip_total = round(amount * rng.choice([0, 0.15, 0.18, 0.2, 0.22]), 2)
+
+                payments = []
+                payment_count = rng.randint(1, max(1, settings.max_payments))
+                for p in range(payment_count):
+                    share = 1.0 / payment_count
+                    payment_type = "CASH" if rng.random() < 0.15 else "CREDIT"
+                    payments.append({
+                        "guid": _guid(rng),
+                        "entityType": "OrderPayment",
+                        "type": payment_type,
+                        "amount": round((amount + tax) * share, 2),
+                        "tipAmount": 0.0 if payment_type == "CASH" else round(tip_total * share, 2),
+                        "paymentStatus": "DENIED" if rng.random() < 0.005 else "CAPTURED",
+                        "paidDate": _toast_timestamp(paid),
+                        "paidBusinessDate": date_int,
+                        "server": server_ref,
+                        "voidInfo": None
+                    })
+
+                checks.append({
+                    "guid": _guid(rng),
+                    "entityType": "Check",
+                    "amount": amount,
+                    "taxAmount": tax,
+                    "totalAmount": round(amount + tax + tip_total + sum(c["chargeAmount"] for c in service_charges), 2),
+                    "selections": selections,
+                    "appliedServiceCharges": service_charges,
+                    "payments": payments,
+                    "voided": False
+                })
+
+            orders.append({
+                "guid": _guid(rng),
+                "entityType": "Order",
+                "businessDate": date_int,
+                "openedDate": _toast_timestamp(opened),
+                "createdDate": _toast_timestamp(opened),
+                "paidDate": _toast_timestamp(paid),
+                "closedDate": _toast_timestamp(paid),
+                "modifiedDate": _toast_timestamp(paid),
+                "voided": rng.random() < 0.02,
+                "deleted": False,
+                "source": rng.choice(["In Store", "In Store", "In Store", "Online", "API"]),
+                "server": server_ref,
+                "diningOption": dining_option,
+                "revenueCenter": revenue_center,
+                "checks": checks
+            })
+        return orders
+
+    def orders_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict[str, Any]]:
+        """Every order modified between two naive UTC datetimes (inclusive)."""
+        orders = []
+        business_date = start.date() - datetime.timedelta(days=1)
+        while business_date <= end.date():
+            for order in self.orders_for_day(business_date):
+                modified = _parse_iso(order["modifiedDate"])
+                if start <= modified <= end:
+                    orders.append(order)
+            business_date += datetime.timedelta(days=1)
+        return orders
+
+    @lru_cache(maxsize=64)
+    def time_entries_for_day(self, business_date: datetime.date) -> List[Dict[str, Any]]:
+        """Clock-ins for a business date: about two thirds of the staff work each day."""
+        rng = self._rng("timeEntries", business_date.isoformat())
+        jobs_by_guid = {job["guid"]: job for job in self.jobs}
+        entries = []
+        for employee in self.employees:
+            if rng.random() > 0.65:
+                continue
+            job_guid = employee["jobReferences"][0]["guid"]
+            start_hour = rng.uniform(9.5, 16.5)
+            shift_hours = rng.uniform(4, 10)
+            in_date = self._local_to_utc(business_date, start_hour)
+            out_date = in_date + datetime.timedelta(hours=shift_hours)
+            breaks = []
+            unpaid_hours = 0.0
+            if shift_hours > 6:
+                break_in = in_date + datetime.timedelta(hours=shift_hours / 2)
+                breaks.append({
+                    "guid": _guid(rng),
+                    "paid": False,
+                    "inDate": _toast_timestamp(break_in),
+                    "outDate": _toast_timestamp(break_in + datetime.timedelta(minutes=30)),
+                    "missed": False
+                })
+                unpaid_hours = 0.5
+            worked = shift_hours - unpaid_hours
+            tipped = jobs_by_guid[job_guid]["tipped"]
+            entries.append({
+                "guid": _guid(rng),
+                "entityType": "TimeEntry",
+                "employeeReference": {"guid": employee["guid"], "entityType": "RestaurantUser"},
+                "jobReference": {"guid": job_guid, "entityType": "RestaurantJob"},
+                "businessDate": business_date.strftime("%Y%m%d"),
+                "inDate": _toast_timestamp(in_date),
+                "outDate": _toast_timestamp(out_date),
+                "regularHours": round(min(worked, 8.0), 2),
+                "overtimeHours": round(max(0.0, worked - 8.0), 2),
+                "breaks": breaks,
+                "declaredCashTips": round(rng.uniform(0, 60), 2) if tipped else 0.0,
+                "nonCashTips": 0.0,
+                "deleted": False
+            })
+        return entries
+
+    def time_entries_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict[str, Any]]:
+        """Every time entry clocked in between two naive UTC datetimes (inclusive)."""
+        entries = []
+        business_date = start.date() - datetime.timedelta(days=1)
+        while business_date <= end.date():
+            for entry in self.time_entries_for_day(business_date):
+                if start <= _parse_iso(entry["inDate"]) <= end:
+                    entries.append(entry)
+            business_date += datetime.timedelta(days=1)
+        return entries
+
+
+def create_app(settings: argparse.Namespace) -> Flask:
+    """Build the Flask app serving synthetic restaurants generated from settings."""
+    app = Flask(__name__)
+    restaurants: Dict[str, SyntheticRestaurant] = {}
+    restaurants_lock = threading.Lock()
+    tokens = set()
+    fault_rng = random.Random(f"{settings.seed}:faults")
+    fault_lock = threading.Lock()
+
+    def restaurant() -> SyntheticRestaurant:
+        guid = request.headers.get("Toast-Restaurant-External-ID", "default")
+        with restaurants_lock:
+            if guid not in restaurants:
+                restaurants[guid] = SyntheticRestaurant(guid, settings)
+            return restaurants[guid]
+
+    def json_response(body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        data = json_backend.dumps(body).encode("utf-8")
+        response_headers = dict(headers or {})
+        if len(data) > 1024 and "gzip" in request.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=5)
+            response_headers["Content-Encoding"] = "gzip"
+        return Response(data, status=status, headers=response_headers, content_type="application/json")
+
+    def directory_response(body: Any) -> Response:
+        """Respond with an ETag, or 304 when the client already has this body."""
+        etag = '"' + hashlib.sha256(json_backend.dumps(body).encode("utf-8")).hexdigest()[:16] + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return json_response(body, headers={"ETag": etag})
+
+    def filter_by_ids(records: List[Dict[str, Any]], param: str) -> List[Dict[str, Any]]:
+        ids = request.args.get(param)
+        if not ids:
+            return records
+        wanted = {value.strip() for value in ids.split(",")}
+        return [record for record in records if record["guid"] in wanted]
+
+    @app.before_request
+    def authenticate_and_inject_faults():
+        if request.path.startswith("/authentication/"):
+            return None
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer ") or authorization[len("Bearer "):] not in tokens:
+            return json_response({"status": 401, "message": "Invalid or expired token"}, 401)
+
+        with fault_lock:
+            latency_ms = settings.latency_ms + fault_rng.uniform(0, settings.latency_jitter_ms)
+            if fault_rng.random() < settings.tail_rate:
+                latency_ms = settings.tail_latency_ms
+            roll = fault_rng.random()
+            server_error = fault_rng.choice([500, 502, 503])
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+        if roll < settings.error_rate_429:
+            return json_response({"status": 429, "message": "Rate limit exceeded"}, 429,
+                                 {"Retry-After": f"{settings.retry_after:g}"})
+        if roll < settings.error_rate_429 + settings.error_rate_5xx:
+            return json_response({"status": server_error, "message": "Injected server error"}, server_error)
+        return None
+
+    @app.route("/authentication/v1/authentication/login", methods=["POST"])
+    def login():
+        credentials = request.get_json(silent=True) or {}
+        if not credentials.get("clientId") or not credentials.get("clientSecret"):
+            return json_response({"status": 401, "message": "Missing clientId or clientSecret"}, 401)
+        token = f"local-{uuid.uuid4().hex}"
+        tokens.add(token)
+        return json_response({"token": {"accessToken": token, "expiresIn": 86400, "tokenType": "Bearer"}, "status": "SUCCESS"})
+
+    @app.route("/orders/v2/ordersBulk", methods=["GET"])
+    def orders_bulk():
+        try:
+            page = max(1, int(request.args.get("page", "1")))
+            page_size = min(MAX_PAGE_SIZE, max(1, int(request.args.get("pageSize", str(MAX_PAGE_SIZE)))))
+            if request.args.get("businessDate"):
+                business_date = datetime.datetime.strptime(request.args["businessDate"], "%Y%m%d").date()
+                orders = restaurant().orders_for_day(business_date)
+            elif request.args.get("startDate") and request.args.get("endDate"):
+                orders = restaurant().orders_between(_parse_iso(request.args["startDate"]), _parse_iso(request.args["endDate"]))
+            else:
+                return json_response({"status": 400, "message": "businessDate or startDate and endDate are required"}, 400)
+        except ValueError as e:
+            return json_response({"status": 400, "message": str(e)}, 400)
+
+        # Orders that haven't been closed yet don't exist
+        now = _toast_timestamp(datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None))
+        orders = [order for order in orders if order["modifiedDate"] <= now]
+
+        page_orders = orders[(page - 1) * page_size:page * page_size]
+        if settings.latency_per_order_ms > 0:
+            time.sleep(len(page_orders) * settings.latency_per_order_ms / 1000)
+        return json_response(page_orders)
+
+    @app.route("/labor/v1/employees", methods=["GET"])
+    def employees():
+        return directory_response(filter_by_ids(restaurant().employees, "employeeIds"))
+
+    @app.route("/labor/v1/jobs", methods=["GET"])
+    def jobs():
+        return directory_response(filter_by_ids(restaurant().jobs, "jobIds"))
+
+    @app.route("/labor/v1/timeEntries", methods=["GET"])
+    def time_entries():
+        try:
+            if request.args.get("businessDate"):
+                business_date = datetime.datetime.strptime(request.args["businessDate"], "%Y%m%d").date()
+                entries = restaurant().time_entries_for_day(business_date)
+            elif request.args.get("startDate") and request.args.get("endDate"):
+                entries = restaurant().time_entries_between(_parse_iso(request.args["startDate"]), _parse_iso(request.args["endDate"]))
+            else:
+                return json_response({"status": 400, "message": "businessDate or startDate and endDate are required"}, 400)
+        except ValueError as e:
+            return json_response({"status": 400, "message": str(e)}, 400)
+        if settings.latency_per_entry_ms > 0:
+            time.sleep(len(entries) * settings.latency_per_entry_ms / 1000)
+        return json_response(entries)
+
+    @app.route("/menus/v2/menus", methods=["GET"])
+    def menus():
+        return directory_response(restaurant().menus)
+
+    return app
+
+
+def main():
+    settings = parse_args()
+    logger.info(f"Serving synthetic Toast restaurants on http://{settings.host}:{settings.port} "
+                f"({settings.orders_per_day} orders/day, {settings.employees} employees, seed '{settings.seed}')")
+    logger.info(f"Faults: 429 {settings.error_rate_429:.1%}, 5xx {settings.error_rate_5xx:.1%}, "
+                f"latency {settings.latency_ms:g}ms + up to {settings.latency_jitter_ms:g}ms, "
+                f"{settings.tail_rate:.1%} at {settings.tail_latency_ms:g}ms")
+    create_app(settings).run(host=settings.host, port=settings.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
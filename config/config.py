@@ -31,6 +31,96 @@ TOAST_API_BASE_URL = os.getenv('TOAST_API_BASE_URL', 'https://ws-api.toasttab.co
 TOAST_AUTH_URL = os.getenv('TOAST_AUTH_URL', 'https://ws-api.toasttab.com/authentication/v1/authentication/login')
 TOAST_API_KEY = os.getenv('TOAST_API_KEY')
 
+# HTTP connection pool and timeout tuning (unset values fall back to ToastAPIClient defaults)
+TOAST_POOL_CONNECTIONS = int(os.getenv('TOAST_POOL_CONNECTIONS', '0')) or None
+TOAST_POOL_MAXSIZE = int(os.getenv('TOAST_POOL_MAXSIZE', '0')) or None
+TOAST_POOL_BLOCK = os.getenv('TOAST_POOL_BLOCK', 'false').lower() in ('1', 'true', 'yes')
+TOAST_CONNECT_TIMEOUT = float(os.getenv('TOAST_CONNECT_TIMEOUT', '0')) or None
+TOAST_READ_TIMEOUT = float(os.getenv('TOAST_READ_TIMEOUT', '0')) or None
+
+# Number of ordersBulk pages fetched in parallel per get_orders call (1 = sequential)
+TOAST_ORDERS_PAGE_CONCURRENCY = int(os.getenv('TOAST_ORDERS_PAGE_CONCURRENCY', '1'))
+
+# Number of time windows fetched in parallel when get_orders pages through a date range
+# (multi-day requests and the businessDate fallback); 1 pages through the range in one go
+TOAST_ORDERS_WINDOW_CONCURRENCY = int(os.getenv('TOAST_ORDERS_WINDOW_CONCURRENCY', '4'))
+
+# get_time_entries splits ranges longer than this many days into windows of that length,
+# fetching up to TOAST_TIME_ENTRIES_CONCURRENCY of them in parallel
+TOAST_TIME_ENTRIES_WINDOW_DAYS = int(os.getenv('TOAST_TIME_ENTRIES_WINDOW_DAYS', '7'))
+TOAST_TIME_ENTRIES_CONCURRENCY = int(os.getenv('TOAST_TIME_ENTRIES_CONCURRENCY', '4'))
+
+# Number of employeeIds batches fetched in parallel when looking up many employees at once
+TOAST_EMPLOYEE_LOOKUP_CONCURRENCY = int(os.getenv('TOAST_EMPLOYEE_LOOKUP_CONCURRENCY', '4'))
+
+# Items per page for paginated endpoints, e.g. "/orders/v2/ordersBulk=50" (defaults to the
+# largest page each endpoint accepts; see server/toast_client.py)
+TOAST_PAGE_SIZES = os.getenv('TOAST_PAGE_SIZES', '')
+
+# Parse ordersBulk pages fetched with a field projection one order at a time (needs ijson).
+# Lowers peak memory per page but is slower than decoding the page whole with orjson.
+TOAST_STREAM_ORDERS = os.getenv('TOAST_STREAM_ORDERS', 'false').lower() in ('1', 'true', 'yes')
+
+# Local cache directory shared by all Toast API clients on this machine (auth tokens, etc.)
+TOAST_CACHE_DIR = os.getenv('TOAST_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.toast_cache'))
+TOAST_TOKEN_CACHE = os.getenv('TOAST_TOKEN_CACHE', 'true').lower() in ('1', 'true', 'yes')
+
+# Renew the auth token in a background thread before it nears expiry, so requests never wait for a login
+TOAST_TOKEN_BACKGROUND_REFRESH = os.getenv('TOAST_TOKEN_BACKGROUND_REFRESH', 'false').lower() in ('1', 'true', 'yes')
+
+# Shared token-bucket rate limits, e.g. "default=20/1;/orders/v2/ordersBulk=5/1;<restaurant guid>=10/1"
+# (see server/rate_limiter.py for the format)
+TOAST_RATE_LIMITER = os.getenv('TOAST_RATE_LIMITER', 'true').lower() in ('1', 'true', 'yes')
+TOAST_RATE_LIMITS = os.getenv('TOAST_RATE_LIMITS', '')
+
+# On-disk cache for the employee, job and menu directories. Entries younger than the TTL
+# (seconds) are served without any API call; older ones are revalidated with ETag/Last-Modified.
+TOAST_RESPONSE_CACHE = os.getenv('TOAST_RESPONSE_CACHE', 'true').lower() in ('1', 'true', 'yes')
+TOAST_RESPONSE_CACHE_TTL = int(os.getenv('TOAST_RESPONSE_CACHE_TTL', '3600'))
+
+# Local store of orders for closed business days. Business dates at least this many days
+# old are fetched from Toast once and then served from disk.
+TOAST_ORDER_STORE = os.getenv('TOAST_ORDER_STORE', 'true').lower() in ('1', 'true', 'yes')
+TOAST_ORDER_STORE_SETTLE_DAYS = int(os.getenv('TOAST_ORDER_STORE_SETTLE_DAYS', '3'))
+
+# Incremental sync of orders for business days that are still open. After one full fetch,
+# only orders modified since the last sync (minus the overlap, in seconds) are requested.
+TOAST_ORDER_SYNC = os.getenv('TOAST_ORDER_SYNC', 'true').lower() in ('1', 'true', 'yes')
+TOAST_ORDER_SYNC_OVERLAP = int(os.getenv('TOAST_ORDER_SYNC_OVERLAP', '300'))
+
+# Identical in-flight GET requests share one HTTP call across threads. With
+# TOAST_SINGLE_FLIGHT_PROCESSES they are also shared across processes via TOAST_CACHE_DIR.
+TOAST_SINGLE_FLIGHT = os.getenv('TOAST_SINGLE_FLIGHT', 'true').lower() in ('1', 'true', 'yes')
+TOAST_SINGLE_FLIGHT_PROCESSES = os.getenv('TOAST_SINGLE_FLIGHT_PROCESSES', 'false').lower() in ('1', 'true', 'yes')
+
+# Hedged ordersBulk page requests: a page that hasn't answered by this percentile of the
+# observed ordersBulk latency is requested again and the first answer wins. Hedges draw
+# from the rate limits above and are capped at TOAST_HEDGE_MAX_RATIO hedges per page.
+TOAST_HEDGE_ORDERS = os.getenv('TOAST_HEDGE_ORDERS', 'false').lower() in ('1', 'true', 'yes')
+TOAST_HEDGE_PERCENTILE = float(os.getenv('TOAST_HEDGE_PERCENTILE', '0.95'))
+TOAST_HEDGE_MAX_RATIO = float(os.getenv('TOAST_HEDGE_MAX_RATIO', '0.1'))
+
+# Circuit breaker per endpoint and restaurant, shared via TOAST_CACHE_DIR: after this many
+# consecutive failed attempts (5xx, timeouts, connection errors) requests fail fast with
+# UpstreamUnavailableError until a probe succeeds, one probe per cooldown (seconds).
+TOAST_CIRCUIT_BREAKER = os.getenv('TOAST_CIRCUIT_BREAKER', 'true').lower() in ('1', 'true', 'yes')
+TOAST_CIRCUIT_BREAKER_FAILURES = int(os.getenv('TOAST_CIRCUIT_BREAKER_FAILURES', '5'))
+TOAST_CIRCUIT_BREAKER_COOLDOWN = float(os.getenv('TOAST_CIRCUIT_BREAKER_COOLDOWN', '30'))
+
+# Retry budget shared by every client in the process: retries are capped at this fraction
+# of successful requests, plus a small allowance. TOAST_RETRY_BUDGET_PROCESSES shares the
+# budget with every process on the machine via TOAST_CACHE_DIR.
+TOAST_RETRY_BUDGET = os.getenv('TOAST_RETRY_BUDGET', 'true').lower() in ('1', 'true', 'yes')
+TOAST_RETRY_BUDGET_RATIO = float(os.getenv('TOAST_RETRY_BUDGET_RATIO', '0.1'))
+TOAST_RETRY_BUDGET_PROCESSES = os.getenv('TOAST_RETRY_BUDGET_PROCESSES', 'false').lower() in ('1', 'true', 'yes')
+
+# HTTP transport: "live" (default), "record" (also append every request/response to
+# TOAST_CASSETTE, a gzip JSON Lines file) or "replay" (answer from TOAST_CASSETTE offline,
+# sleeping TOAST_REPLAY_LATENCY times each recorded response time; 0 = no delay)
+TOAST_TRANSPORT_MODE = os.getenv('TOAST_TRANSPORT_MODE', 'live')
+TOAST_CASSETTE = os.getenv('TOAST_CASSETTE', '')
+TOAST_REPLAY_LATENCY = float(os.getenv('TOAST_REPLAY_LATENCY', '0'))
+
 # Get location index from environment
 location_index = os.getenv('TOAST_LOCATION_INDEX')
 logger.info(f"Config module loaded. Raw TOAST_LOCATION_INDEX from environment: '{location_index}'")
@@ -62,11 +62,14 @@ args = parse_args()
 try:
     # Add the project root to the path
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from server.toast_client import ToastAPIClient
+    from server.client_pool import ToastClientPool
 except ImportError as e:
     logger.error(f"Failed to import ToastAPIClient: {str(e)}")
     raise
 
+# One client per restaurant, all sharing one HTTP session and auth token
+client_pool = ToastClientPool()
+
 def main():
     """Main function to run the script"""
     args = parse_args()
@@ -93,28 +96,11 @@ def main():
             location_index = 4
             os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
                 
-        # Force reload of config.py to get new GUID based on environment variable
-        if location_index is not None:
-            # Set environment variable to ensure config.py picks it up
-            os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
-            logger.info(f"Explicitly setting TOAST_LOCATION_INDEX to {location_index} before client initialization")
-            
-            # Force unload of config module if it's already been imported
-            import sys
-            if 'config' in sys.modules:
-                logger.info("Removing config module from sys.modules to force fresh import")
-                del sys.modules['config']
-        
-        # Initialize the client - this will now use the updated config
+        # Get the client for this location from the pool - the restaurant GUID is looked
+        # up from the location index, so config does not need reloading
         logger.info("Initializing Toast API client...")
-        client = ToastAPIClient()
-        
-        # Double-check which restaurant GUID is being used
-        try:
-            import config.config as config
-            logger.info(f"Using restaurant GUID: {config.TOAST_RESTAURANT_GUID} for location index {location_index}")
-        except ImportError:
-            logger.warning("Could not import config to verify restaurant GUID")
+        client = client_pool.get(location_index=location_index)
+        logger.info(f"Using restaurant GUID: {client.restaurant_guid} for location index {location_index}")
         
         if args.job_ids:
             logger.info(f"Fetching job data for IDs: {args.job_ids}")
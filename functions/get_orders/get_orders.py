@@ -36,6 +36,7 @@ import time
 import requests
 import logging
 import traceback
+import atexit
 from typing import Dict, Any, List, Optional
 
 # Set up logging
@@ -97,6 +98,7 @@ def parse_args():
     parser.add_argument('--items-csv', action='store_true',
                         help='Output only item names to a CSV file (other output options will be ignored)')
     parser.add_argument('--debug', action='store_true', help='Enable detailed debugging output')
+    parser.add_argument('--metrics-file', dest='metrics_file', help='File to save Toast API request metrics (JSON) to on exit')
     
     args = parser.parse_args()
     
@@ -116,7 +118,12 @@ args = parse_args()
 try:
     # Add the project root to the path
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from server.toast_client import ToastAPIClient
+    from server.client_pool import ToastClientPool
+    from server import json_backend
+    from server import metrics
+    from server.circuit_breaker import UpstreamUnavailableError, UPSTREAM_UNAVAILABLE_EXIT_CODE
+    from server.retry_budget import RetryBudgetExhaustedError, RETRY_BUDGET_EXHAUSTED_EXIT_CODE
+    from server import order_projection
 except ImportError as e:
     logger.error(f"Failed to import ToastAPIClient: {str(e)}")
     error_traceback = traceback.format_exc()
@@ -127,13 +134,26 @@ except ImportError as e:
         )
     raise
 
+# One client per restaurant, all sharing one HTTP session and auth token
+client_pool = ToastClientPool()
+
+def report_metrics():
+    """Log the Toast API request metrics for this run and save them if requested."""
+    metrics.registry.log_summary()
+    if args.metrics_file:
+        metrics.registry.dump(args.metrics_file)
+
+# Report metrics however the script exits (including sys.exit on errors)
+atexit.register(report_metrics)
+
 def process_orders_data(orders_data, location_index=None):
     """
     Process orders data to extract basic information, applying discounts to sales figures.
     Returns data from the API excluding voided items and gift cards with discounts applied.
     
     Args:
-        orders_data: Raw orders data from Toast API
+        orders_data: Raw orders data from Toast API - a list or any iterable of orders,
+            such as ToastAPIClient.iter_orders(), which is consumed in a single pass
         location_index: Location index (1-5) to determine which category map to use
         
     Returns:
@@ -291,10 +311,18 @@ def process_orders_data(orders_data, location_index=None):
     # Track non-gratuity service charges
     total_non_grat_service_charges = 0.0
     
-    print(f"Processing {len(orders_data)} orders (excluding voided items and gift cards)...")
+    # Track order counts as the orders stream past
+    orders_count = 0
+    voided_orders_count = 0
+    
+    print("Processing orders (excluding voided items and gift cards)...")
     
     # Loop through all orders
     for order in orders_data:
+        orders_count += 1
+        if order.get('voided', False):
+            voided_orders_count += 1
+        
         # Process service charges first
         for check in order.get('checks', []):
             for service_charge in check.get('appliedServiceCharges', []):
@@ -503,6 +531,10 @@ def process_orders_data(orders_data, location_index=None):
         'locationIndex': location_index
     }
     
+    # The orders may be a stream that is gone by now, so report the order counts here
+    # rather than adding them to the result
+    logger.info(f"Processed {orders_count} orders")
+    logger.info(f"Number of voided orders in raw data: {voided_orders_count}")
     logger.info(f"Processed data into {len(items_result)} unique menu items across {len(category_totals)} categories")
     logger.info(f"Excluded {voided_items_count} voided items from totals")
     logger.info(f"Excluded {gift_card_items_count} gift card items from totals")
@@ -538,7 +570,7 @@ def send_data_to_webhook(processed_data, webhook_url=None):
     
     try:
         # Print data size before sending
-        data_size = len(json.dumps(processed_data))
+        data_size = len(json_backend.dumps(processed_data))
         logger.info(f"Data size: {data_size/1024:.1f}KB")
         
         response = requests.post(
@@ -591,41 +623,20 @@ def main():
             location_index = 4
             os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
                 
-        # Force reload of config.py to get new GUID based on environment variable
-        if location_index is not None:
-            # Set environment variable to ensure config.py picks it up
-            os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
-            logger.info(f"Explicitly setting TOAST_LOCATION_INDEX to {location_index} before client initialization")
-            
-            # Force unload of config module if it's already been imported
-            import sys
-            if 'config' in sys.modules:
-                logger.info("Removing config module from sys.modules to force fresh import")
-                del sys.modules['config']
-        
-        # Initialize the client - this will now use the updated config
+        # Get the client for this location from the pool - the restaurant GUID is looked
+        # up from the location index, so config does not need reloading
         logger.info("Initializing Toast API client...")
-        client = ToastAPIClient()
-        
-        # Double-check which restaurant GUID is being used
-        try:
-            import config.config as config
-            logger.info(f"Config module imported, TOAST_RESTAURANT_GUID: {config.TOAST_RESTAURANT_GUID}")
-            logger.info(f"Config module LOCATION_GUID_MAP: {config.LOCATION_GUID_MAP}")
-            used_guid = config.TOAST_RESTAURANT_GUID
-            mapped_guid = config.LOCATION_GUID_MAP.get(location_index) if location_index else None
-            logger.info(f"Using restaurant GUID: {used_guid} for location index {location_index}")
-            if mapped_guid:
-                if mapped_guid == used_guid:
-                    logger.info(f"Confirmed using correct GUID for location {location_index}")
-                else:
-                    logger.warning(f"WARNING: Expected to use GUID {mapped_guid} for location {location_index}, but using {used_guid} instead")
-        except ImportError:
-            logger.warning("Could not import config to verify restaurant GUID")
+        client = client_pool.get(location_index=location_index)
+        logger.info(f"Using restaurant GUID: {client.restaurant_guid} for location index {location_index}")
         
         # Store date information for the webhook
         date_info = {}
         
+        # Processing only reads the item sales fields; the raw orders output file needs full
+        # orders (--items-csv writes item names instead of that file)
+        writes_raw_orders = args.output and not args.process and not args.webhook and not args.items_csv
+        projection = None if writes_raw_orders else order_projection.ITEM_SALES
+        
         # Handle date parameters
         if args.dates:
             # Date range provided
@@ -643,33 +654,8 @@ def main():
             logger.info(f"Processing orders from {start_date_str} to {end_date_str}...")
             logger.info(f"Will process {len(date_list)} days individually...")
             
-            # Initialize empty data structures for aggregation
-            all_orders = []
-            total_voided_items = 0
-            total_gift_card_items = 0
-            
-            # Process each day individually
-            for date_str in date_list:
-                logger.info(f"\nProcessing {date_str}...")
-                
-                # Format dates for API
-                day_start = f"{date_str}T00:00:00.000Z"
-                day_end = f"{date_str}T23:59:59.999Z"
-                
-                # Fetch orders data for this day
-                orders_response = client.get_orders(day_start, day_end)
-                
-                # Extract orders from response
-                if isinstance(orders_response, dict) and 'orders' in orders_response:
-                    day_orders = orders_response.get('orders', [])
-                elif isinstance(orders_response, list):
-                    day_orders = orders_response
-                else:
-                    logger.warning(f"Unexpected response structure for {date_str}. Keys: {list(orders_response.keys()) if isinstance(orders_response, dict) else 'Not a dict'}")
-                    day_orders = []
-                
-                all_orders.extend(day_orders)
-                logger.info(f"Retrieved {len(day_orders)} orders for {date_str}")
+            # Stream orders day by day instead of collecting them first
+            orders_data = client.iter_orders_for_dates(date_list, projection)
             
             # Store date info for webhook
             date_info = {
@@ -678,10 +664,6 @@ def main():
                 "isDateRange": True
             }
             
-            # Process all orders together
-            orders_data = all_orders
-            total_count = len(orders_data)
-            
         else:
             # Single date (or default to today)
             if args.date:
@@ -701,22 +683,12 @@ def main():
                 "isDateRange": False
             }
             
-            # Fetch orders data
-            orders_response = client.get_orders(start_date, end_date)
-            
-            # Extract orders from response
-            if isinstance(orders_response, dict) and 'orders' in orders_response:
-                orders_data = orders_response.get('orders', [])
-                total_count = orders_response.get('totalCount', len(orders_data))
-            elif isinstance(orders_response, list):
-                orders_data = orders_response
-                total_count = len(orders_data)
-            else:
-                logger.warning(f"Unexpected response structure. Keys: {list(orders_response.keys()) if isinstance(orders_response, dict) else 'Not a dict'}")
-                orders_data = []
-                total_count = 0
-            
-            logger.info(f"Retrieved {len(orders_data)} orders from Toast API")
+            # Stream orders data
+            orders_data = client.iter_orders_for_dates([date_str], projection)
+        
+        # Only the raw orders output file needs every order in memory at once
+        if writes_raw_orders:
+            orders_data = list(orders_data)
         
         # Process the data
         processed_data = process_orders_data(orders_data, location_index)
@@ -888,9 +860,7 @@ def main():
             logger.info(f"Total discounts from items: ${total_discounts_from_items:.2f}")
             logger.info(f"Total discounts from categories: ${total_discounts:.2f}")
             
-            # Check if there are any voided orders in the raw data (not just selections)
-            voided_orders_count = sum(1 for order in orders_data if order.get('voided', False))
-            logger.info(f"Number of voided orders in raw data: {voided_orders_count}")
+            # Voided orders were counted (and logged) while the orders were processed
             logger.info(f"Number of voided menu items excluded: {processed_data.get('voided_items_count', 0)}")
             
             logger.info("=" * 80)
@@ -903,7 +873,7 @@ def main():
             if args.output:
                 try:
                     with open(args.output, 'w') as f:
-                        json.dump(processed_data, f, indent=2)
+                        json_backend.dump(processed_data, f, indent=2)
                     logger.info(f"Raw processed orders data saved to {args.output}")
                 except Exception as e:
                     error_msg = str(e)
@@ -951,7 +921,7 @@ def main():
             
             try:
                 with open(args.output, 'w') as f:
-                    json.dump(output_data, f, indent=2)
+                    json_backend.dump(output_data, f, indent=2)
                 logger.info(f"Raw orders data with basic aggregates saved to {args.output}")
             except Exception as e:
                 error_msg = str(e)
@@ -968,6 +938,30 @@ def main():
         logger.info("Operation completed successfully.")
         logger.info("=" * 80)
         
+    except UpstreamUnavailableError as e:
+        # Toast is down - fail right away with a distinct exit status
+        error_msg = str(e)
+        logger.error(f"Upstream unavailable: {error_msg}")
+        send_error_to_webhook(
+            error_msg=error_msg,
+            error_traceback=traceback.format_exc(),
+            context="upstream_unavailable"
+        )
+        logger.error("=" * 80)
+        sys.exit(UPSTREAM_UNAVAILABLE_EXIT_CODE)
+        
+    except RetryBudgetExhaustedError as e:
+        # Too many requests to Toast are failing to keep retrying - fail right away with its own exit status
+        error_msg = str(e)
+        logger.error(error_msg)
+        send_error_to_webhook(
+            error_msg=error_msg,
+            error_traceback=traceback.format_exc(),
+            context="retry_budget_exhausted"
+        )
+        logger.error("=" * 80)
+        sys.exit(RETRY_BUDGET_EXHAUSTED_EXIT_CODE)
+        
     except Exception as e:
         error_msg = str(e)
         error_traceback = traceback.format_exc()
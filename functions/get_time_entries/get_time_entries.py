@@ -111,7 +111,7 @@ args = parse_args()
 try:
     # Add the project root to the path
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from server.toast_client import ToastAPIClient
+    from server.client_pool import ToastClientPool
 except ImportError as e:
     logger.error(f"Failed to import ToastAPIClient: {str(e)}")
     error_traceback = traceback.format_exc()
@@ -122,6 +122,9 @@ except ImportError as e:
         )
     raise
 
+# One client per restaurant, all sharing one HTTP session and auth token
+client_pool = ToastClientPool()
+
 def process_time_entries_data(time_entries_data, location_index=None):
     """
     Process time entries data to extract basic information.
@@ -251,21 +254,11 @@ def main():
             location_index = 4
             os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
                 
-        # Force reload of config.py to get new GUID based on environment variable
-        if location_index is not None:
-            # Set environment variable to ensure config.py picks it up
-            os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
-            logger.info(f"Explicitly setting TOAST_LOCATION_INDEX to {location_index} before client initialization")
-            
-            # Force unload of config module if it's already been imported
-            import sys
-            if 'config' in sys.modules:
-                logger.info("Removing config module from sys.modules to force fresh import")
-                del sys.modules['config']
-        
-        # Initialize the client
+        # Get the client for this location from the pool - the restaurant GUID is looked
+        # up from the location index, so config does not need reloading
         logger.info("Initializing Toast API client...")
-        client = ToastAPIClient()
+        client = client_pool.get(location_index=location_index)
+        logger.info(f"Using restaurant GUID: {client.restaurant_guid} for location index {location_index}")
         
         # Handle date parameters
         start_date_str, end_date_str = args.dates
@@ -279,8 +272,8 @@ def main():
         else:
             logger.info(f"Fetching time entries from {start_date_str} to {end_date_str}")
         
-        # Fetch time entries data using date range format
-        time_entries_response = client.get_time_entries(
+        # Fetch time entries data using date range format (always a list of time entries)
+        time_entries_data = client.get_time_entries(
             start_date=start_date,
             end_date=end_date,
             include_archived=args.include_archived,
@@ -288,15 +281,6 @@ def main():
             time_entry_ids=args.time_entry_ids
         )
         
-        # Extract time entries from response
-        if isinstance(time_entries_response, dict):
-            time_entries_data = time_entries_response.get('timeEntries', time_entries_response.get('data', []))
-        elif isinstance(time_entries_response, list):
-            time_entries_data = time_entries_response
-        else:
-            logger.warning(f"Unexpected response structure. Keys: {list(time_entries_response.keys()) if isinstance(time_entries_response, dict) else 'Not a dict'}")
-            time_entries_data = []
-        
         logger.info(f"Retrieved {len(time_entries_data)} time entries from Toast API")
         
         # Process the data
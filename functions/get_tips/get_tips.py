@@ -30,6 +30,7 @@ import time
 import requests
 import logging
 import traceback
+import atexit
 from typing import Dict, Any, List, Optional
 from collections import defaultdict
 
@@ -89,7 +90,7 @@ def send_data_to_webhook(processed_data, webhook_url=None):
     
     try:
         # Print data size before sending
-        data_size = len(json.dumps(processed_data))
+        data_size = len(json_backend.dumps(processed_data))
         logger.info(f"Data size: {data_size/1024:.1f}KB")
         
         response = requests.post(
@@ -132,6 +133,7 @@ def parse_args():
     parser.add_argument('--response-webhook-url', dest='response_webhook_url', help='Webhook URL to send the response data to')
     parser.add_argument('--synchronous', action='store_true', help='Return JSON data to stdout instead of sending to webhook')
     parser.add_argument('--debug', action='store_true', help='Enable detailed debugging output')
+    parser.add_argument('--metrics-file', dest='metrics_file', help='File to save Toast API request metrics (JSON) to on exit')
     
     args = parser.parse_args()
     
@@ -153,7 +155,12 @@ args = parse_args()
 try:
     # Add the project root to the path
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from server.toast_client import ToastAPIClient
+    from server.client_pool import ToastClientPool
+    from server import json_backend
+    from server import metrics
+    from server.circuit_breaker import UpstreamUnavailableError, UPSTREAM_UNAVAILABLE_EXIT_CODE
+    from server.retry_budget import RetryBudgetExhaustedError, RETRY_BUDGET_EXHAUSTED_EXIT_CODE
+    from server import order_projection
 except ImportError as e:
     logger.error(f"Failed to import ToastAPIClient: {str(e)}")
     error_traceback = traceback.format_exc()
@@ -164,19 +171,40 @@ except ImportError as e:
     )
     raise
 
-def get_employee_mapping():
+# One client per restaurant, all sharing one HTTP session and auth token
+client_pool = ToastClientPool()
+
+def report_metrics():
+    """Log the Toast API request metrics for this run and save them if requested."""
+    metrics.registry.log_summary()
+    if args.metrics_file:
+        metrics.registry.dump(args.metrics_file)
+
+# Report metrics however the script exits (including sys.exit on errors)
+atexit.register(report_metrics)
+
+def get_employee_mapping(employee_guids=None, location_index=None):
     """
-    Fetch all employees from Toast API and create a mapping from GUID to name.
+    Fetch employees from Toast API and create a mapping from GUID to name.
+    
+    Args:
+        employee_guids: GUIDs of the employees to map, looked up in batches (employees
+            already cached are not requested again). None fetches every employee.
+        location_index: Location index (1-5) of the restaurant (default: the configured one)
     
     Returns:
-        Dictionary mapping employee GUIDs to names
+        Dictionary mapping employee GUIDs to names, or None if the employees could not
+        be fetched (an empty dictionary means the lookup succeeded but found nobody)
     """
     try:
-        client = ToastAPIClient()
-        logger.info("Fetching all employees from Toast API...")
-        
-        # Fetch all employees (no GUID parameter)
-        employees_response = client.get_employee(None)
+        client = client_pool.get(location_index=location_index)
+        if employee_guids is not None:
+            logger.info(f"Looking up {len(employee_guids)} employees in Toast API...")
+            employees_response = client.get_employees(employee_guids)
+        else:
+            logger.info("Fetching all employees from Toast API...")
+            # Fetch all employees (no GUID parameter)
+            employees_response = client.get_employee(None)
         
         # Extract employees from response
         if isinstance(employees_response, list):
@@ -185,48 +213,62 @@ def get_employee_mapping():
             employees = employees_response['employees']
         else:
             logger.warning("Unexpected employee API response structure")
-            return {}
-        
-        # Create mapping from GUID to employee info (name and externalEmployeeId)
-        employee_mapping = {}
-        for employee in employees:
-            if isinstance(employee, dict) and 'guid' in employee:
-                guid = employee['guid']
-                first_name = employee.get('firstName', '')
-                last_name = employee.get('lastName', '')
-                chosen_name = employee.get('chosenName', '')
-                external_employee_id = employee.get('externalEmployeeId', '')
-                
-                # Use chosen name if available, otherwise first + last
-                if chosen_name:
-                    full_name = chosen_name
-                else:
-                    full_name = f"{first_name} {last_name}".strip()
-                    if not full_name:
-                        full_name = f"Employee {guid[-8:]}"
-                
-                employee_mapping[guid] = {
-                    'name': full_name,
-                    'externalEmployeeId': external_employee_id
-                }
+            return None
         
+        employee_mapping = build_employee_mapping(employees)
         logger.info(f"Successfully mapped {len(employee_mapping)} employees")
         return employee_mapping
         
     except Exception as e:
         logger.error(f"Failed to fetch employees from API: {e}")
         logger.warning("Falling back to server_map.json if available")
-        return {}
+        return None
+
+def build_employee_mapping(employees):
+    """
+    Create a mapping from GUID to employee info (name and externalEmployeeId).
+    
+    Args:
+        employees: Employee records from the Toast API
+        
+    Returns:
+        Dictionary mapping employee GUIDs to dicts with 'name' and 'externalEmployeeId'
+    """
+    employee_mapping = {}
+    for employee in employees:
+        if isinstance(employee, dict) and 'guid' in employee:
+            guid = employee['guid']
+            first_name = employee.get('firstName', '')
+            last_name = employee.get('lastName', '')
+            chosen_name = employee.get('chosenName', '')
+            external_employee_id = employee.get('externalEmployeeId', '')
+            
+            # Use chosen name if available, otherwise first + last
+            if chosen_name:
+                full_name = chosen_name
+            else:
+                full_name = f"{first_name} {last_name}".strip()
+                if not full_name:
+                    full_name = f"Employee {guid[-8:]}"
+            
+            employee_mapping[guid] = {
+                'name': full_name,
+                'externalEmployeeId': external_employee_id
+            }
+    return employee_mapping
 
-def get_job_mapping():
+def get_job_mapping(location_index=None):
     """
     Fetch all jobs from Toast API and create a mapping from GUID to job name.
     
+    Args:
+        location_index: Location index (1-5) of the restaurant (default: the configured one)
+    
     Returns:
         Dictionary mapping job GUIDs to job names
     """
     try:
-        client = ToastAPIClient()
+        client = client_pool.get(location_index=location_index)
         logger.info("Fetching all jobs from Toast API...")
         
         # Fetch all jobs (no job IDs parameter)
@@ -317,37 +359,6 @@ def fetch_and_process_time_entries(client, date_range, employee_mapping, sales_b
     Returns:
         Dictionary with time entries data organized by day and employee
     """
-    # First fetch all employees to get job references
-    try:
-        logger.info("Fetching complete employee data for job references...")
-        employees_response = client.get_employee(None)
-        
-        # Extract employees from response
-        if isinstance(employees_response, list):
-            employees = employees_response
-        elif isinstance(employees_response, dict) and 'employees' in employees_response:
-            employees = employees_response['employees']
-        else:
-            logger.warning("Unexpected employee API response structure")
-            employees = []
-        
-        # Create mapping from employee GUID to job references
-        employee_job_mapping = {}
-        for employee in employees:
-            if isinstance(employee, dict) and 'guid' in employee:
-                guid = employee['guid']
-                job_references = employee.get('jobReferences', [])
-                # Get the first job reference GUID (primary position)
-                if job_references and len(job_references) > 0:
-                    employee_job_mapping[guid] = job_references[0].get('guid', '')
-                else:
-                    employee_job_mapping[guid] = ''
-        
-        logger.info(f"Mapped job references for {len(employee_job_mapping)} employees")
-        
-    except Exception as e:
-        logger.error(f"Failed to fetch employees for job mapping: {e}")
-        employee_job_mapping = {}
     try:
         logger.info(f"Fetching time entries for date range: {date_range['start_date']} to {date_range['end_date']}")
         
@@ -356,24 +367,41 @@ def fetch_and_process_time_entries(client, date_range, employee_mapping, sales_b
         end_date = f"{date_range['end_date']}T23:59:59.999Z"
         
         # Fetch time entries using date range format
-        time_entries_response = client.get_time_entries(
+        time_entries_data = client.get_time_entries(
             start_date=start_date,
             end_date=end_date,
             include_archived=True,
             include_missed_breaks=True
         )
         
-        # Extract time entries from response
-        if isinstance(time_entries_response, dict):
-            time_entries_data = time_entries_response.get('timeEntries', time_entries_response.get('data', []))
-        elif isinstance(time_entries_response, list):
-            time_entries_data = time_entries_response
-        else:
-            logger.warning("Unexpected time entries response structure")
-            time_entries_data = []
-        
         logger.info(f"Retrieved {len(time_entries_data)} time entries from Toast API")
         
+        # Look up the employees who clocked in for their job references (and names missing from the mapping)
+        try:
+            time_entry_guids = {entry.get('employeeReference', {}).get('guid') for entry in time_entries_data}
+            time_entry_guids.discard(None)
+            employees = client.get_employees(time_entry_guids)
+            
+            # Create mapping from employee GUID to job references
+            employee_job_mapping = {}
+            for employee in employees:
+                guid = employee['guid']
+                job_references = employee.get('jobReferences', [])
+                # Get the first job reference GUID (primary position)
+                if job_references and len(job_references) > 0:
+                    employee_job_mapping[guid] = job_references[0].get('guid', '')
+                else:
+                    employee_job_mapping[guid] = ''
+            
+            for guid, employee_info in build_employee_mapping(employees).items():
+                employee_mapping.setdefault(guid, employee_info)
+            
+            logger.info(f"Mapped job references for {len(employee_job_mapping)} employees")
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch employees for job mapping: {e}")
+            employee_job_mapping = {}
+        
         # Process time entries by day
         time_entries_by_day = defaultdict(list)
         
@@ -615,7 +643,9 @@ def process_tips_data(orders_data, location_index=None, date_range=None):
     Extracts dates from order data only for grouping purposes.
     
     Args:
-        orders_data: Raw orders data from Toast API (pre-filtered by API date range)
+        orders_data: Raw orders data from Toast API (pre-filtered by API date range) - a list
+            or any iterable of orders, such as ToastAPIClient.iter_orders(), which is
+            consumed in a single pass
         location_index: Location index (1-5) to determine which restaurant to use
         date_range: Dict with 'start_date' and 'end_date' strings in YYYY-MM-DD format (used for time entries only)
         
@@ -639,30 +669,8 @@ def process_tips_data(orders_data, location_index=None, date_range=None):
         business_date_override = date_range['start_date']
         logger.info(f"Single-day query detected, will override all business dates to: {business_date_override}")
     
-    # First try to get employee mapping from API
-    server_guid_to_name = get_employee_mapping()
-    
     # Get job mapping from API
-    job_guid_to_name = get_job_mapping()
-    
-    # If API failed, fall back to server_map.json
-    if not server_guid_to_name:
-        try:
-            server_map_path = os.path.join(os.path.dirname(__file__), 'server_map.json')
-            with open(server_map_path, 'r') as f:
-                server_map = json.load(f)
-                # Extract servers mapping from oj_wl location
-                if 'oj_wl' in server_map and 'servers' in server_map['oj_wl']:
-                    server_guid_to_name = server_map['oj_wl']['servers']
-                    logger.info(f"Loaded {len(server_guid_to_name)} server mappings from server_map.json")
-                else:
-                    logger.warning("No server mappings found in server_map.json under oj_wl.servers")
-        except FileNotFoundError:
-            logger.warning("server_map.json not found, using default server names")
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing server_map.json: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading server_map.json: {e}")
+    job_guid_to_name = get_job_mapping(location_index)
     
     # Initialize data structures
     tips_by_date = defaultdict(float)
@@ -675,7 +683,7 @@ def process_tips_data(orders_data, location_index=None, date_range=None):
     total_payments_processed = 0
     orders_with_tips = 0
     
-    logger.info(f"Processing {len(orders_data)} orders for tips and server sales...")
+    logger.info("Processing orders for tips and server sales...")
     
     # Loop through all orders
     for order in orders_data:
@@ -774,6 +782,35 @@ def process_tips_data(orders_data, location_index=None, date_range=None):
         if order_has_tips:
             orders_with_tips += 1
     
+    # Look up only the servers that appear in the orders (employees already cached are not requested again)
+    server_guids = set()
+    for by_server in (sales_by_server_by_date, tips_by_server_by_date, tax_by_server_by_date):
+        for date_servers in by_server.values():
+            server_guids.update(date_servers.keys())
+    server_guid_to_name = {}
+    if server_guids:
+        server_guid_to_name = get_employee_mapping(server_guids, location_index)
+        
+        # If API failed, fall back to server_map.json
+        if server_guid_to_name is None:
+            server_guid_to_name = {}
+            try:
+                server_map_path = os.path.join(os.path.dirname(__file__), 'server_map.json')
+                with open(server_map_path, 'r') as f:
+                    server_map = json.load(f)
+                    # Extract servers mapping from oj_wl location
+                    if 'oj_wl' in server_map and 'servers' in server_map['oj_wl']:
+                        server_guid_to_name = server_map['oj_wl']['servers']
+                        logger.info(f"Loaded {len(server_guid_to_name)} server mappings from server_map.json")
+                    else:
+                        logger.warning("No server mappings found in server_map.json under oj_wl.servers")
+            except FileNotFoundError:
+                logger.warning("server_map.json not found, using default server names")
+            except json.JSONDecodeError as e:
+                logger.error(f"Error parsing server_map.json: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error loading server_map.json: {e}")
+    
     # Convert defaultdicts to regular dicts and sort
     tips_by_date_sorted = dict(sorted(tips_by_date.items()))
     
@@ -849,8 +886,8 @@ def process_tips_data(orders_data, location_index=None, date_range=None):
     time_entries_data = {}
     if date_range:
         try:
-            # Initialize client for time entries
-            client = ToastAPIClient()
+            # Reuse the pooled client for time entries
+            client = client_pool.get(location_index=location_index)
             time_entries_data = fetch_and_process_time_entries(client, date_range, server_guid_to_name, sales_by_server_by_date, tips_by_server_by_date, job_guid_to_name, tax_by_server_by_date, location_index)
             
             # Add time entries data to result
@@ -962,37 +999,11 @@ def main():
             location_index = 4
             os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
         
-        # Force reload of config.py to get new GUID based on environment variable
-        if location_index is not None:
-            # Set environment variable to ensure config.py picks it up
-            os.environ['TOAST_LOCATION_INDEX'] = str(location_index)
-            logger.info(f"Explicitly setting TOAST_LOCATION_INDEX to {location_index} before client initialization")
-            
-            # Force unload of config module if it's already been imported
-            import sys
-            if 'config' in sys.modules:
-                logger.info("Removing config module from sys.modules to force fresh import")
-                del sys.modules['config']
-        
-        # Initialize the client - this will now use the updated config
+        # Get the client for this location from the pool - the restaurant GUID is looked
+        # up from the location index, so config does not need reloading
         logger.info("Initializing Toast API client...")
-        client = ToastAPIClient()
-        
-        # Double-check which restaurant GUID is being used
-        try:
-            import config.config as config
-            logger.info(f"Config module imported, TOAST_RESTAURANT_GUID: {config.TOAST_RESTAURANT_GUID}")
-            logger.info(f"Config module LOCATION_GUID_MAP: {config.LOCATION_GUID_MAP}")
-            used_guid = config.TOAST_RESTAURANT_GUID
-            mapped_guid = config.LOCATION_GUID_MAP.get(location_index) if location_index else None
-            logger.info(f"Using restaurant GUID: {used_guid} for location index {location_index}")
-            if mapped_guid:
-                if mapped_guid == used_guid:
-                    logger.info(f"Confirmed using correct GUID for location {location_index}")
-                else:
-                    logger.warning(f"WARNING: Expected to use GUID {mapped_guid} for location {location_index}, but using {used_guid} instead")
-        except ImportError:
-            logger.warning("Could not import config to verify restaurant GUID")
+        client = client_pool.get(location_index=location_index)
+        logger.info(f"Using restaurant GUID: {client.restaurant_guid} for location index {location_index}")
         
         # Store date information
         date_info = {}
@@ -1014,31 +1025,8 @@ def main():
             logger.info(f"Processing orders from {start_date_str} to {end_date_str}...")
             logger.info(f"Will process {len(date_list)} days individually...")
             
-            # Initialize empty data structures for aggregation
-            all_orders = []
-            
-            # Process each day individually
-            for date_str in date_list:
-                logger.info(f"\nProcessing {date_str}...")
-                
-                # Format dates for API
-                day_start = f"{date_str}T00:00:00.000Z"
-                day_end = f"{date_str}T23:59:59.999Z"
-                
-                # Fetch orders data for this day
-                orders_response = client.get_orders(day_start, day_end)
-                
-                # Extract orders from response
-                if isinstance(orders_response, dict) and 'orders' in orders_response:
-                    day_orders = orders_response.get('orders', [])
-                elif isinstance(orders_response, list):
-                    day_orders = orders_response
-                else:
-                    logger.warning(f"Unexpected response structure for {date_str}. Keys: {list(orders_response.keys()) if isinstance(orders_response, dict) else 'Not a dict'}")
-                    day_orders = []
-                
-                all_orders.extend(day_orders)
-                logger.info(f"Retrieved {len(day_orders)} orders for {date_str}")
+            # Stream orders day by day instead of collecting them first, keeping only the tip fields
+            orders_data = client.iter_orders_for_dates(date_list, order_projection.TIPS)
             
             # Store date info
             date_info = {
@@ -1047,9 +1035,6 @@ def main():
                 "isDateRange": True
             }
             
-            # Process all orders together
-            orders_data = all_orders
-            
         else:
             # Single date (or default to today)
             if args.date:
@@ -1069,19 +1054,8 @@ def main():
                 "isDateRange": False
             }
             
-            # Fetch orders data
-            orders_response = client.get_orders(start_date, end_date)
-            
-            # Extract orders from response
-            if isinstance(orders_response, dict) and 'orders' in orders_response:
-                orders_data = orders_response.get('orders', [])
-            elif isinstance(orders_response, list):
-                orders_data = orders_response
-            else:
-                logger.warning(f"Unexpected response structure. Keys: {list(orders_response.keys()) if isinstance(orders_response, dict) else 'Not a dict'}")
-                orders_data = []
-            
-            logger.info(f"Retrieved {len(orders_data)} orders from Toast API")
+            # Stream orders data, keeping only the tip fields
+            orders_data = client.iter_orders_for_dates([date_str], order_projection.TIPS)
         
         # Create date range for filtering
         date_range_filter = {
@@ -1160,7 +1134,7 @@ def main():
         if args.output:
             try:
                 with open(args.output, 'w') as f:
-                    json.dump(processed_data, f, indent=2)
+                    json_backend.dump(processed_data, f, indent=2)
                 logger.info(f"\nTips, server sales, and time entries data saved to {args.output}")
             except Exception as e:
                 error_msg = str(e)
@@ -1184,11 +1158,35 @@ def main():
         
         # Return JSON to stdout if synchronous
         if args.synchronous:
-            print(json.dumps(processed_data))
+            print(json_backend.dumps(processed_data))
         
         logger.info("Operation completed successfully.")
         logger.info("=" * 80)
         
+    except UpstreamUnavailableError as e:
+        # Toast is down - fail right away with a distinct exit status
+        error_msg = str(e)
+        logger.error(f"Upstream unavailable: {error_msg}")
+        send_error_to_webhook(
+            error_msg=error_msg,
+            error_traceback=traceback.format_exc(),
+            context="upstream_unavailable"
+        )
+        logger.error("=" * 80)
+        sys.exit(UPSTREAM_UNAVAILABLE_EXIT_CODE)
+        
+    except RetryBudgetExhaustedError as e:
+        # Too many requests to Toast are failing to keep retrying - fail right away with its own exit status
+        error_msg = str(e)
+        logger.error(error_msg)
+        send_error_to_webhook(
+            error_msg=error_msg,
+            error_traceback=traceback.format_exc(),
+            context="retry_budget_exhausted"
+        )
+        logger.error("=" * 80)
+        sys.exit(RETRY_BUDGET_EXHAUSTED_EXIT_CODE)
+        
     except Exception as e:
         error_msg = str(e)
         error_traceback = traceback.format_exc()
@@ -71,6 +71,7 @@ fi
 source venv/bin/activate
 pip install --upgrade pip
 pip install -r config/requirements.txt
+pip install -r requirements-optional.txt
 
 echo "Creating logs directory..."
 mkdir -p logs
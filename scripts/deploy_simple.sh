@@ -45,6 +45,7 @@ fi
 source venv/bin/activate
 pip install --upgrade pip
 pip install -r requirements.txt
+pip install -r requirements-optional.txt
 
 echo "🔧 Creating systemd service..."
 
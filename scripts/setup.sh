@@ -37,6 +37,7 @@ source venv/bin/activate
 
 # Install dependencies
 pip install -r requirements.txt
+pip install -r requirements-optional.txt
 
 # Create systemd service file with environment variables
 cat > /etc/systemd/system/toast-app.service << 'EOF'
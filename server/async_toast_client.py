@@ -0,0 +1,550 @@
+"""Asyncio Toast API client mirroring ToastAPIClient for concurrent fetches on one event loop."""
+import asyncio
+import time
+import datetime
+import json
+import logging
+import urllib.parse
+from typing import Dict, Any, Optional, List, Iterable
+
+import aiohttp
+
+from server.toast_client import ToastAPIClient, parse_page_sizes
+from server.token_store import TokenStore
+from server import json_backend
+from server.order_projection import OrderProjection
+from server import metrics
+from server.circuit_breaker import CircuitBreaker, UpstreamUnavailableError
+from server.retry_budget import RetryBudgetExhaustedError, full_jitter, shared_retry_budget
+from server.rate_limiter import TokenBucketRateLimiter, parse_rate_limits, parse_retry_after, parse_rate_limit_headers
+
+# Set up logging
+logger = logging.getLogger("toast-async-client")
+
+class AsyncToastAPIClient:
+    """
+    Asyncio counterpart to ToastAPIClient.
+
+    Exposes the same methods (get_orders, get_employee, get_time_entries, get_jobs,
+    get_menus) as coroutines, with the same retry/401/429 handling as
+    ToastAPIClient._make_request but using asyncio.sleep for backoff, so many days and
+    locations can be fetched at once on one event loop. Authentication happens lazily
+    on the first request and shares the on-disk token store with the blocking client.
+    The token store, rate limiter, circuit breaker and retry budget take file locks, so
+    they are called through asyncio.to_thread rather than on the event loop.
+
+    Usage:
+        async with AsyncToastAPIClient() as client:
+            orders = await client.get_orders(start_date, end_date)
+    """
+
+    MAX_RETRIES = ToastAPIClient.MAX_RETRIES
+    INITIAL_BACKOFF_SECONDS = ToastAPIClient.INITIAL_BACKOFF_SECONDS
+    MAX_BACKOFF_SECONDS = ToastAPIClient.MAX_BACKOFF_SECONDS
+    TOKEN_REFRESH_WINDOW_SECONDS = ToastAPIClient.TOKEN_REFRESH_WINDOW_SECONDS
+
+    def __init__(self, restaurant_guid: Optional[str] = None, pool_maxsize: Optional[int] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None):
+        """
+        Initialize the async Toast API client with configuration.
+
+        Args:
+            restaurant_guid: Restaurant GUID to use instead of the configured one
+            pool_maxsize: Maximum number of concurrent connections per host
+            connect_timeout: Timeout in seconds for establishing connections
+            read_timeout: Timeout in seconds for reading data responses
+        """
+        import config.config as config
+
+        self.base_url = config.TOAST_API_BASE_URL
+        self.auth_url = config.TOAST_AUTH_URL
+        self.restaurant_guid = restaurant_guid or config.TOAST_RESTAURANT_GUID
+        self.client_id = config.TOAST_CLIENT_ID
+        self.client_secret = config.TOAST_CLIENT_SECRET
+
+        self.pool_maxsize = pool_maxsize or getattr(config, 'TOAST_POOL_MAXSIZE', None) or ToastAPIClient.DEFAULT_POOL_MAXSIZE
+        self.connect_timeout = connect_timeout or getattr(config, 'TOAST_CONNECT_TIMEOUT', None) or ToastAPIClient.DEFAULT_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or getattr(config, 'TOAST_READ_TIMEOUT', None) or ToastAPIClient.DEFAULT_READ_TIMEOUT
+
+        logger.info(f"Initializing async Toast API client with restaurant GUID: {self.restaurant_guid}")
+
+        if not all([self.restaurant_guid, self.client_id, self.client_secret]):
+            raise ValueError("Missing required Toast API credentials")
+
+        self.token = None
+        self.token_expiry = None
+        self.token_store = TokenStore(config.TOAST_CACHE_DIR) if getattr(config, 'TOAST_TOKEN_CACHE', True) else None
+
+        if getattr(config, 'TOAST_RATE_LIMITER', True):
+            self.rate_limiter = TokenBucketRateLimiter(config.TOAST_CACHE_DIR, parse_rate_limits(getattr(config, 'TOAST_RATE_LIMITS', None)))
+        else:
+            self.rate_limiter = None
+
+        self.page_sizes = parse_page_sizes(getattr(config, 'TOAST_PAGE_SIZES', None))
+
+        if getattr(config, 'TOAST_CIRCUIT_BREAKER', True):
+            self.circuit_breaker = CircuitBreaker(config.TOAST_CACHE_DIR, getattr(config, 'TOAST_CIRCUIT_BREAKER_FAILURES', 5),
+                                                  getattr(config, 'TOAST_CIRCUIT_BREAKER_COOLDOWN', 30.0))
+        else:
+            self.circuit_breaker = None
+
+        if getattr(config, 'TOAST_RETRY_BUDGET', True):
+            budget_dir = config.TOAST_CACHE_DIR if getattr(config, 'TOAST_RETRY_BUDGET_PROCESSES', False) else None
+            self.retry_budget = shared_retry_budget(getattr(config, 'TOAST_RETRY_BUDGET_RATIO', 0.1), budget_dir)
+        else:
+            self.retry_budget = None
+
+        # Created lazily because aiohttp sessions must be bound to a running event loop
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP session and release pooled connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled keep-alive session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
+
+    async def _refresh_token(self):
+        """
+        Get a new authentication token from the Toast API with retry logic.
+
+        Raises:
+            aiohttp.ClientError: If the authentication request fails after retries
+            RetryBudgetExhaustedError: If a retry is needed but the shared retry budget is spent
+        """
+        logger.info("Attempting to fetch new authentication token from Toast API...")
+
+        payload = {
+            "clientId": self.client_id,
+            "clientSecret": self.client_secret,
+            "userAccessType": "TOAST_MACHINE_CLIENT"
+        }
+        session = self._get_session()
+        backoff_seconds = self.INITIAL_BACKOFF_SECONDS
+        last_error: Optional[BaseException] = None
+
+        for current_retry in range(self.MAX_RETRIES + 1):
+            try:
+                logger.info(f"Authentication attempt {current_retry + 1}/{self.MAX_RETRIES + 1}")
+                async with session.post(self.auth_url, json=payload,
+                                        timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                                                      sock_read=ToastAPIClient.AUTH_READ_TIMEOUT)) as response:
+                    logger.info(f"Auth response status: {response.status}")
+                    if response.status == 200:
+                        auth_data = await response.json(content_type=None)
+                        self.token, self.token_expiry = ToastAPIClient._parse_token_response(auth_data)
+                        if self.retry_budget is not None:
+                            await asyncio.to_thread(self.retry_budget.record_success)
+                        logger.info(f"Successfully retrieved new token, valid until: {datetime.datetime.fromtimestamp(self.token_expiry).strftime('%Y-%m-%d %H:%M:%S')}")
+                        return
+                    if response.status == 429:
+                        logger.warning("Auth request received 429 (Too Many Requests). Retrying...")
+                    else:
+                        logger.error(f"Auth response error: {await response.text()}")
+                        # Only retry a couple of times for non-429 errors
+                        if current_retry >= 2:
+                            response.raise_for_status()
+                    last_error = aiohttp.ClientResponseError(response.request_info, response.history,
+                                                             status=response.status, message=response.reason or "")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Client error during auth token retrieval (attempt {current_retry + 1}): {e}")
+                last_error = e
+
+            if current_retry < self.MAX_RETRIES:
+                wait_seconds = await asyncio.to_thread(self._retry_delay, urllib.parse.urlsplit(self.auth_url).path, backoff_seconds)
+                logger.info(f"Waiting {wait_seconds:.2f}s before next auth attempt...")
+                await asyncio.sleep(wait_seconds)
+                backoff_seconds = min(self.MAX_BACKOFF_SECONDS, backoff_seconds * 2)
+
+        logger.error("Max retries reached for authentication. Failing.")
+        if last_error is not None:
+            raise last_error
+        raise aiohttp.ClientError("Max retries reached for authentication after undefined error.")
+
+    def _token_needs_refresh(self, expiry: Optional[float]) -> bool:
+        """Check whether a token with the given expiry is missing, expired or expiring soon."""
+        return expiry is None or time.time() + self.TOKEN_REFRESH_WINDOW_SECONDS > expiry
+
+    async def _ensure_valid_token(self, rejected_token: Optional[str] = None):
+        """
+        Ensure we have a valid authentication token, refreshing if necessary.
+
+        Concurrent coroutines share one refresh. A still-valid token from the shared
+        token store is reused before logging in, and a new token is only minted while
+        holding the token store lock, as ToastAPIClient._ensure_valid_token does.
+
+        Args:
+            rejected_token: Token the API just rejected with a 401; it is never reused
+        """
+        if rejected_token is None and self.token is not None and not self._token_needs_refresh(self.token_expiry):
+            return
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+
+        async with self._token_lock:
+            # Another coroutine may have refreshed while we waited for the lock
+            if self.token is not None and self.token != rejected_token and not self._token_needs_refresh(self.token_expiry):
+                return
+
+            if self.token_store is None:
+                await self._refresh_token()
+            else:
+                # The store lock blocks until other clients and processes finish logging in,
+                # so wait for it in a worker thread instead of on the event loop
+                await asyncio.to_thread(self._refresh_token_via_store, asyncio.get_running_loop(), rejected_token)
+
+    def _refresh_token_via_store(self, loop: asyncio.AbstractEventLoop, rejected_token: Optional[str] = None):
+        """
+        Adopt the token cached by another client or process, minting one only if none is usable.
+
+        Runs in a worker thread, which holds the token store lock (a thread-bound lock)
+        from the cache check until the new token is stored. The login itself runs on the
+        event loop.
+
+        Args:
+            loop: Event loop to run the login on
+            rejected_token: Token the API just rejected with a 401; it is never reused
+        """
+        with self.token_store.lock():
+            cached = self.token_store.get(self.client_id)
+            if cached is not None and cached[0] != rejected_token and not self._token_needs_refresh(cached[1]):
+                self.token, self.token_expiry = cached
+                logger.info("Reusing cached authentication token")
+                return
+
+            asyncio.run_coroutine_threadsafe(self._refresh_token(), loop).result()
+            self.token_store.put(self.client_id, self.token, self.token_expiry)
+
+    def _apply_rate_limit_headers(self, endpoint: str, status: int, headers) -> Optional[float]:
+        """
+        Feed rate limit and Retry-After headers into the shared rate limiter (blocking).
+
+        Returns:
+            Seconds from the Retry-After header on a 429/5xx response, or None
+        """
+        rate_limit = parse_rate_limit_headers(headers)
+        retry_after = parse_retry_after(headers.get("Retry-After")) if status == 429 or status >= 500 else None
+        if self.rate_limiter is not None:
+            if rate_limit is not None:
+                self.rate_limiter.observe(endpoint, self.restaurant_guid, rate_limit[0], rate_limit[1])
+            if retry_after is not None:
+                self.rate_limiter.defer(endpoint, self.restaurant_guid, retry_after)
+            elif status == 429 and rate_limit is None:
+                self.rate_limiter.throttled(endpoint, self.restaurant_guid)
+        return retry_after
+
+    def _record_response_metrics(self, endpoint: str, response: aiohttp.ClientResponse, seconds: float, response_bytes: int):
+        """Record a response's latency, size and status in the process-wide metrics registry."""
+        wire_bytes = response.content_length if response.content_length is not None else response_bytes
+        metrics.registry.record_response(endpoint, self.restaurant_guid, response.status, seconds, response_bytes, wire_bytes)
+
+    async def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Any:
+        """
+        Make a request to the Toast API with retry logic.
+
+        Args:
+            endpoint: API endpoint to call
+            method: HTTP method to use
+            params: Query parameters for the request
+            data: JSON body for POST requests
+
+        Returns:
+            Parsed JSON response (or {"rawText": ...} for non-JSON bodies)
+
+        Raises:
+            aiohttp.ClientError: If the API request fails after retries
+            UpstreamUnavailableError: If the endpoint's circuit is open, or opens while retrying
+            RetryBudgetExhaustedError: If a retry is needed but the shared retry budget is spent
+        """
+        url = f"{self.base_url}{endpoint}"
+        session = self._get_session()
+
+        logger.info(f"Request URL: {url}")
+        logger.info(f"Request parameters: {json.dumps(params) if params else 'None'}")
+
+        backoff_seconds = self.INITIAL_BACKOFF_SECONDS
+        last_error: Optional[BaseException] = None
+
+        for current_retry in range(self.MAX_RETRIES + 1):
+            retry_after = None
+            circuit_open = False
+
+            # Fail fast while Toast is known to be down for this endpoint and restaurant
+            if self.circuit_breaker is not None:
+                await asyncio.to_thread(self.circuit_breaker.before_request, endpoint, self.restaurant_guid)
+
+            await self._ensure_valid_token()
+            sent_token = self.token
+            headers = {
+                "Toast-Restaurant-External-ID": self.restaurant_guid,
+                "Authorization": f"Bearer {sent_token}",
+                "Content-Type": "application/json"
+            }
+
+            # Wait for the shared rate budget without blocking the event loop
+            if self.rate_limiter is not None:
+                waited = 0.0
+                while True:
+                    wait_seconds = await asyncio.to_thread(self.rate_limiter.try_acquire, endpoint, self.restaurant_guid)
+                    if wait_seconds <= 0:
+                        break
+                    await asyncio.sleep(wait_seconds)
+                    waited += wait_seconds
+                metrics.registry.record_rate_limit_wait(endpoint, self.restaurant_guid, waited)
+
+            try:
+                logger.info(f"API Call Attempt {current_retry + 1}/{self.MAX_RETRIES + 1} to {url}")
+                started = time.monotonic()
+                async with session.request(method, url, headers=headers, params=params, json=data) as response:
+                    logger.info(f"Response status: {response.status}")
+                    if response.status >= 400:
+                        self._record_response_metrics(endpoint, response, time.monotonic() - started, 0)
+                    retry_after = await asyncio.to_thread(self._apply_rate_limit_headers, endpoint, response.status, response.headers)
+                    if self.circuit_breaker is not None:
+                        if response.status >= 500:
+                            circuit_open = await asyncio.to_thread(self.circuit_breaker.record_failure, endpoint, self.restaurant_guid)
+                        else:
+                            await asyncio.to_thread(self.circuit_breaker.record_success, endpoint, self.restaurant_guid)
+
+                    if response.status == 401:
+                        logger.warning("Received 401 Unauthorized. Refreshing token and retrying.")
+                        # Reject the token this attempt sent, so a refresh another task already made is shared
+                        await self._ensure_valid_token(rejected_token=sent_token)
+                        if current_retry >= self.MAX_RETRIES:
+                            logger.error("Received 401 on last retry attempt. Failing.")
+                            response.raise_for_status()
+                    elif response.status == 429:
+                        logger.warning("Received 429 (Too Many Requests). Retrying...")
+                    elif response.status >= 500:
+                        logger.warning(f"Received server error {response.status}. Retrying...")
+                    else:
+                        # Other 4xx errors are not retried
+                        response.raise_for_status()
+                        body = await response.read()
+                        self._record_response_metrics(endpoint, response, time.monotonic() - started, len(body))
+                        if self.retry_budget is not None:
+                            await asyncio.to_thread(self.retry_budget.record_success)
+                        try:
+                            return json_backend.loads(body)
+                        except ValueError:
+                            logger.error("Response is not JSON. Returning raw text.")
+                            return {"rawText": body.decode("utf-8", errors="replace")}
+
+                    last_error = aiohttp.ClientResponseError(response.request_info, response.history,
+                                                             status=response.status, message=response.reason or "")
+
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"HTTP error during API request: {e}. No retry for this error.")
+                raise
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Client error during API request (attempt {current_retry + 1}): {e}")
+                metrics.registry.record_error(endpoint, self.restaurant_guid)
+                if self.circuit_breaker is not None:
+                    circuit_open = await asyncio.to_thread(self.circuit_breaker.record_failure, endpoint, self.restaurant_guid)
+                last_error = e
+
+            # Don't retry into an outage: once the circuit is open, fail this request too
+            if circuit_open:
+                raise UpstreamUnavailableError(endpoint, self.restaurant_guid, self.circuit_breaker.cooldown_seconds)
+
+            if current_retry < self.MAX_RETRIES:
+                wait_seconds = await asyncio.to_thread(self._retry_delay, endpoint, backoff_seconds, retry_after)
+                logger.info(f"Waiting {wait_seconds:.2f}s before next API call attempt...")
+                await asyncio.sleep(wait_seconds)
+                metrics.registry.record_retry(endpoint, self.restaurant_guid, wait_seconds)
+                backoff_seconds = min(self.MAX_BACKOFF_SECONDS, backoff_seconds * 2)
+
+        logger.error(f"Max retries reached for API call to {endpoint}. Failing.")
+        if last_error is not None:
+            raise last_error
+        raise aiohttp.ClientError(f"Max retries reached for {endpoint} after undefined error.")
+
+    def _retry_delay(self, endpoint: str, backoff_seconds: float, retry_after: Optional[float] = None) -> float:
+        """Take a retry from the shared retry budget and choose the delay, as ToastAPIClient._retry_delay (blocking)."""
+        if self.retry_budget is not None and not self.retry_budget.try_spend():
+            metrics.registry.record_retry_budget_exhausted(endpoint, self.restaurant_guid)
+            logger.error(f"Retry budget exhausted, not retrying request to {endpoint}")
+            raise RetryBudgetExhaustedError(endpoint, self.restaurant_guid)
+        # Honour the server's Retry-After instead of blind exponential backoff
+        if retry_after is not None:
+            return retry_after
+        return full_jitter(backoff_seconds)
+
+    async def get_orders(self, start_date: str, end_date: str, projection: Optional[OrderProjection] = None) -> Dict[str, Any]:
+        """
+        Fetch all orders from Toast API within a date range.
+
+        Args:
+            start_date: Start date in ISO format with timezone (e.g. "2025-01-01T05:00:00.000Z")
+            end_date: End date in ISO format with timezone (e.g. "2025-01-31T23:59:59.999Z")
+            projection: Keep only these fields of each order (see server/order_projection.py);
+                each page is projected as it arrives. None returns full orders.
+
+        Returns:
+            Dict with 'orders' (List[Dict]) and 'totalCount' (int), as ToastAPIClient.get_orders
+
+        Raises:
+            aiohttp.ClientError: If a page fails (other than a businessDate first page, which
+                falls back to the date range parameters)
+        """
+        start_date_only = start_date.split("T")[0]
+        end_date_only = end_date.split("T")[0]
+        param_type = "businessDate" if start_date_only == end_date_only else "dateRange"
+        business_date = datetime.datetime.strptime(start_date_only, "%Y-%m-%d").strftime("%Y%m%d")
+
+        all_orders = []
+        page = 1
+        page_size = self.page_sizes["/orders/v2/ordersBulk"]
+        started = time.perf_counter()
+
+        while True:
+            if param_type == "businessDate":
+                params = {"businessDate": business_date, "page": str(page), "pageSize": str(page_size)}
+            else:
+                params = {"startDate": start_date, "endDate": end_date, "page": str(page), "pageSize": str(page_size)}
+
+            logger.info(f"Fetching page {page} with {page_size} items per page using {param_type} parameter...")
+
+            try:
+                result = await self._make_request("/orders/v2/ordersBulk", params=params)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error fetching page {page} with {param_type}: {e}")
+                # Fall back to the date range parameters if businessDate fails on the first page
+                if param_type == "businessDate" and page == 1:
+                    logger.info("Switching to date range parameters instead of businessDate...")
+                    param_type = "dateRange"
+                    all_orders = []
+                    continue
+                # Stopping here would pass off the pages so far as the whole range
+                raise
+
+            if isinstance(result, list):
+                page_orders = result
+            elif isinstance(result, dict) and 'orders' in result:
+                page_orders = result.get('orders', [])
+            else:
+                logger.error(f"Unexpected response format for page {page}")
+                page_orders = []
+
+            all_orders.extend(projection.project_orders(page_orders) if projection is not None else page_orders)
+
+            if len(page_orders) < page_size:
+                logger.info(f"Reached end of data with {len(page_orders)} items on page {page}")
+                break
+            # No fixed delay between pages; the shared rate limiter paces each request
+            page += 1
+
+        logger.info(f"Successfully fetched a total of {len(all_orders)} orders across {page} pages "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return {
+            'orders': all_orders,
+            'totalCount': len(all_orders)
+        }
+
+    async def get_orders_for_dates(self, dates: Iterable[str], max_concurrency: int = 4,
+                                   projection: Optional[OrderProjection] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch orders for many business dates concurrently.
+
+        Args:
+            dates: Dates in YYYY-MM-DD format
+            max_concurrency: Maximum number of days fetched at the same time
+            projection: Keep only these fields of each order (see get_orders)
+
+        Returns:
+            Dict mapping each date to its list of orders, in the order the dates were given
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_day(date_str: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                response = await self.get_orders(f"{date_str}T00:00:00.000Z", f"{date_str}T23:59:59.999Z", projection)
+                return response.get('orders', [])
+
+        date_list = list(dates)
+        results = await asyncio.gather(*(fetch_day(date_str) for date_str in date_list))
+        return dict(zip(date_list, results))
+
+    async def get_menus(self) -> Dict[str, Any]:
+        """
+        Fetch menu data from the Toast API.
+
+        Returns:
+            Dict containing menu data
+        """
+        return await self._make_request("/menus/v2/menus")
+
+    async def get_employee(self, employee_guid: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch employee information from the Toast API.
+
+        Args:
+            employee_guid: Optional GUID of the employee to retrieve. If None, fetches all employees.
+
+        Returns:
+            Dict containing employee data
+        """
+        params = {"employeeIds": employee_guid} if employee_guid else None
+        return await self._make_request("/labor/v1/employees", params=params)
+
+    async def get_time_entries(self, start_date: str, end_date: str, include_archived: bool = True,
+                               include_missed_breaks: bool = True, time_entry_ids: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch time entries from the Toast API using date range format.
+
+        Unlike ToastAPIClient.get_time_entries, the range is fetched in one request.
+
+        Args:
+            start_date: Start date in ISO format (e.g. "2025-01-01T00:00:00.000Z")
+            end_date: End date in ISO format (e.g. "2025-01-31T23:59:59.999Z")
+            include_archived: Whether to include archived time entries (default: True)
+            include_missed_breaks: Whether to include missed breaks (default: True)
+            time_entry_ids: Comma-separated list of time entry IDs to filter
+
+        Returns:
+            List of time entries, as ToastAPIClient.get_time_entries. This used to be the
+            raw response body; callers that read 'timeEntries' from it get the list directly now.
+        """
+        params = {
+            "startDate": start_date,
+            "endDate": end_date
+        }
+        if include_archived:
+            params["includeArchived"] = str(include_archived).lower()
+        if include_missed_breaks:
+            params["includeMissedBreaks"] = str(include_missed_breaks).lower()
+        if time_entry_ids:
+            params["timeEntryIds"] = time_entry_ids
+        result = await self._make_request("/labor/v1/timeEntries", params=params)
+        return ToastAPIClient._time_entries_from_response(result, start_date)
+
+    async def get_jobs(self, job_ids: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch jobs from the Toast API.
+
+        Args:
+            job_ids: Optional comma-separated list of job IDs to filter
+
+        Returns:
+            Dict containing jobs data
+        """
+        params = {"jobIds": job_ids} if job_ids else None
+        return await self._make_request("/labor/v1/jobs", params=params)
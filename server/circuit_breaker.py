@@ -0,0 +1,151 @@
+"""Circuit breaker shared by every Toast API client on the machine."""
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from server.file_lock import FileLock, atomic_write
+
+# Set up logging
+logger = logging.getLogger("toast-circuit-breaker")
+
+# Exit status of the job scripts when they stop because Toast is unavailable (EX_TEMPFAIL)
+UPSTREAM_UNAVAILABLE_EXIT_CODE = 75
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised instead of calling Toast while the circuit for an endpoint is open."""
+
+    def __init__(self, endpoint: str, restaurant_guid: Optional[str], retry_in_seconds: float):
+        self.endpoint = endpoint
+        self.restaurant_guid = restaurant_guid
+        self.retry_in_seconds = retry_in_seconds
+        super().__init__(f"Toast API upstream unavailable for {endpoint} (restaurant {restaurant_guid}): "
+                         f"circuit open after repeated failures, next attempt allowed in {retry_in_seconds:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint, per-restaurant circuit breaker whose state lives in a file-locked JSON file.
+
+    A circuit opens after failure_threshold consecutive failed attempts (5xx responses,
+    timeouts and connection errors) and fails every request fast while it is open.
+    After cooldown_seconds one probe request is let through (half-open): success
+    closes the circuit, failure opens it for another cooldown. As with the rate
+    limiter, the state is shared by all threads and job subprocesses, so one job
+    finding Toast down spares the others from retrying into the outage.
+    """
+
+    # While a half-open probe is out, other requests keep failing fast for up to this long
+    PROBE_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, state_dir: str, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            state_dir: Directory that holds the shared circuit state file
+            failure_threshold: Consecutive failed attempts that open a circuit
+            cooldown_seconds: Seconds a circuit stays open before a probe is let through
+        """
+        self.path = os.path.join(state_dir, "circuits.json")
+        self._lock = FileLock(f"{self.path}.lock")
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+
+    @staticmethod
+    def _circuit_key(endpoint: str, restaurant_guid: Optional[str]) -> str:
+        """Key of the circuit for an endpoint and restaurant."""
+        return f"{endpoint}@{restaurant_guid or '*'}"
+
+    def _read_state(self) -> Dict[str, Any]:
+        """Read the circuit state, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"Resetting unreadable circuit breaker state {self.path}: {e}")
+            return {}
+
+    def _write_state(self, state: Dict[str, Any]):
+        atomic_write(self.path, json.dumps(state).encode("utf-8"), mode=0o644)
+
+    def before_request(self, endpoint: str, restaurant_guid: Optional[str] = None):
+        """
+        Check that a request may be sent, claiming the probe if the circuit is half-open.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request is made for
+
+        Raises:
+            UpstreamUnavailableError: If the circuit is open, or half-open with a probe already out
+        """
+        circuit_key = self._circuit_key(endpoint, restaurant_guid)
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            circuit = state.get(circuit_key)
+            if not circuit or not circuit.get("opened_until"):
+                return
+
+            if circuit["opened_until"] > now:
+                raise UpstreamUnavailableError(endpoint, restaurant_guid, circuit["opened_until"] - now)
+            if circuit.get("probe_until", 0) > now:
+                raise UpstreamUnavailableError(endpoint, restaurant_guid, circuit["probe_until"] - now)
+
+            # Half-open: this request is the probe
+            circuit["probe_until"] = now + self.PROBE_TIMEOUT_SECONDS
+            self._write_state(state)
+        logger.info(f"Circuit for {endpoint} is half-open, sending a probe request")
+
+    def record_success(self, endpoint: str, restaurant_guid: Optional[str] = None):
+        """
+        Close the circuit after a request got an answer from Toast.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request was made for
+        """
+        circuit_key = self._circuit_key(endpoint, restaurant_guid)
+        with self._lock:
+            state = self._read_state()
+            circuit = state.pop(circuit_key, None)
+            if circuit is None:
+                return
+            self._write_state(state)
+        if circuit.get("opened_until"):
+            logger.info(f"Circuit for {endpoint} closed after a successful probe")
+
+    def record_failure(self, endpoint: str, restaurant_guid: Optional[str] = None) -> bool:
+        """
+        Count a failed attempt, opening the circuit at the threshold or when a probe fails.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request was made for
+
+        Returns:
+            True if the circuit is now open
+        """
+        circuit_key = self._circuit_key(endpoint, restaurant_guid)
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            circuit = state.setdefault(circuit_key, {"failures": 0})
+            circuit["failures"] = circuit.get("failures", 0) + 1
+            was_open = bool(circuit.get("opened_until"))
+            opened = was_open or circuit["failures"] >= self.failure_threshold
+            if opened:
+                circuit["opened_until"] = now + self.cooldown_seconds
+                circuit["probe_until"] = 0
+            self._write_state(state)
+
+        if opened:
+            logger.error(f"Circuit for {endpoint} (restaurant {restaurant_guid}) opened after "
+                         f"{circuit['failures']} consecutive failures; failing fast for {self.cooldown_seconds:.0f}s")
+        return opened
@@ -0,0 +1,85 @@
+"""Pool of warm Toast API clients, one per restaurant."""
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+from server.toast_client import ToastAPIClient
+
+# Set up logging
+logger = logging.getLogger("toast-client-pool")
+
+
+class ToastClientPool:
+    """
+    Keeps one ToastAPIClient per restaurant, all sharing one session and auth token.
+
+    Clients are created on first use from an explicit restaurant GUID or location
+    index, so one process can talk to every location in LOCATION_GUID_MAP at once
+    without touching TOAST_LOCATION_INDEX or reloading the config module. The pool
+    owns the shared session: every client it hands out is made with for_restaurant(),
+    so closing one of them leaves the others working, and only close() on the pool
+    closes the session.
+
+    Example:
+        with ToastClientPool() as pool:
+            for location_index in (1, 2, 3, 4, 5):
+                orders = pool.get(location_index=location_index).get_orders(start, end)
+    """
+
+    def __init__(self, **client_kwargs: Any):
+        """
+        Initialize an empty pool.
+
+        Args:
+            **client_kwargs: Connection pool and timeout arguments passed to the first
+                ToastAPIClient (pool_connections, pool_maxsize, pool_block,
+                connect_timeout, read_timeout)
+        """
+        self._client_kwargs = client_kwargs
+        self._owner: Optional[ToastAPIClient] = None
+        self._clients: Dict[str, ToastAPIClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, restaurant_guid: Optional[str] = None, location_index: Optional[int] = None) -> ToastAPIClient:
+        """
+        Get the client for a restaurant, creating it if needed.
+
+        Args:
+            restaurant_guid: Restaurant GUID to talk to
+            location_index: Location index (1-5) to talk to, instead of restaurant_guid.
+                If neither is given, the configured TOAST_RESTAURANT_GUID is used.
+
+        Returns:
+            ToastAPIClient for the restaurant
+
+        Raises:
+            ValueError: If the location index is invalid or no restaurant is configured
+        """
+        guid = restaurant_guid or ToastAPIClient.resolve_restaurant_guid(location_index)
+        if not guid:
+            raise ValueError("No restaurant GUID given and none configured")
+
+        with self._lock:
+            client = self._clients.get(guid)
+            if client is None:
+                if self._owner is None:
+                    # The first client owns the session and token; it is never handed out
+                    self._owner = ToastAPIClient(restaurant_guid=guid, **self._client_kwargs)
+                client = self._owner.for_restaurant(guid)
+                self._clients[guid] = client
+                logger.info(f"Client pool now holds {len(self._clients)} restaurant client(s)")
+            return client
+
+    def close(self):
+        """Close the shared HTTP session and forget every client."""
+        with self._lock:
+            if self._owner is not None:
+                self._owner.close()
+                self._owner = None
+            self._clients.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
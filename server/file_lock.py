@@ -0,0 +1,105 @@
+"""Cross-process file locking shared by the Toast client's local caches."""
+import os
+import threading
+import logging
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows - fall back to in-process locking only
+    fcntl = None
+
+# Set up logging
+logger = logging.getLogger("toast-file-lock")
+
+
+class FileLock:
+    """
+    Exclusive lock backed by a lock file.
+    
+    The lock is held across processes (via fcntl.flock where available) and across
+    threads in the same process. It is re-entrant for the thread that holds it, so a
+    method holding the lock can call another method that takes the same lock.
+    """
+    
+    # One re-entrant thread lock and per-thread hold state per lock file path,
+    # shared by all FileLock instances for that path
+    _thread_locks: Dict[str, threading.RLock] = {}
+    _thread_states: Dict[str, threading.local] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, path: str):
+        """
+        Initialize the lock.
+        
+        Args:
+            path: Path of the lock file (created if missing)
+        """
+        self.path = os.path.abspath(path)
+        with FileLock._registry_lock:
+            if self.path not in FileLock._thread_locks:
+                FileLock._thread_locks[self.path] = threading.RLock()
+                FileLock._thread_states[self.path] = threading.local()
+            self._thread_lock = FileLock._thread_locks[self.path]
+            self._local = FileLock._thread_states[self.path]
+    
+    def acquire(self):
+        """Block until the lock is held by the calling thread."""
+        self._thread_lock.acquire()
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                handle = open(self.path, 'a+')
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                self._local.handle = handle
+            except Exception:
+                self._thread_lock.release()
+                raise
+        self._local.depth = depth + 1
+    
+    def release(self):
+        """Release one level of the lock held by the calling thread."""
+        depth = getattr(self._local, 'depth', 0)
+        if depth <= 0:
+            raise RuntimeError(f"Releasing unheld file lock {self.path}")
+        self._local.depth = depth - 1
+        if depth == 1:
+            handle = self._local.handle
+            self._local.handle = None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            finally:
+                handle.close()
+        self._thread_lock.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def atomic_write(path: str, data: bytes, mode: int = 0o600):
+    """
+    Write a file atomically by writing a temporary file and renaming it into place.
+    
+    Args:
+        path: Destination file path
+        data: Bytes to write
+        mode: File permissions for the new file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,103 @@
+"""Hedged requests: send a duplicate of a slow request and take whichever answers first."""
+import threading
+import logging
+import concurrent.futures
+from concurrent.futures import Executor, FIRST_COMPLETED
+from typing import Any, Callable, Tuple
+
+# Set up logging
+logger = logging.getLogger("toast-hedging")
+
+
+class HedgeBudget:
+    """
+    Caps hedged requests at a fraction of all hedgeable requests.
+
+    Every hedgeable request earns max_ratio credits and every hedge spends one, so over
+    any stretch of time at most max_ratio hedges are sent per request. Credits are
+    capped so that a long run of fast responses can't save up a burst of hedges for
+    when the API slows down, which is exactly when extra load hurts most.
+    """
+
+    def __init__(self, max_ratio: float, max_credits: float = 3.0):
+        """
+        Initialize the budget.
+
+        Args:
+            max_ratio: Maximum hedges per hedgeable request (0.1 allows one hedge per 10 requests)
+            max_credits: Most hedges that can be saved up
+        """
+        self.max_ratio = max_ratio
+        self.max_credits = max_credits
+        self._credits = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Earn credit for one hedgeable request."""
+        with self._lock:
+            self._credits = min(self.max_credits, self._credits + self.max_ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Spend the credit for one hedge if there is enough.
+
+        Returns:
+            True if the hedge may be sent
+        """
+        with self._lock:
+            if self._credits < 1.0:
+                return False
+            self._credits -= 1.0
+            return True
+
+    def refund(self):
+        """Give back the credit of a hedge that was not sent after all."""
+        with self._lock:
+            self._credits = min(self.max_credits, self._credits + 1.0)
+
+
+def run_hedged(executor: Executor, primary: Callable[[], Any], hedge: Callable[[], Any],
+               delay_seconds: float, may_hedge: Callable[[], bool]) -> Tuple[Any, bool]:
+    """
+    Run primary and, if it hasn't finished after delay_seconds, race it against hedge.
+
+    The first call to succeed wins. The other one keeps running in the executor and its
+    result is discarded. If both fail, the first error is raised.
+
+    Args:
+        executor: Executor to run the calls in
+        primary: The request
+        hedge: Duplicate of the request
+        delay_seconds: How long to wait for primary before hedging
+        may_hedge: Called once primary is late; returns False to keep waiting for
+            primary without hedging (e.g. no budget left)
+
+    Returns:
+        Tuple of (result, True if the hedge won)
+
+    Raises:
+        Exception: Whatever primary raised (or hedge, if both failed)
+    """
+    first = executor.submit(primary)
+    try:
+        return first.result(timeout=delay_seconds), False
+    except concurrent.futures.TimeoutError:
+        pass
+
+    if not may_hedge():
+        return first.result(), False
+
+    second = executor.submit(hedge)
+    is_hedge = {first: False, second: True}
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=FIRST_COMPLETED)
+        # Prefer the primary when both finished together
+        for future in sorted(done, key=lambda f: is_hedge[f]):
+            if future.exception() is None:
+                return future.result(), is_hedge[future]
+            if error is None:
+                error = future.exception()
+            logger.warning(f"{'Hedged' if is_hedge[future] else 'Primary'} request failed: {future.exception()}")
+    raise error
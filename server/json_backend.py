@@ -0,0 +1,68 @@
+"""JSON encoding/decoding that uses orjson when it is installed."""
+import json
+import logging
+from typing import Any, IO, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Set up logging
+logger = logging.getLogger("toast-json")
+
+# Name of the backend in use, for logging and benchmarks
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: UTF-8 encoded bytes or a str
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError is a subclass of ValueError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """
+    Encode an object as JSON text.
+
+    Args:
+        obj: Object to encode
+        indent: Indent nested levels by this many spaces (orjson only supports 2;
+            any other indent uses the standard library)
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError as e:
+            # Types orjson can't serialize (and integers over 64 bits) still work with json
+            logger.debug(f"orjson could not encode object, falling back to json: {e}")
+    return json.dumps(obj, indent=indent)
+
+
+def dump(obj: Any, fp: IO[str], indent: Optional[int] = None):
+    """
+    Encode an object as JSON and write it to a text file.
+
+    Args:
+        obj: Object to encode
+        fp: File opened in text mode
+        indent: See dumps()
+    """
+    fp.write(dumps(obj, indent=indent))
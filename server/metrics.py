@@ -0,0 +1,265 @@
+"""In-process metrics for Toast API requests, per endpoint and restaurant."""
+import os
+import time
+import bisect
+import threading
+import logging
+from typing import Dict, Any, List, Optional
+
+from server.file_lock import atomic_write
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-metrics")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    # Upper bounds of the buckets in milliseconds; a final bucket catches everything slower
+    BUCKET_BOUNDS_MS = [25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def observe(self, milliseconds: float):
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.min_ms = milliseconds if self.min_ms is None else min(self.min_ms, milliseconds)
+        self.max_ms = milliseconds if self.max_ms is None else max(self.max_ms, milliseconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a percentile by interpolating within its bucket.
+
+        Args:
+            fraction: Percentile as a fraction (0.95 for p95)
+
+        Returns:
+            Estimated latency in milliseconds, or None without observations
+        """
+        if self.count == 0:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = self.BUCKET_BOUNDS_MS[i] if i < len(self.BUCKET_BOUNDS_MS) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                # Never report beyond what was actually observed
+                return max(self.min_ms, min(self.max_ms, estimate))
+            seen += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        def rounded(value):
+            return round(value, 1) if value is not None else None
+
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.BUCKET_BOUNDS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "min_ms": rounded(self.min_ms),
+            "max_ms": rounded(self.max_ms),
+            "p50_ms": rounded(self.percentile(0.50)),
+            "p95_ms": rounded(self.percentile(0.95)),
+            "p99_ms": rounded(self.percentile(0.99)),
+            "buckets": buckets
+        }
+
+
+class EndpointMetrics:
+    """Counters and latency histogram for one endpoint and restaurant."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0             # Attempts that failed without a response (timeouts, resets, ...)
+        self.retries = 0
+        self.retry_budget_exhausted = 0  # Retries not sent because the shared retry budget was spent
+        self.hedges = 0             # Duplicate requests sent for slow requests
+        self.hedge_wins = 0         # Hedges that answered before the original request
+        self.status_401 = 0
+        self.status_429 = 0
+        self.status_5xx = 0
+        self.response_bytes = 0     # Decoded body bytes
+        self.wire_bytes = 0         # Bytes on the wire (compressed when the server compressed)
+        self.backoff_seconds = 0.0  # Time slept between retries
+        self.rate_limit_wait_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "retry_budget_exhausted": self.retry_budget_exhausted,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "status_401": self.status_401,
+            "status_429": self.status_429,
+            "status_5xx": self.status_5xx,
+            "response_bytes": self.response_bytes,
+            "wire_bytes": self.wire_bytes,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "rate_limit_wait_seconds": round(self.rate_limit_wait_seconds, 3),
+            "latency": self.latency.to_dict()
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of request metrics keyed by endpoint and restaurant GUID.
+
+    Every Toast API client in the process records into the module-level `registry`.
+    The server and CLI scripts read it with snapshot() or write it out with dump().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[tuple, EndpointMetrics] = {}
+        self.started_at = time.time()
+
+    def _get(self, endpoint: str, restaurant_guid: Optional[str]) -> EndpointMetrics:
+        key = (endpoint, restaurant_guid)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = EndpointMetrics()
+        return metrics
+
+    def record_response(self, endpoint: str, restaurant_guid: Optional[str], status: int, seconds: float,
+                        response_bytes: int = 0, wire_bytes: int = 0):
+        """Record one HTTP response (any status)."""
+        with self._lock:
+            metrics = self._get(endpoint, restaurant_guid)
+            metrics.requests += 1
+            metrics.latency.observe(seconds * 1000)
+            metrics.response_bytes += response_bytes
+            metrics.wire_bytes += wire_bytes
+            if status == 401:
+                metrics.status_401 += 1
+            elif status == 429:
+                metrics.status_429 += 1
+            elif status >= 500:
+                metrics.status_5xx += 1
+
+    def record_error(self, endpoint: str, restaurant_guid: Optional[str]):
+        """Record an attempt that failed before a response arrived."""
+        with self._lock:
+            metrics = self._get(endpoint, restaurant_guid)
+            metrics.requests += 1
+            metrics.errors += 1
+
+    def record_retry(self, endpoint: str, restaurant_guid: Optional[str], backoff_seconds: float = 0.0):
+        """Record a retry and the time slept before it."""
+        with self._lock:
+            metrics = self._get(endpoint, restaurant_guid)
+            metrics.retries += 1
+            metrics.backoff_seconds += backoff_seconds
+
+    def record_retry_budget_exhausted(self, endpoint: str, restaurant_guid: Optional[str]):
+        """Record a retry that was not sent because the retry budget was spent."""
+        with self._lock:
+            self._get(endpoint, restaurant_guid).retry_budget_exhausted += 1
+
+    def record_hedge(self, endpoint: str, restaurant_guid: Optional[str], won: bool):
+        """Record a hedged request and whether it beat the original."""
+        with self._lock:
+            metrics = self._get(endpoint, restaurant_guid)
+            metrics.hedges += 1
+            if won:
+                metrics.hedge_wins += 1
+
+    def record_rate_limit_wait(self, endpoint: str, restaurant_guid: Optional[str], seconds: float):
+        """Record time spent waiting for the rate limiter."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._get(endpoint, restaurant_guid).rate_limit_wait_seconds += seconds
+
+    def latency_percentile(self, endpoint: str, restaurant_guid: Optional[str], fraction: float,
+                           min_samples: int = 1) -> Optional[float]:
+        """
+        Estimate a latency percentile for an endpoint.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the requests were made for
+            fraction: Percentile as a fraction (0.95 for p95)
+            min_samples: Fewest recorded responses for the estimate to be returned
+
+        Returns:
+            Milliseconds, or None if fewer than min_samples responses have been recorded
+        """
+        with self._lock:
+            metrics = self._metrics.get((endpoint, restaurant_guid))
+            if metrics is None or metrics.latency.count < max(1, min_samples):
+                return None
+            return metrics.latency.percentile(fraction)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy every metric into a JSON-serializable dict.
+
+        Returns:
+            Dict with 'started_at', 'uptime_seconds', per-endpoint 'endpoints' entries
+            and 'totals' across all of them
+        """
+        with self._lock:
+            endpoints: List[Dict[str, Any]] = []
+            for (endpoint, restaurant_guid), metrics in sorted(self._metrics.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+                entry = metrics.to_dict()
+                entry["endpoint"] = endpoint
+                entry["restaurant_guid"] = restaurant_guid
+                endpoints.append(entry)
+        totals = {}
+        for field in ("requests", "errors", "retries", "retry_budget_exhausted", "hedges", "hedge_wins", "status_401", "status_429", "status_5xx",
+                      "response_bytes", "wire_bytes", "backoff_seconds", "rate_limit_wait_seconds"):
+            totals[field] = sum(entry[field] for entry in endpoints)
+        totals["latency_seconds"] = round(sum(entry["latency"]["count"] * (entry["latency"]["mean_ms"] or 0) for entry in endpoints) / 1000, 3)
+        return {
+            "started_at": self.started_at,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "pid": os.getpid(),
+            "endpoints": endpoints,
+            "totals": totals
+        }
+
+    def reset(self):
+        """Forget every recorded metric."""
+        with self._lock:
+            self._metrics.clear()
+            self.started_at = time.time()
+
+    def dump(self, path: str):
+        """
+        Write a snapshot to a JSON file.
+
+        Args:
+            path: Destination file path
+        """
+        atomic_write(path, json_backend.dumps(self.snapshot(), indent=2).encode("utf-8"), mode=0o644)
+        logger.info(f"Wrote Toast API metrics to {path}")
+
+    def log_summary(self):
+        """Log one line per endpoint and restaurant with the headline numbers."""
+        for entry in self.snapshot()["endpoints"]:
+            latency = entry["latency"]
+            logger.info(f"{entry['endpoint']} ({entry['restaurant_guid']}): {entry['requests']} requests, "
+                        f"p50 {latency['p50_ms'] or 0:.0f}ms, p95 {latency['p95_ms'] or 0:.0f}ms, "
+                        f"{entry['wire_bytes'] / 1024:.1f}KB on the wire, {entry['retries']} retries "
+                        f"({entry['retry_budget_exhausted']} refused by the retry budget), "
+                        f"{entry['hedges']} hedges ({entry['hedge_wins']} won), "
+                        f"401/429/5xx {entry['status_401']}/{entry['status_429']}/{entry['status_5xx']}, "
+                        f"backoff {entry['backoff_seconds']:.1f}s, rate limit wait {entry['rate_limit_wait_seconds']:.1f}s")
+
+
+# Registry shared by every client in this process
+registry = MetricsRegistry()
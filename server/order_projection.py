@@ -0,0 +1,164 @@
+"""Field projections of Toast orders, so reports only keep the parts of each order they read."""
+import io
+from typing import Dict, Any, List, Union, Callable
+
+from server import json_backend
+
+# ijson is optional: it parses a response one order at a time instead of all at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# A field spec maps each kept key to True (keep the whole value) or to a nested spec,
+# which is applied to the value, or to every element of it if the value is a list
+FieldSpec = Dict[str, Union[bool, "FieldSpec"]]
+
+
+def compile_fields(fields: FieldSpec) -> Callable[[Any], Any]:
+    """
+    Build a function that keeps only the declared fields of a JSON value.
+
+    Keys missing from the value stay missing, and a null where a nested spec is
+    declared stays null, so code reading the result with .get() behaves as it does
+    on the full value. The spec is resolved once here rather than for every order.
+
+    Args:
+        fields: Field spec to apply
+
+    Returns:
+        Function taking a decoded JSON value (dict, list of dicts, or anything else) and
+        returning its projected copy
+    """
+    kept = tuple(key for key, spec in fields.items() if spec is True)
+    nested = tuple((key, compile_fields(spec)) for key, spec in fields.items() if spec is not True)
+
+    def project(value: Any) -> Any:
+        if isinstance(value, dict):
+            result = {key: value[key] for key in kept if key in value}
+            for key, project_nested in nested:
+                if key in value:
+                    result[key] = project_nested(value[key])
+            return result
+        if isinstance(value, list):
+            return [project(item) for item in value]
+        return value
+
+    return project
+
+
+class OrderProjection:
+    """
+    A named set of order fields to keep.
+
+    The order GUID is always kept, since paging and syncing use it to tell orders apart.
+    """
+
+    def __init__(self, name: str, fields: FieldSpec):
+        """
+        Initialize the projection.
+
+        Args:
+            name: Name of the projection, e.g. "tips"
+            fields: Field spec applied to each order
+        """
+        self.name = name
+        self.fields = {"guid": True, **fields}
+        self._project = compile_fields(self.fields)
+
+    def project_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Project a list of full orders.
+
+        Args:
+            orders: Orders as returned by the API
+
+        Returns:
+            Projected orders
+        """
+        return [self._project(order) for order in orders]
+
+    def parse(self, content: bytes, streaming: bool = False) -> Any:
+        """
+        Decode an ordersBulk response body, keeping only the projected fields.
+
+        By default the body is decoded whole with json_backend and then projected,
+        which is the fastest way with orjson. With streaming (and ijson installed), orders
+        are parsed and projected one at a time, so a full page is never in memory at once;
+        that is slower, but peak memory per page drops to about a third.
+
+        Args:
+            content: Response body, a list of orders or a dict with an 'orders' list
+            streaming: Parse the body one order at a time with ijson
+
+        Returns:
+            The decoded body with every order projected
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        if not streaming or ijson is None:
+            result = json_backend.loads(content)
+            if isinstance(result, list):
+                return self.project_orders(result)
+            if isinstance(result, dict) and isinstance(result.get("orders"), list):
+                return {**result, "orders": self.project_orders(result["orders"])}
+            return result
+
+        is_list = content.lstrip()[:1] == b"["
+        try:
+            orders = [self._project(order) for order in
+                      ijson.items(io.BytesIO(content), "item" if is_list else "orders.item", use_float=True)]
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in ordersBulk response: {e}") from e
+        return orders if is_list else {"orders": orders}
+
+
+# Fields read by get_tips (process_tips_data): payment amounts, tips, dates and servers,
+# plus the check totals the tax calculation uses
+TIPS = OrderProjection("tips", {
+    "paidDate": True,
+    "openedDate": True,
+    "checks": {
+        "amount": True,
+        "totalAmount": True,
+        "payments": {
+            "guid": True,
+            "tipAmount": True,
+            "amount": True,
+            "paidBusinessDate": True,
+            "paidDate": True,
+            "voidInfo": True,
+            "paymentStatus": True,
+            "server": {"guid": True}
+        }
+    }
+})
+
+# Fields read by get_orders (process_orders_data): selections with their prices, sales
+# categories and discounts, plus non-gratuity service charges
+ITEM_SALES = OrderProjection("item_sales", {
+    "voided": True,
+    "source": True,
+    "checks": {
+        "appliedServiceCharges": {
+            "gratuity": True,
+            "chargeAmount": True
+        },
+        "selections": {
+            "voided": True,
+            "displayName": True,
+            "quantity": True,
+            "receiptLinePrice": True,
+            "preDiscountPrice": True,
+            "price": True,
+            "salesCategory": {"guid": True},
+            "appliedDiscounts": {
+                "processingState": True,
+                "discountAmount": True
+            }
+        }
+    }
+})
+
+PROJECTIONS = {projection.name: projection for projection in (TIPS, ITEM_SALES)}
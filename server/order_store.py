@@ -0,0 +1,89 @@
+"""Local store of orders for closed Toast business days."""
+import os
+import gzip
+import datetime
+import logging
+from typing import Dict, Any, List, Optional
+
+from server.file_lock import atomic_write
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-order-store")
+
+
+class OrderStore:
+    """
+    Compressed on-disk copy of every order for a restaurant's settled business days.
+
+    Once a business date is older than the settle window its orders no longer change,
+    so they are fetched from Toast once, written to one gzip file per restaurant GUID
+    and business date, and served from that file from then on. Files are written
+    atomically and never modified afterwards, so any number of clients and processes
+    can read them without locking.
+    """
+
+    def __init__(self, cache_dir: str, settle_days: int):
+        """
+        Initialize the order store.
+
+        Args:
+            cache_dir: Directory that holds the store
+            settle_days: Number of days after which a business date is treated as closed
+        """
+        self.directory = os.path.join(cache_dir, "orders")
+        self.settle_days = settle_days
+
+    def _path(self, restaurant_guid: str, business_date: str) -> str:
+        return os.path.join(self.directory, restaurant_guid, f"{business_date.replace('-', '')}.json.gz")
+
+    def is_settled(self, business_date: str) -> bool:
+        """
+        Check whether a business date is old enough for its orders to be final.
+
+        Args:
+            business_date: Business date in YYYY-MM-DD format
+
+        Returns:
+            True if the date is at least settle_days before today
+        """
+        try:
+            date = datetime.datetime.strptime(business_date, "%Y-%m-%d").date()
+        except ValueError:
+            return False
+        return (datetime.date.today() - date).days >= self.settle_days
+
+    def get(self, restaurant_guid: str, business_date: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load the stored orders for a business date.
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+
+        Returns:
+            List of orders, or None if the date has not been stored
+        """
+        path = self._path(restaurant_guid, business_date)
+        try:
+            with gzip.open(path, "rb") as f:
+                orders = json_backend.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable order store file {path}: {e}")
+            return None
+        return orders if isinstance(orders, list) else None
+
+    def put(self, restaurant_guid: str, business_date: str, orders: List[Dict[str, Any]]):
+        """
+        Store the complete set of orders for a settled business date.
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+            orders: Every order for the business date
+        """
+        path = self._path(restaurant_guid, business_date)
+        atomic_write(path, gzip.compress(json_backend.dumps(orders).encode("utf-8")), mode=0o644)
+        logger.info(f"Stored {len(orders)} orders for business date {business_date} in {path}")
@@ -0,0 +1,148 @@
+"""Incrementally synced local copies of orders for open Toast business days."""
+import os
+import gzip
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from server.file_lock import FileLock, atomic_write
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-order-sync")
+
+
+class OrderSyncStore:
+    """
+    Compressed on-disk copy of a restaurant's orders for business days that are still open.
+
+    Each copy records a checkpoint: the time up to which every order modification is
+    known to be included. A later request only needs the orders modified since the
+    checkpoint, which are merged into the copy by order GUID. Unlike OrderStore files,
+    these copies change, so every read-merge-write happens under a per-file FileLock
+    and several clients and processes can sync the same business date safely.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the sync store.
+
+        Args:
+            cache_dir: Directory that holds the store
+        """
+        self.directory = os.path.join(cache_dir, "order_sync")
+
+    def _path(self, restaurant_guid: str, business_date: str) -> str:
+        return os.path.join(self.directory, restaurant_guid, f"{business_date.replace('-', '')}.json.gz")
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        """Read a synced copy, treating a missing or corrupt file as absent."""
+        try:
+            with gzip.open(path, "rb") as f:
+                state = json_backend.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable order sync file {path}: {e}")
+            return None
+        if not isinstance(state, dict) or not isinstance(state.get("orders"), list) or not state.get("checkpoint"):
+            return None
+        return state
+
+    def get(self, restaurant_guid: str, business_date: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """
+        Load the synced copy of a business date.
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+
+        Returns:
+            Tuple of (checkpoint as a Unix timestamp, list of orders), or None if the date
+            has not been synced
+        """
+        state = self._read(self._path(restaurant_guid, business_date))
+        if state is None:
+            return None
+        return state["checkpoint"], state["orders"]
+
+    def put(self, restaurant_guid: str, business_date: str, orders: List[Dict[str, Any]], checkpoint: float):
+        """
+        Replace the synced copy of a business date with a complete fetch.
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+            orders: Every order for the business date
+            checkpoint: Time the fetch started (Unix timestamp)
+        """
+        path = self._path(restaurant_guid, business_date)
+        with FileLock(f"{path}.lock"):
+            self._write(path, orders, checkpoint)
+        logger.info(f"Synced {len(orders)} orders for business date {business_date}")
+
+    def merge(self, restaurant_guid: str, business_date: str, changed_orders: List[Dict[str, Any]],
+              checkpoint: Optional[float]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Merge orders modified since the checkpoint into the synced copy of a business date.
+
+        An incoming order replaces the stored order with the same GUID unless the stored
+        one has a later modifiedDate (another process synced it more recently).
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+            changed_orders: Orders for the business date modified since the checkpoint
+            checkpoint: New checkpoint (Unix timestamp), or None to keep the current one
+                because the changes may be incomplete
+
+        Returns:
+            Every order for the business date after the merge, or None if the date has
+            not been synced
+        """
+        path = self._path(restaurant_guid, business_date)
+        with FileLock(f"{path}.lock"):
+            state = self._read(path)
+            if state is None:
+                return None
+
+            orders = state["orders"]
+            index = {order.get("guid"): i for i, order in enumerate(orders)}
+            added = updated = 0
+            for order in changed_orders:
+                i = index.get(order.get("guid"))
+                if i is None:
+                    index[order.get("guid")] = len(orders)
+                    orders.append(order)
+                    added += 1
+                elif (order.get("modifiedDate") or "") >= (orders[i].get("modifiedDate") or ""):
+                    orders[i] = order
+                    updated += 1
+
+            new_checkpoint = max(state["checkpoint"], checkpoint) if checkpoint is not None else state["checkpoint"]
+            if added or updated or new_checkpoint != state["checkpoint"]:
+                self._write(path, orders, new_checkpoint)
+
+        logger.info(f"Merged {added} new and {updated} updated orders into business date {business_date} "
+                    f"({len(orders)} orders in total)")
+        return orders
+
+    def discard(self, restaurant_guid: str, business_date: str):
+        """
+        Delete the synced copy of a business date, e.g. once it is in the settled order store.
+
+        Args:
+            restaurant_guid: Restaurant the orders belong to
+            business_date: Business date in YYYY-MM-DD format
+        """
+        path = self._path(restaurant_guid, business_date)
+        with FileLock(f"{path}.lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+        logger.info(f"Discarded synced orders for settled business date {business_date}")
+
+    @staticmethod
+    def _write(path: str, orders: List[Dict[str, Any]], checkpoint: float):
+        state = {"checkpoint": checkpoint, "orders": orders}
+        atomic_write(path, gzip.compress(json_backend.dumps(state).encode("utf-8")), mode=0o644)
@@ -0,0 +1,404 @@
+"""Token-bucket rate limiter shared by every Toast API client on the machine."""
+import os
+import json
+import time
+import logging
+import email.utils
+from typing import Dict, Any, List, Optional, Tuple, Mapping
+
+from server.file_lock import FileLock, atomic_write
+
+# Set up logging
+logger = logging.getLogger("toast-rate-limiter")
+
+# Default limits as (requests per second, burst size). Toast allows 20 requests per
+# second per client and restaurant across all endpoints, and 5 per second on ordersBulk.
+DEFAULT_RATE_LIMITS = {
+    "default": (20.0, 20.0),
+    "/orders/v2/ordersBulk": (5.0, 5.0)
+}
+
+# Response headers that carry the server's view of the remaining rate budget
+RATE_LIMIT_REMAINING_HEADERS = ("X-Toast-RateLimit-Remaining", "RateLimit-Remaining", "X-RateLimit-Remaining")
+RATE_LIMIT_RESET_HEADERS = ("X-Toast-RateLimit-Reset", "RateLimit-Reset", "X-RateLimit-Reset")
+RATE_LIMIT_LIMIT_HEADERS = ("X-Toast-RateLimit-Limit", "RateLimit-Limit", "X-RateLimit-Limit")
+
+# How long a rate estimate learned from a 429 without rate limit headers takes to
+# recover linearly back to the configured rate
+THROTTLED_ESTIMATE_SECONDS = 60.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the value is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _first_header(headers: Mapping[str, str], names: Tuple[str, ...]) -> Optional[float]:
+    """Get the first of several headers that holds a number."""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            # Structured RateLimit headers may carry parameters after a semicolon
+            return float(str(value).split(";")[0].split(",")[0].strip())
+        except ValueError:
+            continue
+    return None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> Optional[Tuple[float, float, Optional[float]]]:
+    """
+    Read the remaining budget and reset time from rate limit response headers.
+
+    Args:
+        headers: Case-insensitive response headers
+
+    Returns:
+        Tuple of (remaining requests, seconds until reset, limit or None), or None if
+        the response carries no usable rate limit headers
+    """
+    remaining = _first_header(headers, RATE_LIMIT_REMAINING_HEADERS)
+    reset = _first_header(headers, RATE_LIMIT_RESET_HEADERS)
+    if remaining is None or reset is None:
+        return None
+    # Reset may be an absolute epoch timestamp rather than a number of seconds
+    if reset > 1_000_000_000:
+        reset = reset - time.time()
+    return max(0.0, remaining), max(0.0, reset), _first_header(headers, RATE_LIMIT_LIMIT_HEADERS)
+
+
+def parse_rate_limits(spec: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse a rate limit specification string.
+
+    The format is a semicolon-separated list of KEY=REQUESTS/SECONDS[:BURST] rules, where
+    KEY is "default", an endpoint path, a restaurant GUID, or ENDPOINT@GUID. "default" and
+    GUID rules limit all requests for a restaurant together; endpoint and ENDPOINT@GUID
+    rules add a limit on one endpoint. For example:
+    "default=20/1;/orders/v2/ordersBulk=5/1;/labor/v1/employees@2437b9ff-...=1/2:2"
+
+    Args:
+        spec: Specification string; rules in it override DEFAULT_RATE_LIMITS
+
+    Returns:
+        Dict mapping rule keys to (requests per second, burst size)
+
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    limits = dict(DEFAULT_RATE_LIMITS)
+    if not spec:
+        return limits
+
+    for rule in spec.split(";"):
+        rule = rule.strip()
+        if not rule:
+            continue
+        try:
+            key, value = rule.split("=", 1)
+            burst = None
+            if ":" in value:
+                value, burst = value.split(":", 1)
+            count, seconds = value.split("/", 1)
+            rate = float(count) / float(seconds)
+            limits[key.strip()] = (rate, float(burst) if burst else max(1.0, float(count)))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit rule '{rule}'. Expected KEY=REQUESTS/SECONDS[:BURST]")
+        if rate <= 0:
+            raise ValueError(f"Invalid rate limit rule '{rule}'. Rate must be positive")
+    return limits
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket rate limiter whose state lives in a file-locked JSON file.
+
+    Every request draws from its restaurant's bucket, which every endpoint shares and
+    whose rate comes from the GUID rule or "default". Endpoints with an ENDPOINT@GUID or
+    ENDPOINT rule also have a bucket of their own per restaurant, and a request only
+    goes out once both buckets have a token. Because the bucket state is on disk behind
+    a FileLock, all threads and all job subprocesses draw from the same buckets.
+
+    Rate limit headers, Retry-After and 429s adjust the narrowest bucket the request
+    drew from: the endpoint's bucket if it has one, otherwise the restaurant's.
+    """
+
+    def __init__(self, state_dir: str, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            state_dir: Directory that holds the shared bucket state file
+            limits: Dict mapping rule keys to (requests per second, burst size)
+        """
+        self.path = os.path.join(state_dir, "rate_limits.json")
+        self._lock = FileLock(f"{self.path}.lock")
+        self.limits = limits if limits is not None else dict(DEFAULT_RATE_LIMITS)
+
+    def buckets_for(self, endpoint: str, restaurant_guid: Optional[str] = None) -> List[Tuple[str, float, float]]:
+        """
+        Get the buckets a request draws from.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request is made for
+
+        Returns:
+            List of (bucket key, requests per second, burst size), narrowest bucket first:
+            the endpoint's bucket if it has a limit of its own, then the restaurant's
+        """
+        restaurant_key = f"*@{restaurant_guid or '*'}"
+        if restaurant_guid and restaurant_guid in self.limits:
+            buckets = [(restaurant_key, *self.limits[restaurant_guid])]
+        else:
+            buckets = [(restaurant_key, *self.limits.get("default", DEFAULT_RATE_LIMITS["default"]))]
+        for key in (f"{endpoint}@{restaurant_guid}", endpoint):
+            if key in self.limits:
+                buckets.insert(0, (f"{endpoint}@{restaurant_guid or '*'}", *self.limits[key]))
+                break
+        return buckets
+
+    def _read_state(self) -> Dict[str, Any]:
+        """Read the bucket state, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"Resetting unreadable rate limiter state {self.path}: {e}")
+            return {}
+
+    def try_acquire(self, endpoint: str, restaurant_guid: Optional[str] = None, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket for a request if they are available.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request is made for
+            tokens: Number of tokens the request costs
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the number of seconds to wait before
+            enough tokens will be available
+        """
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            buckets = {}
+            wait_seconds = 0.0
+            for bucket_key, rate, burst in self.buckets_for(endpoint, restaurant_guid):
+                bucket, rate, burst = self._refill(state, bucket_key, rate, burst, now)
+                buckets[bucket_key] = bucket
+
+                # The server told us to hold off (Retry-After or an exhausted budget)
+                blocked_until = bucket.get("blocked_until", 0)
+                if blocked_until > now:
+                    wait_seconds = max(wait_seconds, blocked_until - now)
+                elif bucket["tokens"] < tokens:
+                    wait_seconds = max(wait_seconds, (tokens - bucket["tokens"]) / rate)
+
+            # Take the tokens from every bucket or from none of them
+            if wait_seconds > 0:
+                return wait_seconds
+
+            for bucket in buckets.values():
+                bucket["tokens"] -= tokens
+            self._write_state(state, buckets, now)
+            return 0.0
+
+    def _narrowest_bucket(self, state: Dict[str, Any], endpoint: str, restaurant_guid: Optional[str], now: float):
+        """
+        Bring the narrowest bucket of a request up to date; learned limits are applied to it.
+
+        Returns:
+            Tuple of (bucket key, bucket dict, effective rate)
+        """
+        bucket_key, rate, burst = self.buckets_for(endpoint, restaurant_guid)[0]
+        bucket, rate, _ = self._refill(state, bucket_key, rate, burst, now)
+        return bucket_key, bucket, rate
+
+    @staticmethod
+    def _refill(state: Dict[str, Any], bucket_key: str, rate: float, burst: float, now: float):
+        """
+        Bring a bucket up to date, applying any live rate estimate that has not expired.
+
+        Args:
+            state: Bucket state as read from disk
+            bucket_key: Key of the bucket in the state
+            rate: Configured requests per second for the bucket
+            burst: Configured burst size for the bucket
+            now: Current Unix timestamp
+
+        Returns:
+            Tuple of (bucket dict, effective rate, burst size)
+        """
+        bucket = dict(state.get(bucket_key) or {"tokens": burst, "updated": now})
+
+        if bucket.get("estimate_until", 0) > now and bucket.get("estimated_rate"):
+            estimated_rate = bucket["estimated_rate"]
+            since = bucket.get("estimate_since")
+            if since is not None and bucket["estimate_until"] > since:
+                # Estimates from bare 429s ramp back up to the configured rate instead of
+                # snapping back when they expire
+                progress = (now - since) / (bucket["estimate_until"] - since)
+                estimated_rate += max(0.0, rate - estimated_rate) * min(1.0, max(0.0, progress))
+            rate = min(rate, estimated_rate)
+        else:
+            bucket.pop("estimated_rate", None)
+            bucket.pop("estimate_until", None)
+            bucket.pop("estimate_since", None)
+
+        bucket["tokens"] = min(burst, bucket.get("tokens", burst) + max(0.0, now - bucket.get("updated", now)) * rate)
+        bucket["updated"] = now
+        bucket["rate"] = rate
+        bucket["burst"] = burst
+        return bucket, rate, burst
+
+    def _write_state(self, state: Dict[str, Any], buckets: Dict[str, Dict[str, Any]], now: float):
+        """Store buckets by key, dropping other buckets that are idle and would be full again."""
+        state.update(buckets)
+        state = {
+            key: value for key, value in state.items()
+            if key in buckets
+            or value.get("blocked_until", 0) > now
+            or value.get("estimate_until", 0) > now
+            or now - value.get("updated", 0) < value.get("burst", 1.0) / max(value.get("rate", 1.0), 1e-6)
+        }
+        atomic_write(self.path, json.dumps(state).encode("utf-8"), mode=0o644)
+
+    def defer(self, endpoint: str, restaurant_guid: Optional[str], seconds: float):
+        """
+        Hold every caller of a bucket off for a while, e.g. after a Retry-After header.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request was made for
+            seconds: Number of seconds no request may be sent
+        """
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            bucket_key, bucket, _ = self._narrowest_bucket(state, endpoint, restaurant_guid, now)
+            bucket["blocked_until"] = max(bucket.get("blocked_until", 0), now + seconds)
+            self._write_state(state, {bucket_key: bucket}, now)
+        logger.info(f"Deferring requests to {endpoint} for {seconds:.2f}s as instructed by the server")
+
+    def observe(self, endpoint: str, restaurant_guid: Optional[str], remaining: float, reset_seconds: float):
+        """
+        Pace a bucket to the budget reported by the server's rate limit headers.
+
+        The bucket is capped at the remaining budget and refilled at remaining/reset so
+        that the next requests are spread evenly until the server's window resets.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request was made for
+            remaining: Requests the server says are left in its window
+            reset_seconds: Seconds until the server's window resets
+        """
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            bucket_key, bucket, _ = self._narrowest_bucket(state, endpoint, restaurant_guid, now)
+            if remaining <= 0:
+                bucket["tokens"] = 0.0
+                bucket["blocked_until"] = max(bucket.get("blocked_until", 0), now + reset_seconds)
+            elif reset_seconds > 0:
+                bucket["tokens"] = min(bucket["tokens"], remaining)
+                bucket["estimated_rate"] = remaining / reset_seconds
+                bucket["estimate_until"] = now + reset_seconds
+                bucket.pop("estimate_since", None)
+            self._write_state(state, {bucket_key: bucket}, now)
+
+    def throttled(self, endpoint: str, restaurant_guid: Optional[str]):
+        """
+        Halve the live rate estimate for a bucket after a 429 that carried no rate limit headers.
+
+        The lowered rate then climbs back linearly to the configured rate over
+        THROTTLED_ESTIMATE_SECONDS, so repeated 429s keep pacing down and a quiet
+        stretch speeds requests up again gradually.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request was made for
+        """
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            bucket_key, bucket, rate = self._narrowest_bucket(state, endpoint, restaurant_guid, now)
+            bucket["estimated_rate"] = max(rate / 2.0, 0.05)
+            bucket["estimate_since"] = now
+            bucket["estimate_until"] = now + THROTTLED_ESTIMATE_SECONDS
+            bucket["tokens"] = min(bucket["tokens"], 0.0)
+            self._write_state(state, {bucket_key: bucket}, now)
+        logger.info(f"Lowered estimated rate for {endpoint} to {bucket['estimated_rate']:.2f} req/s after a 429")
+
+    def current_rate(self, endpoint: str, restaurant_guid: Optional[str] = None) -> float:
+        """
+        Get the live estimate of the allowed request rate for a bucket.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the requests are made for
+
+        Returns:
+            Requests per second currently allowed, combining the configured limits of the
+            endpoint and restaurant buckets with anything learned from rate limit headers
+            and 429 responses
+        """
+        with self._lock:
+            now = time.time()
+            state = self._read_state()
+            rates = []
+            for bucket_key, rate, burst in self.buckets_for(endpoint, restaurant_guid):
+                bucket, rate, _ = self._refill(state, bucket_key, rate, burst, now)
+                if bucket.get("blocked_until", 0) > now:
+                    return 0.0
+                rates.append(rate)
+            return min(rates)
+
+    def acquire(self, endpoint: str, restaurant_guid: Optional[str] = None, tokens: float = 1.0) -> float:
+        """
+        Block until the request's tokens can be taken from its bucket.
+
+        Args:
+            endpoint: API endpoint path
+            restaurant_guid: Restaurant GUID the request is made for
+            tokens: Number of tokens the request costs
+
+        Returns:
+            Total number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait_seconds = self.try_acquire(endpoint, restaurant_guid, tokens)
+            if wait_seconds <= 0:
+                if waited > 0:
+                    logger.info(f"Rate limiter delayed request to {endpoint} by {waited:.2f}s")
+                return waited
+            time.sleep(wait_seconds)
+            waited += wait_seconds
@@ -0,0 +1,108 @@
+"""On-disk HTTP response cache for slowly changing Toast API directories."""
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+from server.file_lock import atomic_write
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-response-cache")
+
+
+class ResponseCache:
+    """
+    File-backed cache of decoded API responses keyed by restaurant, endpoint and parameters.
+
+    Each response is stored in its own file together with the ETag / Last-Modified
+    validators the API sent with it, so a stale entry can be revalidated with a
+    conditional request instead of downloaded again. Entries are written atomically,
+    so clients in other threads and processes can share the cache without locking.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory that holds the cache files
+            ttl_seconds: How long an entry is served without revalidating it
+        """
+        self.directory = os.path.join(cache_dir, "responses")
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(restaurant_guid: str, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build a stable file name for one restaurant/endpoint/parameter combination."""
+        raw = json.dumps([restaurant_guid, endpoint, params or {}], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, restaurant_guid: str, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        return os.path.join(self.directory, f"{self._key(restaurant_guid, endpoint, params)}.json")
+
+    def get(self, restaurant_guid: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            restaurant_guid: Restaurant the response belongs to
+            endpoint: API endpoint path
+            params: Query parameters of the request
+
+        Returns:
+            Dict with 'body', 'fetched_at', 'etag' and 'last_modified', or None if nothing is cached
+        """
+        path = self._path(restaurant_guid, endpoint, params)
+        try:
+            with open(path, "rb") as f:
+                entry = json_backend.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable response cache entry {path}: {e}")
+            return None
+        if not isinstance(entry, dict) or "body" not in entry:
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is still within its TTL."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    def put(self, restaurant_guid: str, endpoint: str, params: Optional[Dict[str, Any]], body: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a response, replacing any previous entry.
+
+        Args:
+            restaurant_guid: Restaurant the response belongs to
+            endpoint: API endpoint path
+            params: Query parameters of the request
+            body: Decoded JSON response body
+            etag: ETag header sent with the response
+            last_modified: Last-Modified header sent with the response
+        """
+        entry = {
+            "endpoint": endpoint,
+            "params": params,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        atomic_write(self._path(restaurant_guid, endpoint, params), json_backend.dumps(entry).encode("utf-8"))
+
+    def touch(self, restaurant_guid: str, endpoint: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any]):
+        """
+        Restart an entry's TTL after the API confirmed it is unchanged (304 Not Modified).
+
+        Args:
+            restaurant_guid: Restaurant the response belongs to
+            endpoint: API endpoint path
+            params: Query parameters of the request
+            entry: Entry previously returned by get()
+        """
+        self.put(restaurant_guid, endpoint, params, entry["body"], entry.get("etag"), entry.get("last_modified"))
@@ -0,0 +1,148 @@
+"""Retry budget shared by every Toast API client in the process (or on the machine)."""
+import os
+import json
+import time
+import random
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from server.file_lock import FileLock, atomic_write
+
+# Set up logging
+logger = logging.getLogger("toast-retry-budget")
+
+# Exit status of the job scripts when they stop because the retry budget is spent (EX_PROTOCOL),
+# kept apart from the circuit breaker's UPSTREAM_UNAVAILABLE_EXIT_CODE (75)
+RETRY_BUDGET_EXHAUSTED_EXIT_CODE = 76
+
+
+class RetryBudgetExhaustedError(Exception):
+    """Raised instead of retrying a failed request when the shared retry budget is spent."""
+
+    def __init__(self, endpoint: str, restaurant_guid: Optional[str]):
+        self.endpoint = endpoint
+        self.restaurant_guid = restaurant_guid
+        super().__init__(f"Retry budget exhausted: not retrying failed request to {endpoint} (restaurant {restaurant_guid}) "
+                         f"because too many requests to Toast are being retried")
+
+
+def full_jitter(backoff_seconds: float) -> float:
+    """
+    Pick a retry delay with full jitter: uniformly between 0 and the exponential backoff.
+
+    Callers that failed at the same moment then retry at different moments instead of
+    all at once.
+
+    Args:
+        backoff_seconds: Exponential backoff for this attempt
+
+    Returns:
+        Seconds to wait
+    """
+    return random.uniform(0, backoff_seconds)
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of successful requests.
+
+    Every successful request earns ratio retries and every retry spends one. A small
+    allowance of min_per_second retries accrues regardless, so a client with little
+    traffic can still retry a failure, and the balance is capped at max_balance so a
+    long healthy stretch can't save up a retry storm for the next outage. With
+    state_dir the balance lives in a file-locked JSON file and is shared by every
+    process on the machine; otherwise it is shared by the threads of this process.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 0.5, max_balance: float = 10.0,
+                 state_dir: Optional[str] = None):
+        """
+        Initialize the retry budget.
+
+        Args:
+            ratio: Retries allowed per successful request
+            min_per_second: Retries allowed per second on top of that
+            max_balance: Most retries that can be saved up
+            state_dir: Directory for the shared balance file, or None to keep it in memory
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        if state_dir:
+            self.path = os.path.join(state_dir, "retry_budget.json")
+            self._lock = FileLock(f"{self.path}.lock")
+        else:
+            self.path = None
+            self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+    def _read_state(self) -> Dict[str, Any]:
+        """Read the shared balance, treating a missing or corrupt file as a full budget."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"Resetting unreadable retry budget state {self.path}: {e}")
+            return {}
+
+    def _update(self, spend: bool) -> bool:
+        """Bring the balance up to date, then spend a retry or earn a success's share."""
+        with self._lock:
+            now = time.time()
+            state = self._read_state() if self.path else self._state
+            balance = state.get("balance", self.max_balance) + max(0.0, now - state.get("updated", now)) * self.min_per_second
+            balance = min(self.max_balance, balance)
+
+            allowed = True
+            if spend:
+                allowed = balance >= 1.0
+                if allowed:
+                    balance -= 1.0
+            else:
+                balance = min(self.max_balance, balance + self.ratio)
+
+            state = {"balance": balance, "updated": now}
+            if self.path:
+                atomic_write(self.path, json.dumps(state).encode("utf-8"), mode=0o644)
+            else:
+                self._state = state
+            return allowed
+
+    def record_success(self):
+        """Earn the retry share of one successful request."""
+        self._update(spend=False)
+
+    def try_spend(self) -> bool:
+        """
+        Spend one retry if the budget allows it.
+
+        Returns:
+            True if the retry may be sent
+        """
+        return self._update(spend=True)
+
+
+_shared_budgets: Dict[Tuple[float, Optional[str]], RetryBudget] = {}
+_shared_budgets_lock = threading.Lock()
+
+
+def shared_retry_budget(ratio: float, state_dir: Optional[str] = None) -> RetryBudget:
+    """
+    Get the process-wide retry budget for a ratio (and shared state directory).
+
+    Args:
+        ratio: Retries allowed per successful request
+        state_dir: Directory for a balance shared across processes, or None
+
+    Returns:
+        The same RetryBudget for every caller with the same arguments
+    """
+    key = (ratio, state_dir)
+    with _shared_budgets_lock:
+        if key not in _shared_budgets:
+            _shared_budgets[key] = RetryBudget(ratio, state_dir=state_dir)
+        return _shared_budgets[key]
@@ -17,6 +17,11 @@ from datetime import datetime
 from pathlib import Path
 from flask import Flask, request, jsonify
 
+# Add the project root to the path so the shared server modules import when run from server/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from server.circuit_breaker import UPSTREAM_UNAVAILABLE_EXIT_CODE
+from server.retry_budget import RETRY_BUDGET_EXHAUSTED_EXIT_CODE
+
 # =============================================================================
 # LOGGING SETUP - All logs go to one place with clear formatting
 # =============================================================================
@@ -92,6 +97,14 @@ def send_error_notification(error_msg: str, context: str = "server", traceback_s
         logger.error(f"Failed to send error notification: {e}")
         return False
 
+def failure_message(returncode: int) -> str:
+    """Describe why a get_tips.py / get_orders.py process failed, from its exit status"""
+    if returncode == UPSTREAM_UNAVAILABLE_EXIT_CODE:
+        return "Toast API upstream unavailable"
+    if returncode == RETRY_BUDGET_EXHAUSTED_EXIT_CODE:
+        return "Toast API retry budget exhausted"
+    return f"Process failed with return code {returncode}"
+
 def validate_request_data(data):
     """Validate incoming request data"""
     if not data:
@@ -137,6 +150,9 @@ def run_get_tips_script(task_id: str, params: dict, synchronous: bool = False):
         else:
             cmd.extend(['--response-webhook-url', params['webhook_url']])
         
+        # Save Toast API request metrics for /metrics/<task_id>
+        cmd.extend(['--metrics-file', str(Path("logs") / f"metrics_{task_id}.json")])
+        
         logger.info(f"Running command: {' '.join(cmd)}")
         logger.info(f"Environment TOAST_LOCATION_INDEX: {env.get('TOAST_LOCATION_INDEX')}")
         
@@ -204,9 +220,13 @@ def run_get_tips_script(task_id: str, params: dict, synchronous: bool = False):
             }
         else:
             logger.error(f"Tips task {task_id} failed with return code {process.returncode}")
+            upstream_unavailable = process.returncode == UPSTREAM_UNAVAILABLE_EXIT_CODE
+            retry_budget_exhausted = process.returncode == RETRY_BUDGET_EXHAUSTED_EXIT_CODE
             task_results[task_id] = {
                 'status': 'failed',
-                'error': f"Process failed with return code {process.returncode}",
+                'error': failure_message(process.returncode),
+                'upstream_unavailable': upstream_unavailable,
+                'retry_budget_exhausted': retry_budget_exhausted,
                 'output': output[-1000:],  # Last 1000 chars
                 'log_file': str(log_file),
                 'failed_at': datetime.now().isoformat()
@@ -271,6 +291,9 @@ def run_get_orders_script(task_id: str, params: dict):
             if params.get('webhook_url'):
                 cmd.extend(['--webhook-url', params['webhook_url']])
         
+        # Save Toast API request metrics for /metrics/<task_id>
+        cmd.extend(['--metrics-file', str(Path("logs") / f"metrics_{task_id}.json")])
+        
         logger.info(f"Running command: {' '.join(cmd)}")
         logger.info(f"Environment TOAST_LOCATION_INDEX: {env.get('TOAST_LOCATION_INDEX')}")
         
@@ -303,9 +326,13 @@ def run_get_orders_script(task_id: str, params: dict):
             }
         else:
             logger.error(f"Orders task {task_id} failed with return code {process.returncode}")
+            upstream_unavailable = process.returncode == UPSTREAM_UNAVAILABLE_EXIT_CODE
+            retry_budget_exhausted = process.returncode == RETRY_BUDGET_EXHAUSTED_EXIT_CODE
             task_results[task_id] = {
                 'status': 'failed',
-                'error': f"Process failed with return code {process.returncode}",
+                'error': failure_message(process.returncode),
+                'upstream_unavailable': upstream_unavailable,
+                'retry_budget_exhausted': retry_budget_exhausted,
                 'output': output[-1000:],  # Last 1000 chars
                 'log_file': str(log_file),
                 'failed_at': datetime.now().isoformat()
@@ -634,6 +661,28 @@ def get_task_logs(task_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics/<task_id>', methods=['GET'])
+def get_task_metrics(task_id):
+    """Get Toast API request metrics (latency, bytes, retries) for a specific task"""
+    
+    try:
+        metrics_file = Path("logs") / f"metrics_{task_id}.json"
+        
+        if not metrics_file.exists():
+            return jsonify({'error': 'Metrics file not found'}), 404
+        
+        with open(metrics_file, 'r') as f:
+            metrics = json.load(f)
+        
+        return jsonify({
+            'task_id': task_id,
+            'metrics': metrics,
+            'metrics_file': str(metrics_file)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/debug', methods=['GET'])
 def debug_info():
     """Get debug information about the server"""
@@ -689,6 +738,7 @@ if __name__ == '__main__':
         logger.info("  POST /orders       - Process orders data (replaces /run)")
         logger.info("  GET  /status/<id>  - Check task status")
         logger.info("  GET  /logs/<id>    - View task logs")
+        logger.info("  GET  /metrics/<id> - View task Toast API metrics")
         logger.info("  GET  /health       - Health check")
         logger.info("  GET  /debug        - Debug information")
         
@@ -0,0 +1,145 @@
+"""Single-flight coalescing of identical in-flight Toast API requests."""
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from typing import Dict, Any, Callable, Optional
+
+from server.file_lock import FileLock, atomic_write
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-single-flight")
+
+
+class _Call:
+    """One in-flight call and the outcome its followers wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its result with every caller
+    that asked for the same key while it was running.
+
+    Within a process, callers in other threads wait for the leader's call and get the
+    same parsed result object, so results must be treated as read-only. In-flight calls
+    are tracked per process, shared by every SingleFlight instance, so separate client
+    instances coalesce with each other.
+
+    With a shared directory, coalescing also spans processes: the leader holds a
+    per-key FileLock while it runs and publishes its result to a file, and a process
+    that was waiting on that lock reuses the result instead of repeating the call.
+    """
+
+    # Published cross-process results and lock files older than this are removed
+    SHARED_FILE_MAX_AGE_SECONDS = 600
+
+    # In-flight calls in this process by key, shared by all instances
+    _calls: Dict[str, _Call] = {}
+    _calls_lock = threading.Lock()
+
+    def __init__(self, shared_dir: Optional[str] = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            shared_dir: Directory for cross-process locks and results. If None, calls
+                are only coalesced across threads of this process.
+        """
+        self.shared_dir = shared_dir
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a key identifying a call from its parts (endpoint, parameters, ...).
+
+        Returns:
+            Hex digest that is equal for equal parts regardless of dict ordering
+        """
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already in flight and share its result.
+
+        Args:
+            key: Key from make_key() identifying the call
+            fn: Function making the call; its result must be JSON serializable when
+                coalescing across processes
+
+        Returns:
+            Result of fn (possibly computed by another thread or process)
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every caller that shared the call
+        """
+        with SingleFlight._calls_lock:
+            call = SingleFlight._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                SingleFlight._calls[key] = call
+
+        if not leader:
+            logger.info(f"Joining in-flight request {key[:12]} from another thread")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn) if self.shared_dir else fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with SingleFlight._calls_lock:
+                del SingleFlight._calls[key]
+            call.done.set()
+        return call.result
+
+    def _run_shared(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn under the per-key cross-process lock, reusing a result published while we waited."""
+        waiting_since = time.time()
+        result_path = os.path.join(self.shared_dir, f"{key}.json")
+
+        with FileLock(os.path.join(self.shared_dir, f"{key}.lock")):
+            try:
+                with open(result_path, "rb") as f:
+                    published = json_backend.loads(f.read())
+                if published.get("finished_at", 0) >= waiting_since:
+                    logger.info(f"Reusing result of request {key[:12]} made by another process")
+                    return published["result"]
+            except FileNotFoundError:
+                pass
+            except (ValueError, OSError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable single-flight result {result_path}: {e}")
+
+            result = fn()
+            atomic_write(result_path, json_backend.dumps({"finished_at": time.time(), "result": result}).encode("utf-8"))
+
+        self._prune_shared_files()
+        return result
+
+    def _prune_shared_files(self):
+        """Remove published results and lock files nobody can still be waiting for."""
+        cutoff = time.time() - self.SHARED_FILE_MAX_AGE_SECONDS
+        try:
+            names = os.listdir(self.shared_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.shared_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -1,5 +1,8 @@
 """Toast API client for interacting with the Toast POS system."""
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+import os
 import time
 import datetime
 import urllib.parse
@@ -7,11 +10,133 @@ import json
 import logging
 import importlib
 import sys
-from typing import Dict, Any, Optional, List
+import math
+import threading
+import copy
+import collections
+import weakref
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Iterable
+
+from server.token_store import TokenStore
+from server.response_cache import ResponseCache
+from server.order_store import OrderStore
+from server.order_sync import OrderSyncStore
+from server import order_projection
+from server.order_projection import OrderProjection
+from server import json_backend
+from server.single_flight import SingleFlight
+from server import metrics
+from server.hedging import HedgeBudget, run_hedged
+from server.window_planner import WindowPlanner, parse_timestamp
+from server.circuit_breaker import CircuitBreaker, UpstreamUnavailableError
+from server.retry_budget import RetryBudgetExhaustedError, full_jitter, shared_retry_budget
+from server.transport import CassetteMissError, ReplayTransport, build_transport
+from server.rate_limiter import TokenBucketRateLimiter, parse_rate_limits, parse_retry_after, parse_rate_limit_headers
 
 # Set up logging
 logger = logging.getLogger("toast-client")
 
+# Largest page size each paginated endpoint accepts
+MAX_PAGE_SIZES = {
+    "/orders/v2/ordersBulk": 100
+}
+
+
+def parse_page_sizes(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a page size specification string.
+    
+    The format is a semicolon-separated list of ENDPOINT=SIZE rules, for example
+    "/orders/v2/ordersBulk=50". Sizes are clamped to what the endpoint accepts.
+    
+    Args:
+        spec: Specification string; rules in it override MAX_PAGE_SIZES
+        
+    Returns:
+        Dict mapping endpoint paths to page sizes
+        
+    Raises:
+        ValueError: If a rule is malformed or names an endpoint that isn't paginated
+    """
+    page_sizes = dict(MAX_PAGE_SIZES)
+    if not spec:
+        return page_sizes
+    
+    for rule in spec.split(";"):
+        rule = rule.strip()
+        if not rule:
+            continue
+        try:
+            endpoint, size = rule.split("=", 1)
+            endpoint, size = endpoint.strip(), int(size)
+        except ValueError:
+            raise ValueError(f"Invalid page size rule '{rule}'. Expected ENDPOINT=SIZE")
+        if endpoint not in MAX_PAGE_SIZES:
+            raise ValueError(f"Invalid page size rule '{rule}'. Paginated endpoints are: {', '.join(MAX_PAGE_SIZES)}")
+        if not 1 <= size <= MAX_PAGE_SIZES[endpoint]:
+            logger.warning(f"Page size {size} for {endpoint} is outside 1-{MAX_PAGE_SIZES[endpoint]}, clamping it")
+        page_sizes[endpoint] = min(max(1, size), MAX_PAGE_SIZES[endpoint])
+    return page_sizes
+
+
+class _TokenState:
+    """Auth token shared by a client and every client derived from it with for_restaurant()."""
+    
+    def __init__(self):
+        self.token: Optional[str] = None
+        self.expiry: Optional[float] = None
+        self.lock = threading.RLock()
+        self.refresher: Optional["_TokenRefresher"] = None
+
+
+class _TokenRefresher(threading.Thread):
+    """
+    Daemon thread that renews a client's token before requests would have to.
+    
+    The token is renewed TOKEN_BACKGROUND_REFRESH_SECONDS before it expires, which is
+    before it enters the window in which _ensure_valid_token refreshes inline, so
+    requests keep using the current token and never wait for a login. The thread only
+    holds a weak reference to the client and stops when the client is closed or
+    garbage collected.
+    """
+    
+    # Seconds to wait before trying again after a failed background refresh
+    RETRY_SECONDS = 30.0
+    
+    # Least time between two renewals, so tokens that are short-lived anyway can't make the thread spin
+    MIN_INTERVAL_SECONDS = 60.0
+    
+    def __init__(self, client: "ToastAPIClient"):
+        super().__init__(name="toast-token-refresher", daemon=True)
+        self._client = weakref.ref(client)
+        self._stopped = threading.Event()
+    
+    def stop(self):
+        """Stop the thread; a refresh already under way is finished first."""
+        self._stopped.set()
+    
+    def run(self):
+        client = self._client()
+        if client is None:
+            return
+        delay = client._background_refresh_delay()
+        del client
+        
+        while not self._stopped.wait(delay):
+            client = self._client()
+            if client is None:
+                return
+            try:
+                client._refresh_token_ahead()
+                delay = max(self.MIN_INTERVAL_SECONDS, client._background_refresh_delay())
+            except Exception as e:
+                # Requests still refresh inline once the token enters the refresh window
+                logger.warning(f"Background token refresh failed, trying again in {self.RETRY_SECONDS:.0f}s: {e}")
+                delay = self.RETRY_SECONDS
+            del client
+
+
 class ToastAPIClient:
     """Client for interacting with the Toast API with automatic token management."""
     
@@ -20,12 +145,64 @@ class ToastAPIClient:
     INITIAL_BACKOFF_SECONDS = 1
     MAX_BACKOFF_SECONDS = 30
     
-    def __init__(self):
-        """Initialize the Toast API client with configuration."""
-        # Force reload of config to get the latest values
-        if 'config' in sys.modules:
-            logger.info("Reloading config module to get latest configuration")
-            importlib.reload(sys.modules['config'])
+    # Connection pool and timeout defaults (overridable via config or constructor)
+    DEFAULT_POOL_CONNECTIONS = 4    # Number of per-host pools to keep
+    DEFAULT_POOL_MAXSIZE = 10       # Max keep-alive connections per host
+    DEFAULT_CONNECT_TIMEOUT = 5     # Seconds to establish a TCP/TLS connection
+    DEFAULT_READ_TIMEOUT = 20       # Seconds to wait for a data response
+    AUTH_READ_TIMEOUT = 10          # Seconds to wait for an auth response
+    
+    # Hedging waits for this many ordersBulk responses before trusting the latency
+    # percentile, and never hedges a request that has been out for less than the minimum
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_MIN_DELAY_SECONDS = 0.25
+    
+    # Wide ordersBulk date ranges are split into windows of about this many pages each
+    ORDERS_WINDOW_TARGET_PAGES = 10
+    
+    # Batched employee lookups keep each request URL under this many characters, well
+    # below the limits of common servers and proxies
+    MAX_URL_LENGTH = 2000
+    
+    # A time entries window that still fails after the request's own retries is
+    # requested again, up to this many attempts in all
+    TIME_ENTRIES_WINDOW_ATTEMPTS = 3
+    
+    # Synced business days whose checkpoint is older than this are fetched in full again,
+    # since the orders modified since then would include most of the following day
+    ORDER_SYNC_MAX_AGE_SECONDS = 86400
+    
+    # Refresh tokens that expire within this many seconds
+    TOKEN_REFRESH_WINDOW_SECONDS = 300
+    
+    # The background refresher renews tokens this many seconds before they expire
+    TOKEN_BACKGROUND_REFRESH_SECONDS = 600
+    
+    def __init__(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                 pool_block: Optional[bool] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, restaurant_guid: Optional[str] = None,
+                 location_index: Optional[int] = None, transport: Optional[HTTPAdapter] = None):
+        """
+        Initialize the Toast API client with configuration.
+        
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of keep-alive connections per host
+            pool_block: If True, never open more than pool_maxsize connections to a host
+            connect_timeout: Timeout in seconds for establishing connections
+            read_timeout: Timeout in seconds for reading data responses
+            restaurant_guid: Restaurant to talk to. Defaults to TOAST_RESTAURANT_GUID from config.
+            location_index: Location index (1-5) in LOCATION_GUID_MAP to talk to, instead of
+                restaurant_guid. When either is given the config module is not reloaded.
+            transport: Transport adapter to send every request (including authentication)
+                through, e.g. a RecordingTransport or ReplayTransport from server/transport.py.
+                Defaults to the one selected by TOAST_TRANSPORT_MODE, or a plain pooled HTTPAdapter.
+        """
+        if restaurant_guid is None and location_index is None:
+            # Force reload of config to get the latest values
+            if 'config' in sys.modules:
+                logger.info("Reloading config module to get latest configuration")
+                importlib.reload(sys.modules['config'])
             
         # Import the config module (after potential reload)
         import config.config as config
@@ -33,22 +210,268 @@ class ToastAPIClient:
         # Store configuration values from imported module
         self.base_url = config.TOAST_API_BASE_URL
         self.auth_url = config.TOAST_AUTH_URL
-        self.restaurant_guid = config.TOAST_RESTAURANT_GUID
+        self.restaurant_guid = restaurant_guid or self.resolve_restaurant_guid(location_index)
         self.client_id = config.TOAST_CLIENT_ID
         self.client_secret = config.TOAST_CLIENT_SECRET
         
+        # Connection pool and timeout settings - explicit arguments win over config
+        self.pool_connections = pool_connections or getattr(config, 'TOAST_POOL_CONNECTIONS', None) or self.DEFAULT_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or getattr(config, 'TOAST_POOL_MAXSIZE', None) or self.DEFAULT_POOL_MAXSIZE
+        self.pool_block = pool_block if pool_block is not None else getattr(config, 'TOAST_POOL_BLOCK', False)
+        self.connect_timeout = connect_timeout or getattr(config, 'TOAST_CONNECT_TIMEOUT', None) or self.DEFAULT_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or getattr(config, 'TOAST_READ_TIMEOUT', None) or self.DEFAULT_READ_TIMEOUT
+        
+        # Pluggable transport - record to or replay from a cassette instead of only going live
+        self.transport = transport or build_transport(
+            getattr(config, 'TOAST_TRANSPORT_MODE', None), getattr(config, 'TOAST_CASSETTE', None),
+            getattr(config, 'TOAST_REPLAY_LATENCY', 0.0), self.auth_url,
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block, max_retries=0
+        )
+        
+        # Token-bucket rate limiter shared with every other client, thread and job process
+        if getattr(config, 'TOAST_RATE_LIMITER', True):
+            self.rate_limiter = TokenBucketRateLimiter(config.TOAST_CACHE_DIR, parse_rate_limits(getattr(config, 'TOAST_RATE_LIMITS', None)))
+        else:
+            self.rate_limiter = None
+        
+        # Circuit breaker shared the same way, so an outage fails every job fast
+        if getattr(config, 'TOAST_CIRCUIT_BREAKER', True):
+            self.circuit_breaker = CircuitBreaker(config.TOAST_CACHE_DIR, getattr(config, 'TOAST_CIRCUIT_BREAKER_FAILURES', 5),
+                                                  getattr(config, 'TOAST_CIRCUIT_BREAKER_COOLDOWN', 30.0))
+        else:
+            self.circuit_breaker = None
+        
+        # Retries from every client in the process (or, when enabled, on the machine) are
+        # capped at a fraction of successful requests
+        if getattr(config, 'TOAST_RETRY_BUDGET', True):
+            budget_dir = config.TOAST_CACHE_DIR if getattr(config, 'TOAST_RETRY_BUDGET_PROCESSES', False) else None
+            self.retry_budget = shared_retry_budget(getattr(config, 'TOAST_RETRY_BUDGET_RATIO', 0.1), budget_dir)
+        else:
+            self.retry_budget = None
+        
+        # Live per-endpoint latency estimates (seconds, exponentially weighted)
+        self._latency_estimates: Dict[str, float] = {}
+        self._latency_lock = threading.Lock()
+        
+        # On-disk cache for the employee, job and menu directories
+        if getattr(config, 'TOAST_RESPONSE_CACHE', True):
+            self.response_cache = ResponseCache(config.TOAST_CACHE_DIR, getattr(config, 'TOAST_RESPONSE_CACHE_TTL', 3600))
+        else:
+            self.response_cache = None
+        
+        # Local store of orders for closed business days
+        if getattr(config, 'TOAST_ORDER_STORE', True):
+            self.order_store = OrderStore(config.TOAST_CACHE_DIR, getattr(config, 'TOAST_ORDER_STORE_SETTLE_DAYS', 3))
+        else:
+            self.order_store = None
+        
+        # Incrementally synced copies of orders for business days that are still open. A sync
+        # asks for the orders modified up to now, which no cassette can have recorded, so
+        # replays always fetch whole days instead.
+        if getattr(config, 'TOAST_ORDER_SYNC', True) and not isinstance(self.transport, ReplayTransport):
+            self.order_sync = OrderSyncStore(config.TOAST_CACHE_DIR)
+            self.order_sync_overlap = getattr(config, 'TOAST_ORDER_SYNC_OVERLAP', 300)
+        else:
+            self.order_sync = None
+        
+        # Identical in-flight GET requests share one HTTP call across threads (and, when
+        # enabled, across processes through the cache directory)
+        if getattr(config, 'TOAST_SINGLE_FLIGHT', True):
+            shared_dir = os.path.join(config.TOAST_CACHE_DIR, "single_flight") if getattr(config, 'TOAST_SINGLE_FLIGHT_PROCESSES', False) else None
+            self.single_flight = SingleFlight(shared_dir)
+        else:
+            self.single_flight = None
+        
+        # Number of ordersBulk pages get_orders keeps in flight at once
+        self.orders_page_concurrency = getattr(config, 'TOAST_ORDERS_PAGE_CONCURRENCY', None) or 1
+        
+        # Number of time windows of a date range get_orders fetches at once
+        self.orders_window_concurrency = getattr(config, 'TOAST_ORDERS_WINDOW_CONCURRENCY', None) or 1
+        
+        # Items per page for paginated endpoints
+        self.page_sizes = parse_page_sizes(getattr(config, 'TOAST_PAGE_SIZES', None))
+        
+        # Parse projected ordersBulk pages one order at a time (needs ijson)
+        self.stream_orders = getattr(config, 'TOAST_STREAM_ORDERS', False)
+        if self.stream_orders and order_projection.ijson is None:
+            logger.warning("TOAST_STREAM_ORDERS is set but ijson is not installed (see requirements-optional.txt); "
+                           "ordersBulk pages will be decoded whole")
+        
+        # Long time entries ranges are fetched as windows of this many days, several at once
+        self.time_entries_window_days = getattr(config, 'TOAST_TIME_ENTRIES_WINDOW_DAYS', None) or 7
+        self.time_entries_concurrency = getattr(config, 'TOAST_TIME_ENTRIES_CONCURRENCY', None) or 1
+        
+        # Number of employeeIds batches get_employees fetches at once
+        self.employee_lookup_concurrency = getattr(config, 'TOAST_EMPLOYEE_LOOKUP_CONCURRENCY', None) or 1
+        
+        # Hedged ordersBulk page requests (off unless enabled in config)
+        if getattr(config, 'TOAST_HEDGE_ORDERS', False):
+            self.hedge_percentile = getattr(config, 'TOAST_HEDGE_PERCENTILE', 0.95)
+            self.hedge_budget = HedgeBudget(getattr(config, 'TOAST_HEDGE_MAX_RATIO', 0.1))
+            # Each hedged page may briefly need two threads
+            self._hedge_pool = ThreadPoolExecutor(max_workers=2 * self.pool_maxsize, thread_name_prefix="toast-hedge")
+        else:
+            self.hedge_budget = None
+            self._hedge_pool = None
+        
         # Log the GUID being used
         logger.info(f"Initializing Toast API client with restaurant GUID: {self.restaurant_guid}")
         
-        # Token management
-        self.token = None
-        self.token_expiry = None
+        # Token management - tokens are shared with other clients through the token store,
+        # and with clients made by for_restaurant() through the shared token state
+        self._token_state = _TokenState()
+        self.token_store = TokenStore(config.TOAST_CACHE_DIR) if getattr(config, 'TOAST_TOKEN_CACHE', True) else None
+        if isinstance(self.transport, ReplayTransport):
+            # Replayed tokens are placeholders that must never be shared with live clients
+            self.token_store = None
         
         if not all([self.restaurant_guid, self.client_id, self.client_secret]):
             raise ValueError("Missing required Toast API credentials")
         
-        # Get initial token
-        self._refresh_token()
+        # Pooled keep-alive session shared by every request this client makes. Clients
+        # made by for_restaurant() borrow it, and only this client closes it.
+        self.session = self._build_session()
+        self._owns_session = True
+        
+        # Get initial token (reusing a cached one when it is still valid)
+        self._ensure_valid_token()
+        
+        # Optionally renew the token in the background before it nears expiry
+        if getattr(config, 'TOAST_TOKEN_BACKGROUND_REFRESH', False):
+            self._token_state.refresher = _TokenRefresher(self)
+            self._token_state.refresher.start()
+    
+    @staticmethod
+    def resolve_restaurant_guid(location_index: Optional[int] = None) -> Optional[str]:
+        """
+        Look up the restaurant GUID for a location index.
+        
+        Args:
+            location_index: Location index (1-5) in LOCATION_GUID_MAP. If None, the
+                configured TOAST_RESTAURANT_GUID is returned.
+            
+        Returns:
+            Restaurant GUID
+            
+        Raises:
+            ValueError: If the location index is not in LOCATION_GUID_MAP
+        """
+        import config.config as config
+        
+        if location_index is None:
+            return config.TOAST_RESTAURANT_GUID
+        if location_index not in config.LOCATION_GUID_MAP:
+            raise ValueError(f"Invalid location index: {location_index}. Must be between 1 and 5.")
+        return config.LOCATION_GUID_MAP[location_index]
+    
+    @property
+    def token(self) -> Optional[str]:
+        return self._token_state.token
+    
+    @token.setter
+    def token(self, value: Optional[str]):
+        self._token_state.token = value
+    
+    @property
+    def token_expiry(self) -> Optional[float]:
+        return self._token_state.expiry
+    
+    @token_expiry.setter
+    def token_expiry(self, value: Optional[float]):
+        self._token_state.expiry = value
+    
+    def for_restaurant(self, restaurant_guid: str) -> "ToastAPIClient":
+        """
+        Create a client for another restaurant that shares this client's resources.
+        
+        The new client uses the same HTTP session (and so the same connection pool),
+        auth token, rate limiter, caches, hedge budget and latency estimates. These stay
+        owned by this client: closing the new client does nothing, and closing this one
+        closes them for both.
+        
+        Args:
+            restaurant_guid: Restaurant the new client talks to
+            
+        Returns:
+            ToastAPIClient for restaurant_guid
+        """
+        client = copy.copy(self)
+        client.restaurant_guid = restaurant_guid
+        client._owns_session = False
+        logger.info(f"Created Toast API client for restaurant GUID {restaurant_guid} sharing the session and token of {self.restaurant_guid}")
+        return client
+    
+    def _build_session(self) -> requests.Session:
+        """
+        Create a requests session backed by a keep-alive connection pool.
+        
+        Retries are handled by _make_request, so the adapter itself never retries.
+        
+        Returns:
+            Configured requests.Session
+        """
+        session = requests.Session()
+        adapter = self.transport or HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Ask for every compression urllib3 can decode (gzip and deflate, plus br when
+        # the brotli package is installed) - order pages are large, repetitive JSON
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        logger.info(f"Created HTTP session with pool_connections={self.pool_connections}, pool_maxsize={self.pool_maxsize}, "
+                    f"pool_block={self.pool_block}, timeouts=(connect {self.connect_timeout}s, read {self.read_timeout}s), "
+                    f"Accept-Encoding: {ACCEPT_ENCODING}, JSON backend: {json_backend.BACKEND}, transport: {type(adapter).__name__}")
+        return session
+    
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Report how many requests were served over new versus reused connections.
+        
+        Returns:
+            Dict with 'requests', 'new_connections' and 'reused_connections' counts
+            summed over every host pool currently held by the session
+        """
+        total_requests = 0
+        new_connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(0, total_requests - new_connections)
+        }
+    
+    def close(self):
+        """
+        Close the underlying HTTP session and release pooled connections.
+        
+        Does nothing on a client made by for_restaurant(), whose session belongs to the
+        client it was made from.
+        """
+        if not self._owns_session:
+            return
+        if self._token_state.refresher is not None:
+            self._token_state.refresher.stop()
+        if self._hedge_pool is not None:
+            # Don't wait for the losers of hedged requests
+            self._hedge_pool.shutdown(wait=False)
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _refresh_token(self):
         """
@@ -56,6 +479,7 @@ class ToastAPIClient:
         
         Raises:
             requests.exceptions.RequestException: If the authentication request fails after retries
+            RetryBudgetExhaustedError: If a retry is needed but the shared retry budget is spent
         """
         logger.info("Attempting to fetch new authentication token from Toast API...")
         logger.info(f"Using auth URL: {self.auth_url}")
@@ -74,16 +498,16 @@ class ToastAPIClient:
             try:
                 logger.info(f"Authentication attempt {current_retry + 1}/{self.MAX_RETRIES + 1}. Payload: {json.dumps(payload, indent=2)}")
                 
-                response = requests.post(
+                response = self.session.post(
                     self.auth_url,
                     json=payload,
                     headers=headers,
-                    timeout=10 # Add a timeout for auth requests
+                    timeout=(self.connect_timeout, self.AUTH_READ_TIMEOUT)
                 )
                 
                 logger.info(f"Auth response status: {response.status_code}")
                 if response.status_code == 429:
-                    logger.warning(f"Auth request received 429 (Too Many Requests). Retrying in {backoff_seconds}s...")
+                    logger.warning("Auth request received 429 (Too Many Requests). Retrying...")
                     # Fall through to the retry sleep logic
                 elif response.status_code != 200:
                     logger.error(f"Auth response error: {response.text}")
@@ -96,29 +520,11 @@ class ToastAPIClient:
                     logger.info(f"Auth token response keys: {', '.join(auth_data.keys())}")
                     # logger.info(f"Full authentication response: {json.dumps(auth_data, indent=2)}") # Potentially too verbose for regular logs
                     
-                    access_token = None
-                    token_data = auth_data.get('token')
-                    
-                    if isinstance(token_data, dict) and 'accessToken' in token_data:
-                        access_token = token_data.get('accessToken')
-                        expires_in = token_data.get('expiresIn')
-                        if expires_in and isinstance(expires_in, (int, float)):
-                            buffer = 3600  # 1 hour buffer
-                            self.token_expiry = time.time() + (expires_in - buffer)
-                        else:
-                            self.token_expiry = time.time() + (23 * 60 * 60) # Default 23 hours
-                    elif isinstance(token_data, str): # Direct token string
-                        access_token = token_data
-                        self.token_expiry = time.time() + (23 * 60 * 60)
-                    else: # Try alternative common keys
-                        access_token = auth_data.get('accessToken', auth_data.get('access_token'))
-                        self.token_expiry = time.time() + (23 * 60 * 60)
-                        
-                    if not access_token:
-                        logger.error(f"Could not find token in response: {auth_data}")
-                        raise ValueError("No valid token found in authentication response")
+                    access_token, self.token_expiry = self._parse_token_response(auth_data)
                     
                     self.token = access_token
+                    if self.retry_budget is not None:
+                        self.retry_budget.record_success()
                     logger.info(f"Successfully retrieved new token, valid until: {datetime.datetime.fromtimestamp(self.token_expiry).strftime('%Y-%m-%d %H:%M:%S')}")
                     return # Success, exit refresh method
 
@@ -133,8 +539,9 @@ class ToastAPIClient:
             
             # Retry logic
             if current_retry < self.MAX_RETRIES:
-                logger.info(f"Waiting {backoff_seconds}s before next auth attempt...")
-                time.sleep(backoff_seconds)
+                wait_seconds = self._retry_delay(urllib.parse.urlsplit(self.auth_url).path, backoff_seconds)
+                logger.info(f"Waiting {wait_seconds:.2f}s before next auth attempt...")
+                time.sleep(wait_seconds)
                 current_retry += 1
                 backoff_seconds = min(self.MAX_BACKOFF_SECONDS, backoff_seconds * 2) # Exponential backoff
             else:
@@ -148,21 +555,165 @@ class ToastAPIClient:
                 else: # Fallback if no specific exception was caught and loop finished
                     raise requests.exceptions.RequestException("Max retries reached for authentication after undefined error.")
     
-    def _ensure_valid_token(self):
-        """Ensure we have a valid authentication token, refreshing if necessary."""
-        # If no token or token is expired/expiring soon (within 5 minutes)
-        if self.token is None or self.token_expiry is None or time.time() + 300 > self.token_expiry:
+    @staticmethod
+    def _parse_token_response(auth_data: Dict[str, Any]):
+        """
+        Extract the access token and its expiry from an authentication response.
+        
+        Args:
+            auth_data: Parsed JSON body of the authentication response
+            
+        Returns:
+            Tuple of (access token, expiry timestamp)
+            
+        Raises:
+            ValueError: If the response does not contain a token
+        """
+        access_token = None
+        token_data = auth_data.get('token')
+        
+        if isinstance(token_data, dict) and 'accessToken' in token_data:
+            access_token = token_data.get('accessToken')
+            expires_in = token_data.get('expiresIn')
+            if expires_in and isinstance(expires_in, (int, float)):
+                buffer = 3600  # 1 hour buffer
+                token_expiry = time.time() + (expires_in - buffer)
+            else:
+                token_expiry = time.time() + (23 * 60 * 60) # Default 23 hours
+        elif isinstance(token_data, str): # Direct token string
+            access_token = token_data
+            token_expiry = time.time() + (23 * 60 * 60)
+        else: # Try alternative common keys
+            access_token = auth_data.get('accessToken', auth_data.get('access_token'))
+            token_expiry = time.time() + (23 * 60 * 60)
+            
+        if not access_token:
+            logger.error(f"Could not find token in response: {auth_data}")
+            raise ValueError("No valid token found in authentication response")
+        
+        return access_token, token_expiry
+    
+    def _token_needs_refresh(self, expiry: Optional[float], window_seconds: Optional[float] = None) -> bool:
+        """Check whether a token with the given expiry is missing, expired or expiring soon."""
+        if window_seconds is None:
+            window_seconds = self.TOKEN_REFRESH_WINDOW_SECONDS
+        return expiry is None or time.time() + window_seconds > expiry
+    
+    def _ensure_valid_token(self, rejected_token: Optional[str] = None):
+        """
+        Ensure we have a valid authentication token, refreshing if necessary.
+        
+        A token cached by another client, thread or process is reused when it is outside
+        the refresh window. A new token is only minted while holding the token store lock,
+        so concurrent callers wait for one login instead of each logging in.
+        
+        Args:
+            rejected_token: Token the API just rejected with a 401; it is never reused
+        """
+        # Fast path - our own token is still good
+        if rejected_token is None and self.token is not None and not self._token_needs_refresh(self.token_expiry):
+            return
+        
+        with self._token_state.lock:
+            # Another client sharing this token state may have refreshed it while we waited
+            if self.token is not None and self.token != rejected_token and not self._token_needs_refresh(self.token_expiry):
+                return
+            
+            if self.token_store is None:
+                self._refresh_token()
+            else:
+                self._refresh_token_via_store(rejected_token)
+    
+    def _refresh_token_via_store(self, rejected_token: Optional[str] = None, window_seconds: Optional[float] = None):
+        """Adopt the token cached by another client or process, minting one only if none is usable."""
+        with self.token_store.lock():
+            cached = self.token_store.get(self.client_id)
+            if cached is not None:
+                cached_token, cached_expiry = cached
+                if cached_token != rejected_token and not self._token_needs_refresh(cached_expiry, window_seconds):
+                    self.token = cached_token
+                    self.token_expiry = cached_expiry
+                    logger.info(f"Reusing cached authentication token, valid until: {datetime.datetime.fromtimestamp(cached_expiry).strftime('%Y-%m-%d %H:%M:%S')}")
+                    return
+            
             self._refresh_token()
+            self.token_store.put(self.client_id, self.token, self.token_expiry)
+    
+    def _background_refresh_delay(self) -> float:
+        """Seconds until the background refresher should renew the current token."""
+        expiry = self.token_expiry
+        if expiry is None:
+            return 0.0
+        return max(0.0, expiry - time.time() - self.TOKEN_BACKGROUND_REFRESH_SECONDS)
+    
+    def _refresh_token_ahead(self):
+        """
+        Renew the token if it expires within TOKEN_BACKGROUND_REFRESH_SECONDS.
+        
+        Used by the background refresher. The current token stays in use until the new
+        one replaces it, so only requests that find it inside the inline refresh
+        window (or rejected with a 401) wait for this refresh.
+        """
+        with self._token_state.lock:
+            if not self._token_needs_refresh(self.token_expiry, self.TOKEN_BACKGROUND_REFRESH_SECONDS):
+                return
+            logger.info("Renewing authentication token in the background ahead of expiry")
+            if self.token_store is None:
+                self._refresh_token()
+            else:
+                self._refresh_token_via_store(window_seconds=self.TOKEN_BACKGROUND_REFRESH_SECONDS)
     
-    def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
+    def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None,
+                      projection: Optional[OrderProjection] = None) -> Dict[str, Any]:
         """
         Make a request to the Toast API with retry logic.
         
+        GET requests identical to one already in flight (same restaurant, endpoint and
+        parameters) wait for it and share its parsed result, which callers must not modify.
+        
         Args:
             endpoint: API endpoint to call
             method: HTTP method to use
             params: Query parameters for the request
             data: JSON body for POST requests
+            projection: Order projection to decode an ordersBulk response with, keeping only
+                its fields
+            
+        Returns:
+            Dict containing the API response
+            
+        Raises:
+            requests.exceptions.RequestException: If the API request fails after retries
+        """
+        if method == "GET" and data is None and self.single_flight is not None:
+            # Share the call and its parsed result with identical requests already in flight
+            key = SingleFlight.make_key(self.restaurant_guid, endpoint, params, projection.name if projection else None)
+            return self.single_flight.do(key, lambda: self._decode_response(self._send_request(endpoint, params=params), projection))
+        
+        response = self._send_request(endpoint, method=method, params=params, data=data)
+        return self._decode_response(response, projection)
+    
+    def _decode_response(self, response: requests.Response, projection: Optional[OrderProjection] = None) -> Any:
+        """Decode a JSON response body (through the projection, if given), falling back to the raw text."""
+        try:
+            if projection is not None:
+                return projection.parse(response.content, streaming=self.stream_orders)
+            return json_backend.loads(response.content)
+        except ValueError: # json.JSONDecodeError and orjson.JSONDecodeError are subclasses of ValueError
+            logger.error("Response is not JSON. Returning raw text.")
+            return {"rawText": response.text}
+    
+    def _cached_request(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """
+        Make a GET request through the on-disk response cache.
+        
+        Fresh cache entries are returned without calling the API. Stale entries are
+        revalidated with If-None-Match / If-Modified-Since, and a 304 Not Modified
+        response reuses the cached body.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters for the request
             
         Returns:
             Dict containing the API response
@@ -170,6 +721,62 @@ class ToastAPIClient:
         Raises:
             requests.exceptions.RequestException: If the API request fails after retries
         """
+        if self.response_cache is None:
+            return self._make_request(endpoint, params=params)
+        if self.single_flight is None:
+            return self._fetch_through_cache(endpoint, params)
+        
+        key = SingleFlight.make_key(self.restaurant_guid, endpoint, params)
+        return self.single_flight.do(key, lambda: self._fetch_through_cache(endpoint, params))
+    
+    def _fetch_through_cache(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """Serve, revalidate or refetch one response cache entry. See _cached_request."""
+        entry = self.response_cache.get(self.restaurant_guid, endpoint, params)
+        if entry is not None and self.response_cache.is_fresh(entry):
+            logger.info(f"Using cached response for {endpoint} (fetched {time.time() - entry['fetched_at']:.0f}s ago)")
+            return entry["body"]
+        
+        validators = {}
+        if entry is not None:
+            if entry.get("etag"):
+                validators["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                validators["If-Modified-Since"] = entry["last_modified"]
+        
+        response = self._send_request(endpoint, params=params, extra_headers=validators or None)
+        if response.status_code == 304 and entry is not None:
+            logger.info(f"Cached response for {endpoint} is still current (304 Not Modified)")
+            self.response_cache.touch(self.restaurant_guid, endpoint, params, entry)
+            return entry["body"]
+        
+        body = self._decode_response(response)
+        # Only cache bodies that decoded as JSON
+        if not (isinstance(body, dict) and "rawText" in body):
+            self.response_cache.put(self.restaurant_guid, endpoint, params, body,
+                                    response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return body
+    
+    def _send_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None,
+                      extra_headers: Optional[Dict[str, str]] = None, prepaid: bool = False) -> requests.Response:
+        """
+        Send a request to the Toast API with retry logic.
+        
+        Args:
+            endpoint: API endpoint to call
+            method: HTTP method to use
+            params: Query parameters for the request
+            data: JSON body for POST requests
+            extra_headers: Additional request headers (e.g. conditional request validators)
+            prepaid: The rate limiter token for the first attempt has already been taken
+            
+        Returns:
+            The first response that is neither an error nor retried (2xx or 3xx)
+            
+        Raises:
+            requests.exceptions.RequestException: If the API request fails after retries
+            UpstreamUnavailableError: If the endpoint's circuit is open, or opens while retrying
+            RetryBudgetExhaustedError: If a retry is needed but the shared retry budget is spent
+        """
         # Ensure we have a valid token
         self._ensure_valid_token()
         
@@ -181,6 +788,8 @@ class ToastAPIClient:
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
+        if extra_headers:
+            headers.update(extra_headers)
         
         # Debug the headers and parameters
         logger.info(f"Request URL: {url}")
@@ -193,25 +802,46 @@ class ToastAPIClient:
         backoff_seconds = self.INITIAL_BACKOFF_SECONDS
 
         while current_retry <= self.MAX_RETRIES:
+            retry_after = None # Server-provided delay (Retry-After) for this attempt, if any
+            circuit_open = False # Whether this attempt's failure opened the circuit
+            
+            # Fail fast while Toast is known to be down for this endpoint and restaurant
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(endpoint, self.restaurant_guid)
+            
             try:
                 # Ensure token is valid before each attempt (especially important for long backoffs)
                 self._ensure_valid_token() 
 
                 # Update headers with potentially refreshed token
-                headers["Authorization"] = f"Bearer {self.token}"
+                sent_token = self.token
+                headers["Authorization"] = f"Bearer {sent_token}"
+                
+                # Wait for the shared per-endpoint/per-restaurant rate budget
+                if self.rate_limiter is not None and not (prepaid and current_retry == 0):
+                    waited = self.rate_limiter.acquire(endpoint, self.restaurant_guid)
+                    metrics.registry.record_rate_limit_wait(endpoint, self.restaurant_guid, waited)
                 
                 logger.info(f"API Call Attempt {current_retry + 1}/{self.MAX_RETRIES + 1} to {url}")
 
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     headers=headers,
                     params=params,
                     json=data,
-                    timeout=20 # Increased timeout for data requests
+                    timeout=(self.connect_timeout, self.read_timeout)
                 )
                 
                 logger.info(f"Response status: {response.status_code}")
+                self._record_latency(endpoint, response.elapsed.total_seconds())
+                self._record_response_metrics(endpoint, response)
+                self._observe_rate_limit_headers(endpoint, response)
+                if self.circuit_breaker is not None:
+                    if response.status_code >= 500:
+                        circuit_open = self.circuit_breaker.record_failure(endpoint, self.restaurant_guid)
+                    else:
+                        self.circuit_breaker.record_success(endpoint, self.restaurant_guid)
 
                 if response.status_code == 401:
                     logger.warning("Received 401 Unauthorized. Token might have expired just before use or is invalid. Refreshing and retrying this attempt.")
@@ -220,15 +850,19 @@ class ToastAPIClient:
                     # This attempt won't count as a "failed" retry if the next one succeeds.
                     # However, to avoid tight loops on repeated 401s, we should ensure _refresh_token handles its own retries robustly.
                     # If _refresh_token fails, it will raise, exiting this loop.
-                    self._refresh_token() # Force refresh
+                    # Reject the token this attempt sent, not self.token: if another thread already
+                    # replaced it, that refresh is shared instead of starting a second one
+                    self._ensure_valid_token(rejected_token=sent_token)
                     # We don't increment current_retry here if we want the 401 to not count against main retries,
                     # but it's safer to count it to prevent potential infinite loops if _refresh_token() has issues.
                     # For now, let it re-evaluate at the start of the next loop after _ensure_valid_token.
                     # Let's actually continue to the next iteration of the while loop to re-evaluate.
                     # If it was the last retry, it will exit. Otherwise, it retries with fresh token.
                     if current_retry < self.MAX_RETRIES:
-                        logger.info(f"Waiting {backoff_seconds}s after 401 before retrying request...")
-                        time.sleep(backoff_seconds)
+                        wait_seconds = self._retry_delay(endpoint, backoff_seconds)
+                        logger.info(f"Waiting {wait_seconds:.2f}s after 401 before retrying request...")
+                        time.sleep(wait_seconds)
+                        metrics.registry.record_retry(endpoint, self.restaurant_guid, wait_seconds)
                         current_retry +=1 # Consume a retry attempt for the 401
                         backoff_seconds = min(self.MAX_BACKOFF_SECONDS, backoff_seconds * 2)
                         continue # Jump to next iteration of the while loop
@@ -237,24 +871,29 @@ class ToastAPIClient:
                         response.raise_for_status() # Fail if 401 on last attempt
 
                 elif response.status_code == 429:
-                    logger.warning(f"Received 429 (Too Many Requests). Retrying in {backoff_seconds}s...")
+                    retry_after = self._server_retry_delay(endpoint, response)
+                    logger.warning("Received 429 (Too Many Requests). Retrying...")
                     # Fall through to the retry sleep logic below
                 
                 elif response.status_code >= 500: # Server-side errors
-                    logger.warning(f"Received server error {response.status_code}. Retrying in {backoff_seconds}s...")
+                    retry_after = self._server_retry_delay(endpoint, response)
+                    logger.warning(f"Received server error {response.status_code}. Retrying...")
                     # Fall through to the retry sleep logic below
 
                 else: # Includes successful 2xx responses and other client errors (4xx) not handled above
                     response.raise_for_status() # Raise an exception for other 4xx errors immediately
                                                 # or if it's a 2xx, this does nothing and proceeds.
-                    try:
-                        return response.json()
-                    except ValueError: # json.JSONDecodeError is a subclass of ValueError
-                        logger.error("Response is not JSON. Returning raw text.")
-                        return {"rawText": response.text}
+                    if self.retry_budget is not None:
+                        self.retry_budget.record_success()
+                    return response
                 
                 # If we are here, it means a 429 or 5xx occurred, and we need to retry.
             
+            except CassetteMissError as e:
+                # Replay answers the same request the same way every time, so retrying a miss is pointless
+                logger.warning(f"{e}. No retry in replay mode.")
+                raise
+            
             except requests.exceptions.HTTPError as e:
                 # This catches errors raised by response.raise_for_status() for non-2xx codes
                 # that are not 401, 429, or 5xx (which are handled above for retries).
@@ -265,14 +904,23 @@ class ToastAPIClient:
             except requests.exceptions.RequestException as e:
                 # This catches other network-related errors (DNS failure, connection timeout, etc.)
                 logger.warning(f"RequestException during API request (attempt {current_retry + 1}): {e}")
+                metrics.registry.record_error(endpoint, self.restaurant_guid)
+                if self.circuit_breaker is not None:
+                    circuit_open = self.circuit_breaker.record_failure(endpoint, self.restaurant_guid)
                 if hasattr(e, 'response') and e.response is not None:
                     logger.warning(f"RequestException Response status: {e.response.status_code if e.response else 'N/A'}")
                 # Fall through to the retry sleep logic below
 
+            # Don't retry into an outage: once the circuit is open, fail this request too
+            if circuit_open:
+                raise UpstreamUnavailableError(endpoint, self.restaurant_guid, self.circuit_breaker.cooldown_seconds)
+            
             # Retry logic for 429, 5xx, or general RequestExceptions
             if current_retry < self.MAX_RETRIES:
-                logger.info(f"Waiting {backoff_seconds}s before next API call attempt...")
-                time.sleep(backoff_seconds)
+                wait_seconds = self._retry_delay(endpoint, backoff_seconds, retry_after)
+                logger.info(f"Waiting {wait_seconds:.2f}s before next API call attempt...")
+                time.sleep(wait_seconds)
+                metrics.registry.record_retry(endpoint, self.restaurant_guid, wait_seconds)
                 current_retry += 1
                 backoff_seconds = min(self.MAX_BACKOFF_SECONDS, backoff_seconds * 2) # Exponential backoff
             else: # Max retries reached
@@ -285,13 +933,124 @@ class ToastAPIClient:
                 else: # Fallback if no specific exception was caught and loop finished
                     raise requests.exceptions.RequestException(f"Max retries reached for {endpoint} after undefined error.")
     
-    def get_orders(self, start_date: str, end_date: str) -> Dict[str, Any]:
+    def _retry_delay(self, endpoint: str, backoff_seconds: float, retry_after: Optional[float] = None) -> float:
+        """
+        Take a retry from the shared retry budget and choose how long to wait before it.
+        
+        Args:
+            endpoint: API endpoint being retried
+            backoff_seconds: Exponential backoff for this attempt
+            retry_after: Delay the server asked for (Retry-After), if any
+            
+        Returns:
+            Seconds to wait: the server's delay if it gave one, otherwise a full-jitter delay
+            
+        Raises:
+            RetryBudgetExhaustedError: If the retry budget is spent
+        """
+        if self.retry_budget is not None and not self.retry_budget.try_spend():
+            metrics.registry.record_retry_budget_exhausted(endpoint, self.restaurant_guid)
+            logger.error(f"Retry budget exhausted, not retrying request to {endpoint}")
+            raise RetryBudgetExhaustedError(endpoint, self.restaurant_guid)
+        # Honour the server's Retry-After instead of blind exponential backoff
+        if retry_after is not None:
+            return retry_after
+        return full_jitter(backoff_seconds)
+    
+    def _record_latency(self, endpoint: str, seconds: float):
+        """Fold one response time into the endpoint's exponentially weighted latency estimate."""
+        with self._latency_lock:
+            previous = self._latency_estimates.get(endpoint)
+            self._latency_estimates[endpoint] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+    
+    def _record_response_metrics(self, endpoint: str, response: requests.Response):
+        """Record a response's latency, size and status in the process-wide metrics registry."""
+        response_bytes = len(response.content)
+        content_length = response.headers.get("Content-Length", "")
+        # Content-Length is the (possibly compressed) size on the wire
+        wire_bytes = int(content_length) if content_length.isdigit() else response_bytes
+        metrics.registry.record_response(endpoint, self.restaurant_guid, response.status_code,
+                                         response.elapsed.total_seconds(), response_bytes, wire_bytes)
+    
+    def _observe_rate_limit_headers(self, endpoint: str, response: requests.Response):
+        """Pace the shared rate limiter to the budget reported in the response's rate limit headers."""
+        if self.rate_limiter is None:
+            return
+        rate_limit = parse_rate_limit_headers(response.headers)
+        if rate_limit is None:
+            return
+        remaining, reset_seconds, limit = rate_limit
+        logger.info(f"Rate limit headers for {endpoint}: {remaining:.0f} remaining{f' of {limit:.0f}' if limit is not None else ''}, resets in {reset_seconds:.1f}s")
+        self.rate_limiter.observe(endpoint, self.restaurant_guid, remaining, reset_seconds)
+    
+    def _server_retry_delay(self, endpoint: str, response: requests.Response) -> Optional[float]:
+        """
+        Work out how long the server wants us to wait after a 429 or 5xx response.
+        
+        The delay is also pushed to the shared rate limiter so other callers hold off too.
+        
+        Returns:
+            Seconds from the Retry-After header, or None if the server did not say
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if self.rate_limiter is not None:
+            if retry_after is not None:
+                self.rate_limiter.defer(endpoint, self.restaurant_guid, retry_after)
+            elif response.status_code == 429 and parse_rate_limit_headers(response.headers) is None:
+                self.rate_limiter.throttled(endpoint, self.restaurant_guid)
+        return retry_after
+    
+    def allowed_rate(self, endpoint: str) -> Optional[float]:
+        """
+        Get the live estimate of the allowed request rate for an endpoint.
+        
+        Args:
+            endpoint: API endpoint path
+            
+        Returns:
+            Requests per second, or None if rate limiting is disabled
+        """
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.current_rate(endpoint, self.restaurant_guid)
+    
+    def recommended_concurrency(self, endpoint: str, max_concurrency: int) -> int:
+        """
+        Number of requests to keep in flight so an endpoint runs right at its allowed rate.
+        
+        By Little's law, rate x latency requests in flight saturate the allowed rate;
+        more would only queue in the rate limiter.
+        
+        Args:
+            endpoint: API endpoint path
+            max_concurrency: Upper bound chosen by the caller
+            
+        Returns:
+            Concurrency between 1 and max_concurrency
+        """
+        rate = self.allowed_rate(endpoint)
+        with self._latency_lock:
+            latency = self._latency_estimates.get(endpoint)
+        if rate is None or latency is None:
+            return max(1, max_concurrency)
+        return max(1, min(max_concurrency, math.ceil(rate * latency)))
+    
+    def get_orders(self, start_date: str, end_date: str, max_concurrency: Optional[int] = None,
+                   projection: Optional[OrderProjection] = None) -> Dict[str, Any]:
         """
         Fetch all orders from Toast API within a date range.
         
+        This holds every order in memory at once; use iter_orders() to process
+        long date ranges one page at a time.
+        
         Args:
             start_date: Start date in ISO format with timezone (e.g. "2025-01-01T05:00:00.000Z")
             end_date: End date in ISO format with timezone (e.g. "2025-01-31T23:59:59.999Z")
+            max_concurrency: Number of pages to fetch in parallel. 1 walks the pages one at a
+                time; higher values fetch pages speculatively ahead of the current one.
+                Defaults to TOAST_ORDERS_PAGE_CONCURRENCY from config (or 1).
+            projection: Keep only these fields of each order (see server/order_projection.py),
+                e.g. order_projection.TIPS. None returns full orders.
             
         Returns:
             Dict containing order data with structure:
@@ -305,7 +1064,97 @@ class ToastAPIClient:
                 'orders': [],
                 'totalCount': 0
             }
+            
+        Raises:
+            requests.exceptions.RequestException: If the orders cannot all be fetched, rather
+                than returning only some of them
+        """
+        all_orders = list(self.iter_orders(start_date, end_date, max_concurrency, projection))
+        
+        return {
+            'orders': all_orders,
+            'totalCount': len(all_orders)
+        }
+    
+    def iter_orders(self, start_date: str, end_date: str, max_concurrency: Optional[int] = None,
+                    projection: Optional[OrderProjection] = None) -> Iterator[Dict[str, Any]]:
         """
+        Yield orders from Toast API within a date range as their pages arrive.
+        
+        Only the pages currently being fetched are held in memory, so peak memory
+        depends on the page size and page concurrency rather than the date range.
+        
+        Args:
+            start_date: Start date in ISO format with timezone (e.g. "2025-01-01T05:00:00.000Z")
+            end_date: End date in ISO format with timezone (e.g. "2025-01-31T23:59:59.999Z")
+            max_concurrency: Number of pages to fetch in parallel (see get_orders)
+            projection: Keep only these fields of each order (see get_orders)
+            
+        Yields:
+            Order dicts in page order
+        """
+        for page_orders in self.iter_order_pages(start_date, end_date, max_concurrency, projection):
+            yield from page_orders
+    
+    def iter_orders_for_dates(self, dates: Iterable[str], projection: Optional[OrderProjection] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield orders for each business date in turn, fetching one day's pages at a time.
+        
+        Args:
+            dates: Dates in YYYY-MM-DD format
+            projection: Keep only these fields of each order (see get_orders)
+            
+        Yields:
+            Order dicts, day by day in the order the dates were given
+        """
+        date_list = list(dates)
+        fetch_started = time.perf_counter()
+        for date_str in date_list:
+            logger.info(f"Processing {date_str}...")
+            
+            day_started = time.perf_counter()
+            day_count = 0
+            for order in self.iter_orders(f"{date_str}T00:00:00.000Z", f"{date_str}T23:59:59.999Z", projection=projection):
+                day_count += 1
+                yield order
+            logger.info(f"Retrieved {day_count} orders for {date_str} in {time.perf_counter() - day_started:.2f}s")
+        
+        if date_list:
+            total_seconds = time.perf_counter() - fetch_started
+            logger.info(f"Fetched {len(date_list)} days in {total_seconds:.2f}s ({total_seconds / len(date_list):.2f}s per day)")
+    
+    def iter_order_pages(self, start_date: str, end_date: str, max_concurrency: Optional[int] = None,
+                         projection: Optional[OrderProjection] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield ordersBulk pages from Toast API within a date range.
+        
+        Single business days older than the settle window are read through the local
+        order store: the first request fetches and stores the complete day, and later
+        requests are served from disk without calling Toast. More recent single days
+        are synced incrementally: the first request fetches the complete day, and later
+        requests only fetch the orders modified since then and merge them in.
+        
+        With a projection, each page is decoded straight into projected orders when
+        nothing needs to be stored. Days that go to the order store or sync copy are
+        fetched in full, stored, and projected before they are yielded.
+        
+        Args:
+            start_date: Start date in ISO format with timezone (e.g. "2025-01-01T05:00:00.000Z")
+            end_date: End date in ISO format with timezone (e.g. "2025-01-31T23:59:59.999Z")
+            max_concurrency: Number of pages to fetch in parallel (see get_orders)
+            projection: Keep only these fields of each order (see get_orders)
+            
+        Yields:
+            List of orders for each page, in page order
+            
+        Raises:
+            requests.exceptions.RequestException: If a page fails after orders were yielded, or
+                the first page fails with both businessDate and date range parameters. Nothing
+                is stored for the day in that case.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.orders_page_concurrency
+        
         # Check if we're dealing with a single day or a date range
         start_date_only = start_date.split("T")[0]
         end_date_only = end_date.split("T")[0]
@@ -314,120 +1163,454 @@ class ToastAPIClient:
         # If it's a single day, use businessDate which is more efficient
         # Otherwise, use date range (startDate and endDate parameters)
         if is_single_day:
-            # Format businessDate in yyyymmdd format as required by API
-            date_obj = datetime.datetime.strptime(start_date_only, "%Y-%m-%d")
-            business_date = date_obj.strftime("%Y%m%d")
-            logger.info(f"Single day request - Using businessDate: {business_date}")
+            logger.info(f"Single day request - Using businessDate: {start_date_only.replace('-', '')}")
             param_type = "businessDate"
         else:
             logger.info(f"Date range request - Using startDate: {start_date} and endDate: {end_date}")
             param_type = "dateRange"
         
-        # Initialize variables for pagination
-        all_orders = []
-        page = 1
-        page_size = 100  # Maximum allowed by the API
-        more_records = True
-        
-        logger.info("Starting pagination to fetch all orders...")
-        
-        # Rate limiting parameters
-        requests_count = 0
-        rate_limit_threshold = 10  # Max requests per minute (adjust based on API limits)
-        rate_limit_window = 60     # Time window in seconds
-        start_time = time.time()
-        
-        while more_records:
-            # Check rate limiting
-            requests_count += 1
-            elapsed_time = time.time() - start_time
-            
-            if requests_count >= rate_limit_threshold and elapsed_time < rate_limit_window:
-                # We're approaching rate limit, need to sleep
-                sleep_time = rate_limit_window - elapsed_time + 1  # Add 1 second buffer
-                logger.info(f"Rate limit approached. Sleeping for {sleep_time:.2f} seconds...")
-                time.sleep(sleep_time)
-                # Reset counter
-                requests_count = 0
-                start_time = time.time()
-            
-            # Set parameters based on current pagination state and parameter type
-            if param_type == "businessDate":
-                date_obj = datetime.datetime.strptime(start_date_only, "%Y-%m-%d")
-                business_date = date_obj.strftime("%Y%m%d")
-                params = {
-                    "businessDate": business_date,
-                    "page": str(page),
-                    "pageSize": str(page_size)
-                }
+        page_size = self.page_sizes["/orders/v2/ordersBulk"]
+        started = time.perf_counter()
+        
+        # Closed business days are served from the local order store once they have been fetched
+        store = None
+        if is_single_day and self.order_store is not None and self.order_store.is_settled(start_date_only):
+            store = self.order_store
+            stored_orders = store.get(self.restaurant_guid, start_date_only)
+            if stored_orders is not None:
+                logger.info(f"Serving {len(stored_orders)} orders for settled business date {start_date_only} from the local order store")
+                for i in range(0, len(stored_orders), page_size):
+                    page_orders = stored_orders[i:i + page_size]
+                    yield projection.project_orders(page_orders) if projection is not None else page_orders
+                return
+        
+        # Open business days are synced incrementally once they have been fetched in full
+        sync = None
+        if is_single_day and store is None and self.order_sync is not None:
+            sync = self.order_sync
+            synced_orders = self._sync_order_changes(start_date_only, max_concurrency)
+            if synced_orders is not None:
+                for i in range(0, len(synced_orders), page_size):
+                    page_orders = synced_orders[i:i + page_size]
+                    yield projection.project_orders(page_orders) if projection is not None else page_orders
+                logger.info(f"Served {len(synced_orders)} orders for business date {start_date_only} from the synced copy "
+                            f"in {time.perf_counter() - started:.2f}s")
+                return
+        
+        logger.info(f"Starting pagination to fetch all orders (page concurrency: {max_concurrency})...")
+        
+        total_count = 0
+        pages = 0
+        complete = False  # True once a short page shows every order was fetched
+        day_orders = [] if store is not None or sync is not None else None
+        # Modifications after this point may be missing from the fetch, so the next sync starts here
+        sync_checkpoint = time.time()
+        
+        # If we're using businessDate and the first page fails, try with date range instead
+        param_types = [param_type, "dateRange"] if param_type == "businessDate" else [param_type]
+        for attempt_type in param_types:
+            if attempt_type != param_type:
+                logger.info("Switching to date range parameters instead of businessDate...")
+                # A date range is not the same set of orders as a business date, so don't store it
+                day_orders = None
+            # Full orders are needed to store the day; otherwise decode pages straight into the projection
+            page_projection = projection if day_orders is None else None
+            if attempt_type == "dateRange" and self.orders_window_concurrency > 1:
+                order_pages = self._iter_order_windows(start_date, end_date, page_size, self.orders_window_concurrency, page_projection)
             else:
-                params = {
-                    "startDate": start_date,
-                    "endDate": end_date,
-                    "page": str(page),
-                    "pageSize": str(page_size)
-                }
+                order_pages = self._iter_order_pages(attempt_type, start_date, end_date, max_concurrency, page_projection)
+            try:
+                for page_orders in order_pages:
+                    pages += 1
+                    total_count += len(page_orders)
+                    complete = len(page_orders) < page_size
+                    if day_orders is not None:
+                        day_orders.extend(page_orders)
+                        if projection is not None:
+                            page_orders = projection.project_orders(page_orders)
+                    yield page_orders
+                break
+            except requests.exceptions.RequestException as e:
+                if pages:
+                    # Orders were already yielded, so falling back would repeat them - and
+                    # stopping would pass off a partial range as complete
+                    logger.error(f"Fetching orders failed part way through, after {total_count} orders: {e}")
+                    raise
+                if attempt_type != param_type:
+                    logger.error(f"Date range fallback also failed: {e}")
+                    raise
+        
+        if day_orders is not None and complete:
+            if store is not None:
+                store.put(self.restaurant_guid, start_date_only, day_orders)
+                if self.order_sync is not None:
+                    self.order_sync.discard(self.restaurant_guid, start_date_only)
+            else:
+                sync.put(self.restaurant_guid, start_date_only, day_orders, sync_checkpoint)
+        
+        logger.info(f"Successfully fetched a total of {total_count} orders across {pages} pages "
+                    f"in {time.perf_counter() - started:.2f}s")
+        stats = self.connection_stats()
+        logger.info(f"Connection reuse: {stats['reused_connections']} of {stats['requests']} requests reused a pooled connection "
+                    f"({stats['new_connections']} new connections opened)")
+    
+    def _sync_order_changes(self, business_date: str, max_concurrency: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Bring the synced copy of a business date up to date with the orders modified since its checkpoint.
+        
+        ordersBulk with startDate/endDate returns the orders modified in that window, for
+        any business date. The window starts order_sync_overlap seconds before the
+        checkpoint to allow for clock skew, and orders for other business dates are ignored.
+        
+        Args:
+            business_date: Business date in YYYY-MM-DD format
+            max_concurrency: Number of pages to fetch in parallel
             
-            logger.info(f"Fetching page {page} with {page_size} items per page using {param_type} parameter...")
+        Returns:
+            Every order for the business date, or None if the date has not been synced yet
+            or the changes could not be fetched (fetch the whole day instead)
+        """
+        synced = self.order_sync.get(self.restaurant_guid, business_date)
+        if synced is None:
+            return None
+        checkpoint, _ = synced
+        if time.time() - checkpoint > self.ORDER_SYNC_MAX_AGE_SECONDS:
+            logger.info(f"Synced copy of business date {business_date} is more than a day old, fetching the whole day")
+            return None
+        
+        until = time.time()
+        since = self._toast_timestamp(checkpoint - self.order_sync_overlap)
+        logger.info(f"Syncing orders for business date {business_date} modified since {since}")
+        
+        changed_orders = []
+        try:
+            for page_orders in self._iter_order_pages("dateRange", since, self._toast_timestamp(until), max_concurrency):
+                changed_orders.extend(page_orders)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch order changes for business date {business_date}, fetching the whole day: {e}")
+            return None
+        
+        date_int = business_date.replace('-', '')
+        day_changes = [order for order in changed_orders if str(order.get("businessDate")) == date_int]
+        logger.info(f"{len(changed_orders)} orders modified since the last sync, {len(day_changes)} for business date {business_date}")
+        return self.order_sync.merge(self.restaurant_guid, business_date, day_changes, until)
+    
+    @staticmethod
+    def _toast_timestamp(timestamp: float) -> str:
+        """Format a Unix timestamp as an ISO date-time in UTC, as the Toast API expects."""
+        moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+    
+    def _orders_page_params(self, param_type: str, start_date: str, end_date: str, page: int, page_size: int) -> Dict[str, str]:
+        """Build the ordersBulk query parameters for one page."""
+        if param_type == "businessDate":
+            date_obj = datetime.datetime.strptime(start_date.split("T")[0], "%Y-%m-%d")
+            return {
+                "businessDate": date_obj.strftime("%Y%m%d"),
+                "page": str(page),
+                "pageSize": str(page_size)
+            }
+        return {
+            "startDate": start_date,
+            "endDate": end_date,
+            "page": str(page),
+            "pageSize": str(page_size)
+        }
+    
+    def _fetch_orders_page(self, param_type: str, start_date: str, end_date: str, page: int, page_size: int,
+                           projection: Optional[OrderProjection] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch a single ordersBulk page, keeping only the projected fields if a projection is given.
+        
+        Returns:
+            List of orders on the page
+            
+        Raises:
+            requests.exceptions.RequestException: If the page request fails after retries
+        """
+        params = self._orders_page_params(param_type, start_date, end_date, page, page_size)
+        logger.info(f"Fetching page {page} with {page_size} items per page using {param_type} parameter...")
+        if self.hedge_budget is not None:
+            result = self._hedged_request("/orders/v2/ordersBulk", params, projection)
+        else:
+            result = self._make_request("/orders/v2/ordersBulk", params=params, projection=projection)
+        
+        # Handle the result based on its type
+        if isinstance(result, list):
+            logger.info(f"Received list with {len(result)} orders for page {page}")
+            return result
+        if isinstance(result, dict) and 'orders' in result:
+            page_orders = result.get('orders', [])
+            logger.info(f"Received dictionary with {len(page_orders)} orders for page {page}")
+            return page_orders
+        logger.error(f"Unexpected response format for page {page}. Keys: {', '.join(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
+        return []
+    
+    def _hedged_request(self, endpoint: str, params: Optional[Dict] = None, projection: Optional[OrderProjection] = None) -> Any:
+        """
+        Make a GET request, sending a duplicate if it is slower than usual.
+        
+        Once the endpoint has enough latency history, a request that hasn't answered by
+        the configured percentile of its latency is sent again, provided the hedge budget
+        allows it and the rate limiter has a token available right now (a hedge never
+        waits for rate budget). The first response wins and the other one is discarded.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters for the request
+            projection: Order projection to decode the response with
             
+        Returns:
+            Decoded response of whichever request answered first
+            
+        Raises:
+            requests.exceptions.RequestException: If the request (and its hedge) fail after retries
+        """
+        if self.single_flight is not None:
+            # Coalesce around the hedged pair, not each request, so the hedge isn't joined to the original
+            key = SingleFlight.make_key(self.restaurant_guid, endpoint, params, projection.name if projection else None)
+            return self.single_flight.do(key, lambda: self._send_hedged(endpoint, params, projection))
+        return self._send_hedged(endpoint, params, projection)
+    
+    def _send_hedged(self, endpoint: str, params: Optional[Dict] = None, projection: Optional[OrderProjection] = None) -> Any:
+        """Send a request with a hedge if it runs late. See _hedged_request."""
+        self.hedge_budget.record_request()
+        percentile_ms = metrics.registry.latency_percentile(endpoint, self.restaurant_guid, self.hedge_percentile,
+                                                            min_samples=self.HEDGE_MIN_SAMPLES)
+        if percentile_ms is None:
+            # Not enough history yet to know what "slow" is
+            return self._decode_response(self._send_request(endpoint, params=params), projection)
+        
+        delay_seconds = max(self.HEDGE_MIN_DELAY_SECONDS, percentile_ms / 1000)
+        hedged = False
+        
+        # Take the original request's rate token here so the hedge delay is measured from
+        # when the request goes out, not from when it started waiting for the rate limiter
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(endpoint, self.restaurant_guid)
+            metrics.registry.record_rate_limit_wait(endpoint, self.restaurant_guid, waited)
+        
+        def may_hedge() -> bool:
+            nonlocal hedged
+            if not self.hedge_budget.try_spend():
+                logger.info(f"Request to {endpoint} is slower than {delay_seconds:.2f}s but the hedge budget is spent")
+                return False
+            if self.rate_limiter is not None and self.rate_limiter.try_acquire(endpoint, self.restaurant_guid) > 0:
+                self.hedge_budget.refund()
+                logger.info(f"Request to {endpoint} is slower than {delay_seconds:.2f}s but there is no rate budget to hedge it")
+                return False
+            logger.info(f"Request to {endpoint} has not answered within {delay_seconds:.2f}s "
+                        f"(p{self.hedge_percentile * 100:g}), sending a hedged request")
+            hedged = True
+            return True
+        
+        result, hedge_won = run_hedged(
+            self._hedge_pool,
+            lambda: self._decode_response(self._send_request(endpoint, params=params, prepaid=True), projection),
+            lambda: self._decode_response(self._send_request(endpoint, params=params, prepaid=True), projection),
+            delay_seconds,
+            may_hedge
+        )
+        if hedged:
+            metrics.registry.record_hedge(endpoint, self.restaurant_guid, hedge_won)
+            logger.info(f"{'Hedged' if hedge_won else 'Original'} request to {endpoint} answered first")
+        return result
+    
+    def _iter_order_pages(self, param_type: str, start_date: str, end_date: str, max_concurrency: int = 1,
+                          projection: Optional[OrderProjection] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Walk every ordersBulk page for one parameter type.
+        
+        Args:
+            param_type: "businessDate" or "dateRange"
+            start_date: Start date in ISO format with timezone
+            end_date: End date in ISO format with timezone
+            max_concurrency: Number of pages to keep in flight at once
+            projection: Order projection to decode the pages with, or None for full orders
+            
+        Yields:
+            List of orders for each page, in page order
+            
+        Raises:
+            requests.exceptions.RequestException: If any page fails. Pages yielded before the
+                failure are not the whole range, so callers must not treat them as complete.
+        """
+        page_size = self.page_sizes["/orders/v2/ordersBulk"]
+        
+        if max_concurrency <= 1:
+            return self._iter_order_pages_sequential(param_type, start_date, end_date, page_size, projection)
+        return self._iter_order_pages_concurrent(param_type, start_date, end_date, page_size, max_concurrency, projection)
+    
+    def _iter_order_pages_sequential(self, param_type: str, start_date: str, end_date: str, page_size: int,
+                                     projection: Optional[OrderProjection] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch ordersBulk pages one at a time. See _iter_order_pages."""
+        page = 1
+        
+        # No fixed delay between pages: the shared rate limiter in _send_request paces each
+        # request to the live rate budget, slowing down as 429s and rate limit headers appear
+        while True:
             try:
-                # Make the API request for this page
-                result = self._make_request("/orders/v2/ordersBulk", params=params)
+                page_orders = self._fetch_orders_page(param_type, start_date, end_date, page, page_size, projection)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error fetching page {page} with {param_type}: {e}")
+                # Stopping here would pass off the pages so far as the whole range
+                raise
+            
+            yield page_orders
+            
+            # Determine if there are more pages to fetch
+            if len(page_orders) < page_size:
+                # We received fewer items than the page size, so we've reached the end
+                logger.info(f"Reached end of data with {len(page_orders)} items on page {page}")
+                return
+            
+            # There might be more pages, increment page number
+            page += 1
+            logger.info(f"Moving to page {page}...")
+    
+    def _iter_order_pages_concurrent(self, param_type: str, start_date: str, end_date: str, page_size: int, max_concurrency: int,
+                                     projection: Optional[OrderProjection] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Fetch ordersBulk pages with up to max_concurrency requests in flight.
+        
+        Pages are requested speculatively ahead of the page being consumed and are
+        yielded strictly in page order. Once a short page is seen, no further pages
+        are requested and any pages fetched past it are dropped. See _iter_order_pages.
+        """
+        in_flight = {}  # page number -> Future
+        next_page = 1
+        page = 1
+        
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="toast-orders-page")
+        try:
+            while True:
+                # Keep the window of speculative page requests full, sized to the live rate estimate
+                while len(in_flight) < self.recommended_concurrency("/orders/v2/ordersBulk", max_concurrency):
+                    in_flight[next_page] = pool.submit(self._fetch_orders_page, param_type, start_date, end_date, next_page, page_size, projection)
+                    next_page += 1
                 
-                # Handle the result based on its type
-                if isinstance(result, list):
-                    page_orders = result
-                    logger.info(f"Received list with {len(page_orders)} orders for page {page}")
-                elif isinstance(result, dict) and 'orders' in result:
-                    page_orders = result.get('orders', [])
-                    logger.info(f"Received dictionary with {len(page_orders)} orders for page {page}")
-                else:
-                    logger.error(f"Unexpected response format for page {page}. Keys: {', '.join(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                    page_orders = []
+                future = in_flight.pop(page)
+                try:
+                    page_orders = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"Error fetching page {page} with {param_type}: {e}")
+                    # Stopping here would pass off the pages so far as the whole range
+                    raise
                 
-                # Add this page's orders to our accumulated list
-                all_orders.extend(page_orders)
+                yield page_orders
                 
-                # Determine if there are more pages to fetch
                 if len(page_orders) < page_size:
-                    # We received fewer items than the page size, so we've reached the end
-                    more_records = False
                     logger.info(f"Reached end of data with {len(page_orders)} items on page {page}")
-                else:
-                    # There might be more pages, increment page number
-                    page += 1
-                    logger.info(f"Moving to page {page}...")
-                    
-                    # Add a small delay between requests to be gentle on the API
-                    time.sleep(0.5)
+                    if in_flight:
+                        logger.info(f"Dropping {len(in_flight)} speculative page request(s) beyond page {page}")
+                    return
                 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching page {page} with {param_type}: {e}")
+                page += 1
+        finally:
+            # Over-fetched pages past the end (or past where the caller stopped
+            # reading) are discarded without waiting for them
+            for future in in_flight.values():
+                future.cancel()
+            pool.shutdown(wait=False)
+    
+    def _iter_order_windows(self, start_date: str, end_date: str, page_size: int, max_concurrency: int,
+                            projection: Optional[OrderProjection] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Fetch a date range as consecutive time windows, several at once.
+        
+        A WindowPlanner splits the range into windows sized from the order density seen
+        so far, up to max_concurrency windows are paged through in parallel (fewer when
+        the live rate estimate can't support that many), and every request still draws
+        from the shared rate limiter. Windows are yielded in time order as pages of up to
+        page_size orders, skipping orders already yielded for an earlier window.
+        
+        The planner only learns a window's order count once that window is consumed, in
+        time order, and max_concurrency windows are always planned ahead whatever the
+        rate estimate allows to run. The same range with the same orders is therefore
+        split into the same windows (and request URLs) on every run, however the
+        requests race, so recorded cassettes replay.
+        
+        Args:
+            start_date: Start date in ISO format with timezone
+            end_date: End date in ISO format with timezone
+            page_size: Orders per ordersBulk page
+            max_concurrency: Number of windows to fetch at once
+            projection: Order projection to decode the pages with, or None for full orders
+            
+        Yields:
+            Lists of orders, in window order
+            
+        Raises:
+            requests.exceptions.RequestException: If any window fails. Windows yielded before
+                the failure are not the whole range, so callers must not treat them as complete.
+        """
+        planner = WindowPlanner(parse_timestamp(start_date), parse_timestamp(end_date),
+                                self.ORDERS_WINDOW_TARGET_PAGES * page_size)
+        planned = collections.deque()  # [window, Future or None until submitted] in time order
+        seen_guids = set()
+        duplicates = 0
+        
+        def fetch_window(window):
+            window_orders = []
+            for page_orders in self._iter_order_pages_sequential("dateRange", self._toast_timestamp(window[0]),
+                                                                 self._toast_timestamp(window[1]), page_size, projection):
+                window_orders.extend(page_orders)
+            return window_orders
+        
+        logger.info(f"Splitting {start_date} - {end_date} into time windows (window concurrency: {max_concurrency})...")
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="toast-orders-window")
+        try:
+            while True:
+                while len(planned) < max_concurrency:
+                    window = planner.next_window()
+                    if window is None:
+                        break
+                    planned.append([window, None])
+                if not planned:
+                    break
                 
-                # If we're using businessDate and encounter an error, try with date range instead
-                if param_type == "businessDate" and page == 1:
-                    logger.info("Switching to date range parameters instead of businessDate...")
-                    param_type = "dateRange"
-                    # Reset page counter
-                    page = 1
-                    all_orders = []
-                    continue
+                # Run as many of the planned windows as the live rate estimate supports
+                running = self.recommended_concurrency("/orders/v2/ordersBulk", max_concurrency)
+                for i, item in enumerate(planned):
+                    if i >= running:
+                        break
+                    if item[1] is None:
+                        item[1] = pool.submit(fetch_window, item[0])
                 
-                # If we've already tried both parameter types or we're beyond page 1, just return what we have
-                break
-        
-        # Return all accumulated orders
-        total_count = len(all_orders)
-        logger.info(f"Successfully fetched a total of {total_count} orders across {page} pages")
+                window, future = planned.popleft()
+                try:
+                    window_orders = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"Error fetching orders for window {self._toast_timestamp(window[0])} - "
+                                 f"{self._toast_timestamp(window[1])}: {e}")
+                    # Stopping here would pass off the windows so far as the whole range
+                    raise
+                # Size the windows still to be planned, in time order on this thread
+                planner.record(window, len(window_orders))
+                
+                unique_orders = []
+                for order in window_orders:
+                    guid = order.get("guid")
+                    if guid is not None and guid in seen_guids:
+                        duplicates += 1
+                        continue
+                    seen_guids.add(guid)
+                    unique_orders.append(order)
+                for i in range(0, len(unique_orders), page_size):
+                    yield unique_orders[i:i + page_size]
+        finally:
+            for _, future in planned:
+                if future is not None:
+                    future.cancel()
+            pool.shutdown(wait=False)
         
-        return {
-            'orders': all_orders,
-            'totalCount': total_count
-        }
+        logger.info(f"Fetched {len(seen_guids)} orders in {planner.window_count} time windows "
+                    f"({duplicates} duplicates across window boundaries dropped)")
     
     def get_menus(self) -> Dict[str, Any]:
         """
         Fetch menu data from the Toast API.
+        Served from the on-disk response cache when a fresh copy is available.
         
         Returns:
             Dict containing menu data
@@ -436,11 +1619,12 @@ class ToastAPIClient:
             requests.exceptions.RequestException: If the API request fails
         """
         endpoint = "/menus/v2/menus"
-        return self._make_request(endpoint)
+        return self._cached_request(endpoint)
     
     def get_employee(self, employee_guid: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch employee information from the Toast API.
+        Served from the on-disk response cache when a fresh copy is available.
         
         Args:
             employee_guid: Optional GUID of the employee to retrieve. If None, fetches all employees.
@@ -455,13 +1639,102 @@ class ToastAPIClient:
         params = {}
         if employee_guid:
             params["employeeIds"] = employee_guid
-        return self._make_request(endpoint, params=params if params else None)
+        return self._cached_request(endpoint, params=params if params else None)
+    
+    def get_employees(self, employee_guids: Iterable[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch many employees by GUID in as few requests as possible.
+        
+        Employees with a fresh entry in the response cache (from an earlier lookup or
+        get_employee call) are not requested again. The rest are requested in
+        employeeIds batches sized to keep each URL under MAX_URL_LENGTH, several batches
+        at once, and every employee fetched is cached on its own so later lookups skip it.
+        
+        Args:
+            employee_guids: GUIDs of the employees to retrieve (duplicates are ignored)
+            max_concurrency: Number of batches to fetch in parallel. Defaults to
+                TOAST_EMPLOYEE_LOOKUP_CONCURRENCY from config (or 1).
+            
+        Returns:
+            Employees found, in the order their GUIDs were given; GUIDs the API doesn't
+            know are left out
+            
+        Raises:
+            requests.exceptions.RequestException: If a batch request fails
+        """
+        endpoint = "/labor/v1/employees"
+        if max_concurrency is None:
+            max_concurrency = self.employee_lookup_concurrency
+        guids = list(dict.fromkeys(guid for guid in employee_guids if guid))
+        
+        employees: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for guid in guids:
+            entry = self.response_cache.get(self.restaurant_guid, endpoint, {"employeeIds": guid}) if self.response_cache is not None else None
+            if entry is not None and self.response_cache.is_fresh(entry) and isinstance(entry["body"], list):
+                employees.update((employee["guid"], employee) for employee in entry["body"]
+                                 if isinstance(employee, dict) and employee.get("guid") == guid)
+            else:
+                missing.append(guid)
+        
+        # Batch in sorted order, so the same employees give the same request URLs whatever
+        # order (e.g. set iteration order) they were passed in - replayed cassettes rely on it
+        batches = self._employee_id_batches(endpoint, sorted(missing))
+        logger.info(f"Looking up {len(guids)} employees: {len(guids) - len(missing)} cached, "
+                    f"fetching {len(missing)} in {len(batches)} batches")
+        
+        def fetch_batch(batch: List[str]) -> List[Dict[str, Any]]:
+            result = self._make_request(endpoint, params={"employeeIds": ",".join(batch)})
+            if isinstance(result, dict):
+                result = result.get('employees', [])
+            if not isinstance(result, list):
+                logger.warning("Unexpected employee API response structure")
+                return []
+            return [employee for employee in result if isinstance(employee, dict) and 'guid' in employee]
+        
+        if batches:
+            workers = self.recommended_concurrency(endpoint, max_concurrency)
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches)), thread_name_prefix="toast-employees") as pool:
+                for fetched in pool.map(fetch_batch, batches):
+                    for employee in fetched:
+                        employees[employee["guid"]] = employee
+                        if self.response_cache is not None:
+                            # Cached as the answer to a single-employee lookup, so get_employee(guid) can use it too
+                            self.response_cache.put(self.restaurant_guid, endpoint, {"employeeIds": employee["guid"]}, [employee])
+        
+        return [employees[guid] for guid in guids if guid in employees]
+    
+    def _employee_id_batches(self, endpoint: str, guids: List[str]) -> List[List[str]]:
+        """Split GUIDs into employeeIds batches whose request URLs stay under MAX_URL_LENGTH."""
+        base_length = len(f"{self.base_url}{endpoint}?employeeIds=")
+        separator_length = len(urllib.parse.quote_plus(","))
+        batches = []
+        batch: List[str] = []
+        length = base_length
+        for guid in guids:
+            guid_length = len(urllib.parse.quote_plus(guid))
+            if batch and length + separator_length + guid_length > self.MAX_URL_LENGTH:
+                batches.append(batch)
+                batch = []
+                length = base_length
+            length += guid_length + (separator_length if batch else 0)
+            batch.append(guid)
+        if batch:
+            batches.append(batch)
+        return batches
     
     def get_time_entries(self, start_date: str, end_date: str, include_archived: bool = True, 
-                        include_missed_breaks: bool = True, time_entry_ids: Optional[str] = None) -> Dict[str, Any]:
+                        include_missed_breaks: bool = True, time_entry_ids: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Fetch time entries from the Toast API using date range format.
         
+        A range longer than TOAST_TIME_ENTRIES_WINDOW_DAYS (default 7) is split into
+        windows of that many days, which are fetched concurrently (up to
+        TOAST_TIME_ENTRIES_CONCURRENCY at once, fewer when the live rate estimate can't
+        support that many) and merged in time order, dropping time entries that appear
+        in two windows. A window that fails is requested again on its own while the
+        other windows carry on.
+        
         Args:
             start_date: Start date in ISO format (e.g. "2025-01-01T00:00:00.000Z")
             end_date: End date in ISO format (e.g. "2025-01-31T23:59:59.999Z")
@@ -470,10 +1743,13 @@ class ToastAPIClient:
             time_entry_ids: Comma-separated list of time entry IDs to filter
             
         Returns:
-            Dict containing time entries data
+            List of time entries, whether or not the range was fetched in windows. This used
+            to be the raw response body; callers that read 'timeEntries' from it get the
+            list directly now.
             
         Raises:
-            requests.exceptions.RequestException: If the API request fails
+            requests.exceptions.RequestException: If the API request (or one window, after
+                TIME_ENTRIES_WINDOW_ATTEMPTS attempts) fails
         """
         endpoint = "/labor/v1/timeEntries"
         params = {
@@ -487,12 +1763,118 @@ class ToastAPIClient:
             params["includeMissedBreaks"] = str(include_missed_breaks).lower()
         if time_entry_ids:
             params["timeEntryIds"] = time_entry_ids
+        
+        start = parse_timestamp(start_date)
+        end = parse_timestamp(end_date)
+        window_seconds = self.time_entries_window_days * 86400
+        if time_entry_ids or end - start < window_seconds:
+            return self._time_entries_from_response(self._make_request(endpoint, params=params), start_date)
+        
+        # Windows end one millisecond before the next one starts, since both ends of a range are inclusive
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(end, window_start + window_seconds - 0.001)
+            windows.append((window_start, window_end))
+            window_start = window_end + 0.001
+        
+        started = time.perf_counter()
+        logger.info(f"Splitting time entries for {start_date} - {end_date} into {len(windows)} windows of "
+                    f"{self.time_entries_window_days} days (window concurrency: {self.time_entries_concurrency})...")
+        window_entries = self._fetch_time_entry_windows(endpoint, params, windows)
+        
+        time_entries = []
+        seen_guids = set()
+        for entries in window_entries:
+            for entry in entries:
+                guid = entry.get("guid")
+                if guid is not None and guid in seen_guids:
+                    continue
+                seen_guids.add(guid)
+                time_entries.append(entry)
+        logger.info(f"Fetched {len(time_entries)} time entries in {len(windows)} windows "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return time_entries
+    
+    @staticmethod
+    def _time_entries_from_response(result: Any, start_date: str) -> List[Dict[str, Any]]:
+        """
+        Extract the list of time entries from a timeEntries response.
+        
+        Args:
+            result: Decoded response body
+            start_date: Start of the requested range, for the log message
+            
+        Returns:
+            List of time entries (empty if the response has an unexpected structure)
+        """
+        if isinstance(result, dict):
+            return result.get('timeEntries', result.get('data', []))
+        if isinstance(result, list):
+            return result
+        logger.warning(f"Unexpected time entries response structure for range starting {start_date}")
+        return []
+    
+    def _fetch_time_entry_windows(self, endpoint: str, params: Dict[str, str], windows: List[Tuple[float, float]]) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch the time entries of several windows concurrently, retrying failed windows on their own.
+        
+        Args:
+            endpoint: Time entries endpoint
+            params: Query parameters shared by every window (startDate/endDate are replaced)
+            windows: (start, end) Unix timestamps of each window
+            
+        Returns:
+            List of time entries for each window, in window order
             
-        return self._make_request(endpoint, params=params)
+        Raises:
+            requests.exceptions.RequestException: If a window still fails after
+                TIME_ENTRIES_WINDOW_ATTEMPTS attempts
+            RetryBudgetExhaustedError: If a window needs another attempt but the retry budget is spent
+        """
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        attempts = {i: 1 for i in range(len(windows))}
+        backoffs = {i: self.INITIAL_BACKOFF_SECONDS for i in range(len(windows))}
+        
+        def fetch_window(i: int, delay: float = 0.0) -> List[Dict[str, Any]]:
+            if delay:
+                time.sleep(delay)
+            window_params = dict(params, startDate=self._toast_timestamp(windows[i][0]),
+                                 endDate=self._toast_timestamp(windows[i][1]))
+            return self._time_entries_from_response(self._make_request(endpoint, params=window_params),
+                                                    window_params['startDate'])
+        
+        max_workers = self.recommended_concurrency(endpoint, self.time_entries_concurrency)
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="toast-time-entries")
+        pending = {pool.submit(fetch_window, i): i for i in range(len(windows))}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        results[i] = future.result()
+                    except requests.exceptions.RequestException as e:
+                        window = f"{self._toast_timestamp(windows[i][0])} - {self._toast_timestamp(windows[i][1])}"
+                        if attempts[i] >= self.TIME_ENTRIES_WINDOW_ATTEMPTS:
+                            logger.error(f"Time entries window {window} failed after {attempts[i]} attempts: {e}")
+                            raise
+                        delay = self._retry_delay(endpoint, backoffs[i])
+                        logger.warning(f"Time entries window {window} failed ({e}). Retrying the window...")
+                        attempts[i] += 1
+                        backoffs[i] = min(self.MAX_BACKOFF_SECONDS, backoffs[i] * 2)
+                        pending[pool.submit(fetch_window, i, delay)] = i
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+        
+        return [results[i] for i in range(len(windows))]
     
     def get_jobs(self, job_ids: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch jobs from the Toast API.
+        Served from the on-disk response cache when a fresh copy is available.
         
         Args:
             job_ids: Optional comma-separated list of job IDs to filter
@@ -507,4 +1889,4 @@ class ToastAPIClient:
         params = {}
         if job_ids:
             params["jobIds"] = job_ids
-        return self._make_request(endpoint, params=params if params else None)
\ No newline at end of file
+        return self._cached_request(endpoint, params=params if params else None)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Shared auth token cache for the Toast API client."""
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from server.file_lock import FileLock, atomic_write
+
+# Set up logging
+logger = logging.getLogger("toast-token-store")
+
+
+class TokenStore:
+    """
+    File-backed cache of Toast auth tokens keyed by client id.
+
+    The cache file is guarded by a FileLock so that every ToastAPIClient in every
+    thread and subprocess on the machine reuses the same token instead of logging
+    in separately. Callers that need to mint a token should hold lock() while they
+    check the cache and store the new token, so only one of them hits the auth endpoint.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the token store.
+
+        Args:
+            cache_dir: Directory that holds the token cache file
+        """
+        self.path = os.path.join(cache_dir, "auth_tokens.json")
+        self._lock = FileLock(f"{self.path}.lock")
+
+    @staticmethod
+    def _key(client_id: str) -> str:
+        """Hash the client id so it never appears in plain text on disk."""
+        return hashlib.sha256(client_id.encode("utf-8")).hexdigest()
+
+    def lock(self) -> FileLock:
+        """
+        Get the lock guarding the cache file.
+
+        Returns:
+            Re-entrant cross-process lock usable as a context manager
+        """
+        return self._lock
+
+    def _read_all(self) -> Dict[str, Any]:
+        """Read every cached entry, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return {}
+
+    def get(self, client_id: str) -> Optional[Tuple[str, float]]:
+        """
+        Look up the cached token for a client id.
+
+        Args:
+            client_id: Toast API client id
+
+        Returns:
+            Tuple of (token, expiry timestamp), or None if nothing usable is cached
+        """
+        with self._lock:
+            entry = self._read_all().get(self._key(client_id))
+        if not isinstance(entry, dict) or not entry.get("token") or not entry.get("expiry"):
+            return None
+        if entry["expiry"] <= time.time():
+            return None
+        return entry["token"], float(entry["expiry"])
+
+    def put(self, client_id: str, token: str, expiry: float):
+        """
+        Store a token for a client id, dropping any expired entries.
+
+        Args:
+            client_id: Toast API client id
+            token: Access token
+            expiry: Unix timestamp after which the token must not be used
+        """
+        with self._lock:
+            now = time.time()
+            entries = {
+                key: entry for key, entry in self._read_all().items()
+                if isinstance(entry, dict) and entry.get("expiry", 0) > now
+            }
+            entries[self._key(client_id)] = {"token": token, "expiry": expiry}
+            atomic_write(self.path, json.dumps(entries).encode("utf-8"))
+
+    def invalidate(self, client_id: str, token: Optional[str] = None):
+        """
+        Remove the cached token for a client id.
+
+        Args:
+            client_id: Toast API client id
+            token: If given, only remove the entry when it still holds this token
+        """
+        with self._lock:
+            entries = self._read_all()
+            key = self._key(client_id)
+            entry = entries.get(key)
+            if entry is None or (token is not None and entry.get("token") != token):
+                return
+            del entries[key]
+            atomic_write(self.path, json.dumps(entries).encode("utf-8"))
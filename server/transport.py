@@ -0,0 +1,252 @@
+"""Pluggable HTTP transports for ToastAPIClient: record to and replay from cassette files."""
+import os
+import gzip
+import time
+import json
+import base64
+import hashlib
+import datetime
+import threading
+import urllib.parse
+import logging
+from typing import Dict, Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from server.file_lock import FileLock
+from server import json_backend
+
+# Set up logging
+logger = logging.getLogger("toast-transport")
+
+# Transport modes accepted by build_transport (and TOAST_TRANSPORT_MODE)
+TRANSPORT_MODES = ("live", "record", "replay")
+
+# Response headers that describe the original encoding rather than the stored body
+_DROPPED_RESPONSE_HEADERS = ("content-encoding", "transfer-encoding", "set-cookie")
+
+# Access token stored in cassettes in place of real tokens, and served by replay
+CASSETTE_TOKEN = "cassette-token"
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """
+    Raised in replay mode for a request that is not in the cassette.
+
+    It is a requests ConnectionError, so a replayed job degrades the way a live job
+    does when Toast cannot be reached (e.g. falls back from businessDate to a date
+    range) instead of crashing.
+    """
+
+
+def _request_key(method: str, url: str, restaurant_guid: Optional[str], body: Optional[bytes]) -> str:
+    """
+    Identify a request by what determines its response.
+
+    The host is left out so a cassette replays against any base URL, query parameters
+    are sorted, and the body is hashed so credentials in it never reach the cassette.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha256(body).hexdigest() if body else None
+    return json.dumps([method.upper(), parts.path, query, restaurant_guid, body_hash])
+
+
+def _redact_token(content: bytes) -> bytes:
+    """Replace the access token in an authentication response body."""
+    try:
+        body = json_backend.loads(content)
+    except ValueError:
+        return content
+    if isinstance(body, dict) and isinstance(body.get("token"), dict) and "accessToken" in body["token"]:
+        body["token"]["accessToken"] = CASSETTE_TOKEN
+        return json_backend.dumps(body).encode("utf-8")
+    return content
+
+
+class RecordingTransport(HTTPAdapter):
+    """
+    Transport adapter that sends requests normally and appends every request/response
+    pair to a gzip-compressed JSON Lines cassette.
+
+    Each interaction is written as its own gzip member as soon as it completes, so a
+    cassette from a job that crashed half way is still readable, and several threads
+    or processes can record into the same cassette. Authorization headers are never
+    written, request bodies are stored only as a hash, and access tokens in
+    authentication responses are replaced with a placeholder.
+    """
+
+    def __init__(self, cassette_path: str, **kwargs: Any):
+        """
+        Initialize the recording transport.
+
+        Args:
+            cassette_path: Cassette file to append to (created if missing)
+            **kwargs: Connection pool arguments passed on to HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.cassette_path = cassette_path
+        self._lock = FileLock(f"{cassette_path}.lock")
+        directory = os.path.dirname(os.path.abspath(cassette_path))
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # Time to the response headers, like response.elapsed (which requests only sets
+        # after the adapter returns)
+        elapsed = time.perf_counter() - started
+        # Reading the body here caches it on the response for the caller
+        content = response.content or b""
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_RESPONSE_HEADERS}
+        if request.method == "POST":
+            content = _redact_token(content)
+        try:
+            body, body_encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, body_encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+        interaction = {
+            "key": _request_key(request.method, request.url, request.headers.get("Toast-Restaurant-External-ID"), request.body),
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "body": body,
+            "body_encoding": body_encoding,
+            "elapsed": elapsed,
+            "recorded_at": time.time()
+        }
+        line = json_backend.dumps(interaction) + "\n"
+        with self._lock:
+            with gzip.open(self.cassette_path, "at", encoding="utf-8") as f:
+                f.write(line)
+        return response
+
+
+class ReplayTransport(HTTPAdapter):
+    """
+    Transport adapter that answers requests from a cassette without any network access.
+
+    Requests are matched on method, path, query parameters, restaurant GUID and body.
+    Identical requests get the recorded responses in the order they were recorded
+    (so a 429 followed by a success replays the same way), and the last one repeats
+    once they run out. Authentication requests missing from the cassette (the
+    recording run reused a cached token) get a placeholder token.
+    """
+
+    def __init__(self, cassette_path: str, latency_factor: float = 0.0, auth_url: Optional[str] = None, **kwargs: Any):
+        """
+        Initialize the replay transport.
+
+        Args:
+            cassette_path: Cassette file written by RecordingTransport
+            latency_factor: Sleep this multiple of each recorded response time before
+                answering (1.0 replays the original latencies, 0 answers immediately)
+            auth_url: Authentication endpoint URL, answered with a placeholder token if
+                the cassette has no authentication response
+            **kwargs: Arguments passed on to HTTPAdapter
+
+        Raises:
+            FileNotFoundError: If the cassette does not exist
+        """
+        super().__init__(**kwargs)
+        self.cassette_path = cassette_path
+        self.latency_factor = latency_factor
+        self.auth_path = urllib.parse.urlsplit(auth_url).path if auth_url else None
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        count = 0
+        with gzip.open(cassette_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                interaction = json_backend.loads(line)
+                self._interactions.setdefault(interaction["key"], []).append(interaction)
+                count += 1
+        logger.info(f"Loaded {count} recorded interactions ({len(self._interactions)} distinct requests) from {cassette_path}")
+
+    def _next_interaction(self, key: str) -> Optional[Dict[str, Any]]:
+        """Take the next recorded interaction for a request, repeating the last one."""
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                return None
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            return interactions[min(index, len(interactions) - 1)]
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        key = _request_key(request.method, request.url, request.headers.get("Toast-Restaurant-External-ID"), request.body)
+        interaction = self._next_interaction(key)
+
+        if interaction is None:
+            if request.method == "POST" and self.auth_path and urllib.parse.urlsplit(request.url).path == self.auth_path:
+                body = json_backend.dumps({"token": {"accessToken": CASSETTE_TOKEN, "expiresIn": 86400, "tokenType": "Bearer"}})
+                interaction = {"status": 200, "reason": "OK", "headers": {"Content-Type": "application/json"},
+                               "body": body, "body_encoding": "utf-8", "elapsed": 0.0}
+            else:
+                raise CassetteMissError(f"No recorded response for {request.method} {request.url} in {self.cassette_path}")
+
+        if self.latency_factor > 0 and interaction["elapsed"] > 0:
+            time.sleep(interaction["elapsed"] * self.latency_factor)
+        return self._build_response(request, interaction)
+
+    def _build_response(self, request: requests.PreparedRequest, interaction: Dict[str, Any]) -> requests.Response:
+        """Turn a recorded interaction into a requests.Response for request."""
+        if interaction.get("body_encoding") == "base64":
+            content = base64.b64decode(interaction["body"])
+        else:
+            content = interaction["body"].encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction.get("headers") or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = datetime.timedelta(seconds=interaction.get("elapsed", 0.0))
+        return response
+
+
+def build_transport(mode: Optional[str], cassette_path: Optional[str], latency_factor: float = 0.0,
+                    auth_url: Optional[str] = None, **adapter_kwargs: Any) -> Optional[HTTPAdapter]:
+    """
+    Create the transport adapter for a transport mode.
+
+    Args:
+        mode: "live" (or empty), "record" or "replay"
+        cassette_path: Cassette file for record and replay modes
+        latency_factor: Replay latency multiple (see ReplayTransport)
+        auth_url: Authentication endpoint URL (see ReplayTransport)
+        **adapter_kwargs: Connection pool arguments passed on to HTTPAdapter
+
+    Returns:
+        Transport adapter, or None for live mode (use the default adapter)
+
+    Raises:
+        ValueError: If the mode is unknown or a cassette is needed but not given
+    """
+    mode = (mode or "live").lower()
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"Unknown transport mode '{mode}'. Expected one of: {', '.join(TRANSPORT_MODES)}")
+    if mode == "live":
+        return None
+    if not cassette_path:
+        raise ValueError(f"Transport mode '{mode}' needs a cassette file (TOAST_CASSETTE)")
+    if mode == "record":
+        logger.info(f"Recording Toast API requests to cassette {cassette_path}")
+        return RecordingTransport(cassette_path, **adapter_kwargs)
+    logger.info(f"Replaying Toast API requests from cassette {cassette_path} (latency factor {latency_factor})")
+    return ReplayTransport(cassette_path, latency_factor=latency_factor, auth_url=auth_url, **adapter_kwargs)
@@ -0,0 +1,112 @@
+"""Adaptive splitting of wide ordersBulk date ranges into windows that can be fetched concurrently."""
+import datetime
+import threading
+import logging
+from typing import Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger("toast-window-planner")
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parse an ISO date-time as used by the Toast API into a Unix timestamp.
+
+    Accepts "Z", "+0000" and "+00:00" style offsets; a value without an offset is
+    taken to be UTC.
+
+    Args:
+        value: Date-time string, e.g. "2025-01-01T05:00:00.000Z" or "2025-01-01T05:00:00.000+0000"
+
+    Returns:
+        Unix timestamp
+
+    Raises:
+        ValueError: If the value is not an ISO date-time
+    """
+    value = value.strip().replace("Z", "+00:00")
+    if len(value) > 5 and value[-5] in "+-" and value[-3] != ":":
+        value = f"{value[:-2]}:{value[-2:]}"
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+class WindowPlanner:
+    """
+    Hands out consecutive, non-overlapping sub-windows of a date range.
+
+    Windows are sized so each holds about target_orders orders, judged from the order
+    density (orders per second) of the windows fetched so far: busy stretches get
+    windows of an hour or two, quiet ones up to a day. Until the first window has
+    been counted, windows are initial_seconds long. Safe to use from several threads.
+    """
+
+    MIN_WINDOW_SECONDS = 3600.0
+    MAX_WINDOW_SECONDS = 86400.0
+    INITIAL_WINDOW_SECONDS = 6 * 3600.0
+
+    def __init__(self, start: float, end: float, target_orders: int, initial_seconds: Optional[float] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            start: Start of the range (Unix timestamp, inclusive)
+            end: End of the range (Unix timestamp, inclusive)
+            target_orders: Orders each window should hold
+            initial_seconds: Length of the windows handed out before any were counted
+        """
+        self.start = start
+        self.end = end
+        self.target_orders = max(1, target_orders)
+        self.window_seconds = initial_seconds or self.INITIAL_WINDOW_SECONDS
+        self._next_start = start
+        self._counted_seconds = 0.0
+        self._counted_orders = 0
+        self._windows = 0
+        self._lock = threading.Lock()
+
+    def next_window(self) -> Optional[Tuple[float, float]]:
+        """
+        Take the next window of the range.
+
+        Windows end one millisecond before the next one starts, since the API treats
+        both ends of a range as inclusive.
+
+        Returns:
+            Tuple of (start, end) Unix timestamps, or None once the range is covered
+        """
+        with self._lock:
+            if self._next_start > self.end:
+                return None
+            window_start = self._next_start
+            window_end = min(self.end, window_start + self.window_seconds - 0.001)
+            self._next_start = window_end + 0.001
+            self._windows += 1
+            return window_start, window_end
+
+    def record(self, window: Tuple[float, float], order_count: int):
+        """
+        Count the orders a window held and resize the windows still to be handed out.
+
+        Args:
+            window: Window as returned by next_window
+            order_count: Number of orders fetched for it
+        """
+        with self._lock:
+            self._counted_seconds += max(0.001, window[1] - window[0])
+            self._counted_orders += order_count
+            if self._counted_orders:
+                density = self._counted_orders / self._counted_seconds
+                seconds = self.target_orders / density
+            else:
+                seconds = self.MAX_WINDOW_SECONDS
+            # Whole minutes keep the window boundaries readable in the logs
+            seconds = max(self.MIN_WINDOW_SECONDS, min(self.MAX_WINDOW_SECONDS, seconds))
+            self.window_seconds = seconds - seconds % 60
+
+    @property
+    def window_count(self) -> int:
+        """Number of windows handed out so far."""
+        return self._windows
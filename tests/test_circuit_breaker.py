@@ -0,0 +1,92 @@
+"""Tests for the shared circuit breaker (server/circuit_breaker.py)."""
+import pytest
+
+from server.circuit_breaker import CircuitBreaker, UpstreamUnavailableError
+
+ORDERS = "/orders/v2/ordersBulk"
+JOBS = "/labor/v1/jobs"
+RESTAURANT = "2437b9ff-00d5-4cec-b629-704f72e5f5ae"
+OTHER_RESTAURANT = "b6f3c0e1-0000-4000-8000-000000000000"
+
+
+@pytest.fixture
+def breaker(tmp_path, clock):
+    return CircuitBreaker(str(tmp_path), failure_threshold=3, cooldown_seconds=30)
+
+
+def fail(breaker, times, endpoint=ORDERS, restaurant_guid=RESTAURANT):
+    return [breaker.record_failure(endpoint, restaurant_guid) for _ in range(times)]
+
+
+def test_opens_after_consecutive_failures(breaker):
+    assert fail(breaker, 3) == [False, False, True]
+
+    with pytest.raises(UpstreamUnavailableError) as excinfo:
+        breaker.before_request(ORDERS, RESTAURANT)
+    assert excinfo.value.retry_in_seconds == pytest.approx(30)
+
+
+def test_success_resets_the_failure_count(breaker):
+    fail(breaker, 2)
+    breaker.record_success(ORDERS, RESTAURANT)
+
+    assert fail(breaker, 2) == [False, False]
+    breaker.before_request(ORDERS, RESTAURANT)
+
+
+def test_circuits_are_per_endpoint_and_restaurant(breaker):
+    fail(breaker, 3)
+
+    breaker.before_request(JOBS, RESTAURANT)
+    breaker.before_request(ORDERS, OTHER_RESTAURANT)
+
+
+def test_one_probe_after_the_cooldown(breaker, clock):
+    fail(breaker, 3)
+    clock.advance(31)
+
+    # The first request is the probe; the rest keep failing fast while it is out
+    breaker.before_request(ORDERS, RESTAURANT)
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_request(ORDERS, RESTAURANT)
+
+
+def test_successful_probe_closes_the_circuit(breaker, clock):
+    fail(breaker, 3)
+    clock.advance(31)
+    breaker.before_request(ORDERS, RESTAURANT)
+
+    breaker.record_success(ORDERS, RESTAURANT)
+
+    breaker.before_request(ORDERS, RESTAURANT)
+    breaker.before_request(ORDERS, RESTAURANT)
+
+
+def test_failed_probe_reopens_the_circuit(breaker, clock):
+    fail(breaker, 3)
+    clock.advance(31)
+    breaker.before_request(ORDERS, RESTAURANT)
+
+    assert fail(breaker, 1) == [True]
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_request(ORDERS, RESTAURANT)
+
+
+def test_lost_probe_lets_another_through(breaker, clock):
+    fail(breaker, 3)
+    clock.advance(31)
+    breaker.before_request(ORDERS, RESTAURANT)
+
+    clock.advance(CircuitBreaker.PROBE_TIMEOUT_SECONDS + 1)
+
+    breaker.before_request(ORDERS, RESTAURANT)
+
+
+def test_breakers_share_circuits_through_the_state_file(tmp_path, clock):
+    first = CircuitBreaker(str(tmp_path), failure_threshold=2)
+    second = CircuitBreaker(str(tmp_path), failure_threshold=2)
+
+    first.record_failure(ORDERS, RESTAURANT)
+    assert second.record_failure(ORDERS, RESTAURANT)
+    with pytest.raises(UpstreamUnavailableError):
+        first.before_request(ORDERS, RESTAURANT)
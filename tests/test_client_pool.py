@@ -0,0 +1,68 @@
+"""Tests for the per-restaurant client pool (server/client_pool.py)."""
+import pytest
+
+from server.client_pool import ToastClientPool
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+
+
+@pytest.fixture
+def pool(toast_config, write_cassette):
+    transport = ReplayTransport(write_cassette([]), auth_url=toast_config.TOAST_AUTH_URL)
+    with ToastClientPool(transport=transport) as pool:
+        yield pool
+
+
+def count_closes(session, monkeypatch):
+    closes = []
+    close = session.close
+    monkeypatch.setattr(session, "close", lambda: (closes.append(1), close()))
+    return closes
+
+
+def test_one_client_per_restaurant(pool, toast_config):
+    first = pool.get(location_index=1)
+    second = pool.get(location_index=2)
+
+    assert pool.get(restaurant_guid=toast_config.LOCATION_GUID_MAP[1]) is first
+    assert first.restaurant_guid == toast_config.LOCATION_GUID_MAP[1]
+    assert second.restaurant_guid == toast_config.LOCATION_GUID_MAP[2]
+    assert first.session is second.session
+    assert first._token_state is second._token_state
+
+
+def test_closing_a_pooled_client_keeps_the_session_open(pool, monkeypatch):
+    first = pool.get(location_index=1)
+    second = pool.get(location_index=2)
+    closes = count_closes(first.session, monkeypatch)
+
+    first.close()
+    with first:
+        pass
+
+    assert closes == []
+    assert pool.get(location_index=2) is second
+
+
+def test_closing_the_pool_closes_the_session_once(pool, monkeypatch):
+    pool.get(location_index=1)
+    client = pool.get(location_index=2)
+    closes = count_closes(client.session, monkeypatch)
+
+    pool.close()
+
+    assert closes == [1]
+    assert pool.get(location_index=1) is not client
+
+
+def test_derived_client_does_not_close_the_original(toast_config, write_cassette, monkeypatch):
+    transport = ReplayTransport(write_cassette([]), auth_url=toast_config.TOAST_AUTH_URL)
+    original = ToastAPIClient(location_index=1, transport=transport)
+    derived = original.for_restaurant(toast_config.LOCATION_GUID_MAP[2])
+    closes = count_closes(original.session, monkeypatch)
+
+    derived.close()
+    assert closes == []
+
+    original.close()
+    assert closes == [1]
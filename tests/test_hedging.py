@@ -0,0 +1,121 @@
+"""Tests for hedged requests (server/hedging.py)."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from server.hedging import HedgeBudget, run_hedged
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def answer(value, after=None):
+    """A call that returns value, once the event `after` is set if one is given."""
+    def fn():
+        if after is not None:
+            after.wait(5)
+        return value
+    return fn
+
+
+def failure(message, after=None):
+    def fn():
+        if after is not None:
+            after.wait(5)
+        raise ValueError(message)
+    return fn
+
+
+def test_budget_allows_one_hedge_per_ratio_of_requests():
+    budget = HedgeBudget(max_ratio=0.25)
+
+    allowed = []
+    for _ in range(8):
+        budget.record_request()
+        allowed.append(budget.try_spend())
+
+    assert allowed.count(True) == 2
+
+
+def test_budget_caps_saved_up_hedges():
+    budget = HedgeBudget(max_ratio=0.5, max_credits=2)
+    for _ in range(100):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    budget.refund()
+    assert budget.try_spend()
+
+
+def test_fast_primary_is_not_hedged(executor):
+    asked = []
+
+    result = run_hedged(executor, answer("primary"), answer("hedge"), 1.0, lambda: asked.append(1) or True)
+
+    assert result == ("primary", False)
+    assert asked == []
+
+
+def test_slow_primary_loses_to_the_hedge(executor):
+    release_primary = threading.Event()
+
+    result = run_hedged(executor, answer("primary", after=release_primary), answer("hedge"), 0.05, lambda: True)
+    release_primary.set()
+
+    assert result == ("hedge", True)
+
+
+def test_no_hedge_without_budget(executor):
+    release_primary = threading.Event()
+    hedges = []
+
+    def may_hedge():
+        release_primary.set()
+        return False
+
+    result = run_hedged(executor, answer("primary", after=release_primary), lambda: hedges.append(1), 0.05, may_hedge)
+
+    assert result == ("primary", False)
+    assert hedges == []
+
+
+def test_hedge_covers_a_failed_primary(executor):
+    release_primary = threading.Event()
+
+    def may_hedge():
+        release_primary.set()
+        return True
+
+    def hedge():
+        # Answer only once the primary has had time to fail
+        time.sleep(0.2)
+        return "hedge"
+
+    result = run_hedged(executor, failure("primary down", after=release_primary), hedge, 0.05, may_hedge)
+
+    assert result == ("hedge", True)
+
+
+def test_first_error_is_raised_when_both_fail(executor):
+    release_primary = threading.Event()
+
+    def may_hedge():
+        release_primary.set()
+        return True
+
+    def hedge():
+        time.sleep(0.2)
+        raise ValueError("hedge down")
+
+    with pytest.raises(ValueError, match="primary down"):
+        run_hedged(executor, failure("primary down", after=release_primary), hedge, 0.05, may_hedge)
+
+
+def test_primary_failing_early_is_not_hedged(executor):
+    with pytest.raises(ValueError, match="primary down"):
+        run_hedged(executor, failure("primary down"), answer("hedge"), 1.0, lambda: True)
@@ -0,0 +1,53 @@
+"""Tests for the JSON backend (server/json_backend.py), with and without orjson."""
+import io
+import json
+
+import pytest
+
+from server import json_backend
+
+DOCUMENT = {"orders": [{"guid": "a", "amount": 12.5, "voided": False, "server": None}], "totalCount": 1}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson" and json_backend.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "json":
+        monkeypatch.setattr(json_backend, "orjson", None)
+    return json_backend
+
+
+def test_loads_bytes_and_str(backend):
+    text = json.dumps(DOCUMENT)
+
+    assert backend.loads(text) == DOCUMENT
+    assert backend.loads(text.encode("utf-8")) == DOCUMENT
+
+
+def test_loads_rejects_invalid_json(backend):
+    with pytest.raises(ValueError):
+        backend.loads(b'{"orders": [')
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_dumps_round_trips(backend, indent):
+    text = backend.dumps(DOCUMENT, indent=indent)
+
+    assert json.loads(text) == DOCUMENT
+    if indent:
+        assert text.splitlines()[1].startswith(" " * indent + '"')
+
+
+def test_dumps_handles_what_only_json_encodes(backend):
+    document = {1: "non-string key", "big": 2 ** 70}
+
+    assert json.loads(backend.dumps(document)) == {"1": "non-string key", "big": 2 ** 70}
+
+
+def test_dump_writes_to_a_text_file(backend):
+    f = io.StringIO()
+
+    backend.dump(DOCUMENT, f, indent=2)
+
+    assert json.loads(f.getvalue()) == DOCUMENT
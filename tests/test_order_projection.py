@@ -0,0 +1,121 @@
+"""Tests for order field projections (server/order_projection.py)."""
+import json
+
+import pytest
+
+from server import order_projection
+from server.order_projection import OrderProjection, compile_fields
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from tests.conftest import recorded
+
+ORDER = {
+    "guid": "order-1",
+    "voided": False,
+    "source": "In Store",
+    "server": {"guid": "emp-1", "entityType": "RestaurantUser"},
+    "checks": [
+        {
+            "guid": "check-1",
+            "amount": 10.0,
+            "selections": [
+                {"displayName": "Pasta", "price": 10.0, "modifiers": [{"displayName": "Extra cheese"}],
+                 "salesCategory": {"guid": "cat-1", "entityType": "SalesCategory"}},
+                {"displayName": "Water", "price": 0.0, "salesCategory": None}
+            ],
+            "payments": []
+        }
+    ]
+}
+
+SPEC = {
+    "voided": True,
+    "checks": {
+        "amount": True,
+        "selections": {"displayName": True, "salesCategory": {"guid": True}}
+    }
+}
+
+PROJECTED = {
+    "guid": "order-1",
+    "voided": False,
+    "checks": [
+        {
+            "amount": 10.0,
+            "selections": [
+                {"displayName": "Pasta", "salesCategory": {"guid": "cat-1"}},
+                {"displayName": "Water", "salesCategory": None}
+            ]
+        }
+    ]
+}
+
+
+def test_compile_fields_keeps_only_the_spec():
+    project = compile_fields(SPEC)
+
+    assert project(ORDER) == {key: value for key, value in PROJECTED.items() if key != "guid"}
+    assert project([ORDER, ORDER]) == [project(ORDER)] * 2
+    assert project(None) is None
+    assert project({"checks": None}) == {"checks": None}
+    assert project({}) == {}
+
+
+def test_projection_always_keeps_the_guid():
+    projection = OrderProjection("test", SPEC)
+
+    assert projection.project_orders([ORDER]) == [PROJECTED]
+    # The full order is left alone
+    assert ORDER["checks"][0]["selections"][0]["modifiers"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("body", [[ORDER, ORDER], {"orders": [ORDER]}])
+def test_parse_matches_projecting_the_decoded_body(body, streaming):
+    if streaming and order_projection.ijson is None:
+        pytest.skip("ijson is not installed")
+    projection = OrderProjection("test", SPEC)
+
+    parsed = projection.parse(json.dumps(body).encode("utf-8"), streaming=streaming)
+
+    if isinstance(body, list):
+        assert parsed == projection.project_orders(body)
+    else:
+        assert parsed == {"orders": projection.project_orders(body["orders"])}
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_rejects_invalid_json(streaming):
+    if streaming and order_projection.ijson is None:
+        pytest.skip("ijson is not installed")
+
+    with pytest.raises(ValueError):
+        order_projection.TIPS.parse(b'[{"guid": ', streaming=streaming)
+
+
+def test_parse_without_ijson_decodes_whole(monkeypatch):
+    monkeypatch.setattr(order_projection, "ijson", None)
+    projection = OrderProjection("test", SPEC)
+
+    assert projection.parse(json.dumps([ORDER]).encode("utf-8"), streaming=True) == [PROJECTED]
+
+
+def test_named_projections():
+    assert order_projection.PROJECTIONS == {"tips": order_projection.TIPS, "item_sales": order_projection.ITEM_SALES}
+    tips = order_projection.TIPS.project_orders([ORDER])[0]
+    assert set(tips) == {"guid", "checks"}
+    assert set(tips["checks"][0]) == {"amount", "payments"}
+
+
+@pytest.mark.parametrize("stream_orders", [False, True])
+def test_client_returns_projected_orders(toast_config, write_cassette, monkeypatch, stream_orders):
+    monkeypatch.setattr(toast_config, 'TOAST_STREAM_ORDERS', stream_orders, raising=False)
+    path = write_cassette([
+        recorded("GET", "/orders/v2/ordersBulk", {"businessDate": "20250102", "page": "1", "pageSize": "100"}, [ORDER]),
+    ])
+    client = ToastAPIClient(location_index=1, transport=ReplayTransport(path, auth_url=toast_config.TOAST_AUTH_URL))
+
+    result = client.get_orders("2025-01-02T00:00:00.000Z", "2025-01-02T23:59:59.999Z",
+                               projection=order_projection.ITEM_SALES)
+
+    assert result == {"orders": order_projection.ITEM_SALES.project_orders([ORDER]), "totalCount": 1}
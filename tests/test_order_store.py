@@ -0,0 +1,87 @@
+"""Tests for the settled business day order store (server/order_store.py)."""
+import datetime
+import gzip
+
+import pytest
+import requests
+
+from server.order_store import OrderStore
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from tests.conftest import recorded
+
+RESTAURANT = "2437b9ff-00d5-4cec-b629-704f72e5f5ae"
+ORDERS = "/orders/v2/ordersBulk"
+DAY_START = "2025-01-02T00:00:00.000Z"
+DAY_END = "2025-01-02T23:59:59.999Z"
+
+
+def days_ago(days):
+    return (datetime.date.today() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def test_put_and_get(tmp_path):
+    store = OrderStore(str(tmp_path), settle_days=3)
+    orders = [{"guid": "a", "checks": []}, {"guid": "b", "checks": []}]
+
+    assert store.get(RESTAURANT, "2025-01-02") is None
+    store.put(RESTAURANT, "2025-01-02", orders)
+
+    assert store.get(RESTAURANT, "2025-01-02") == orders
+    assert store.get("other-restaurant", "2025-01-02") is None
+    assert store.get(RESTAURANT, "2025-01-03") is None
+
+
+def test_unreadable_file_is_a_miss(tmp_path):
+    store = OrderStore(str(tmp_path), settle_days=3)
+    store.put(RESTAURANT, "2025-01-02", [{"guid": "a"}])
+    with open(store._path(RESTAURANT, "2025-01-02"), "wb") as f:
+        f.write(gzip.compress(b"{not json")[:10])
+
+    assert store.get(RESTAURANT, "2025-01-02") is None
+
+
+def test_is_settled(tmp_path):
+    store = OrderStore(str(tmp_path), settle_days=3)
+
+    assert store.is_settled(days_ago(3))
+    assert store.is_settled(days_ago(30))
+    assert not store.is_settled(days_ago(2))
+    assert not store.is_settled(days_ago(0))
+    assert not store.is_settled("yesterday")
+
+
+@pytest.fixture
+def store_config(toast_config, monkeypatch):
+    monkeypatch.setattr(toast_config, 'TOAST_ORDER_STORE', True)
+    return toast_config
+
+
+def replay_client(config, path):
+    return ToastAPIClient(location_index=1, transport=ReplayTransport(path, auth_url=config.TOAST_AUTH_URL))
+
+
+def test_settled_day_is_fetched_once(store_config, write_cassette):
+    orders = [{"guid": "a", "businessDate": 20250102}]
+    path = write_cassette([
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "1", "pageSize": "100"}, orders),
+    ])
+    first = replay_client(store_config, path).get_orders(DAY_START, DAY_END)
+
+    # Nothing is recorded this time, so the orders can only come from the store
+    second = replay_client(store_config, write_cassette([], "empty.jsonl.gz")).get_orders(DAY_START, DAY_END)
+
+    assert first == second == {"orders": orders, "totalCount": 1}
+
+
+def test_incomplete_day_is_not_stored(store_config, write_cassette):
+    full_page = [{"guid": f"a-{i}", "businessDate": 20250102} for i in range(100)]
+    path = write_cassette([
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "1", "pageSize": "100"}, full_page),
+    ])
+    client = replay_client(store_config, path)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_orders(DAY_START, DAY_END)
+
+    assert client.order_store.get(client.restaurant_guid, "2025-01-02") is None
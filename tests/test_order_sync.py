@@ -0,0 +1,112 @@
+"""Tests for incrementally synced open business days (server/order_sync.py)."""
+import datetime
+
+import pytest
+
+from server.order_sync import OrderSyncStore
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+
+RESTAURANT = "2437b9ff-00d5-4cec-b629-704f72e5f5ae"
+DATE = "2025-01-02"
+
+
+@pytest.fixture
+def sync(tmp_path):
+    return OrderSyncStore(str(tmp_path))
+
+
+def order(guid, modified="2025-01-02T12:00:00.000+0000", **fields):
+    return {"guid": guid, "modifiedDate": modified, **fields}
+
+
+def test_put_and_get(sync):
+    assert sync.get(RESTAURANT, DATE) is None
+
+    sync.put(RESTAURANT, DATE, [order("a")], checkpoint=100.0)
+
+    assert sync.get(RESTAURANT, DATE) == (100.0, [order("a")])
+    assert sync.get("other-restaurant", DATE) is None
+
+
+def test_merge_adds_and_replaces_orders(sync):
+    sync.put(RESTAURANT, DATE, [order("a", total=1), order("b", total=2)], checkpoint=100.0)
+
+    merged = sync.merge(RESTAURANT, DATE, [order("b", "2025-01-02T13:00:00.000+0000", total=3), order("c")], 200.0)
+
+    assert [(o["guid"], o.get("total")) for o in merged] == [("a", 1), ("b", 3), ("c", None)]
+    assert sync.get(RESTAURANT, DATE) == (200.0, merged)
+
+
+def test_merge_keeps_a_newer_stored_order(sync):
+    newer = order("a", "2025-01-02T14:00:00.000+0000", total=2)
+    sync.put(RESTAURANT, DATE, [newer], checkpoint=100.0)
+
+    merged = sync.merge(RESTAURANT, DATE, [order("a", "2025-01-02T13:00:00.000+0000", total=1)], 200.0)
+
+    assert merged == [newer]
+
+
+def test_merge_never_moves_the_checkpoint_back(sync):
+    sync.put(RESTAURANT, DATE, [order("a")], checkpoint=300.0)
+
+    sync.merge(RESTAURANT, DATE, [], 200.0)
+    assert sync.get(RESTAURANT, DATE)[0] == 300.0
+
+    sync.merge(RESTAURANT, DATE, [order("b")], None)
+    assert sync.get(RESTAURANT, DATE)[0] == 300.0
+
+
+def test_merge_needs_a_synced_copy(sync):
+    assert sync.merge(RESTAURANT, DATE, [order("a")], 200.0) is None
+    assert sync.get(RESTAURANT, DATE) is None
+
+
+def test_discard(sync):
+    sync.put(RESTAURANT, DATE, [order("a")], checkpoint=100.0)
+
+    sync.discard(RESTAURANT, DATE)
+    sync.discard(RESTAURANT, DATE)
+
+    assert sync.get(RESTAURANT, DATE) is None
+
+
+class FakeOrders:
+    """Answers ordersBulk pages: the whole day by businessDate, changes by date range."""
+
+    def __init__(self, day_orders, changed_orders):
+        self.day_orders = day_orders
+        self.changed_orders = changed_orders
+        self.requests = []
+
+    def fetch_page(self, param_type, start_date, end_date, page, page_size, projection=None):
+        self.requests.append(param_type)
+        orders = self.day_orders if param_type == "businessDate" else self.changed_orders
+        return orders[(page - 1) * page_size:page * page_size]
+
+
+def test_client_fetches_only_changes_after_the_first_request(toast_config, write_cassette, monkeypatch):
+    today = datetime.date.today()
+    business_date = int(today.strftime("%Y%m%d"))
+    start, end = f"{today}T00:00:00.000Z", f"{today}T23:59:59.999Z"
+    client = ToastAPIClient(location_index=1,
+                            transport=ReplayTransport(write_cassette([]), auth_url=toast_config.TOAST_AUTH_URL))
+    # Replays never sync, so give the client a store by hand
+    client.order_sync = OrderSyncStore(toast_config.TOAST_CACHE_DIR)
+    client.order_sync_overlap = 300
+    fake = FakeOrders(
+        day_orders=[order("a", businessDate=business_date), order("b", businessDate=business_date)],
+        changed_orders=[order("b", "2025-01-02T13:00:00.000+0000", businessDate=business_date, voided=True),
+                        order("c", businessDate=business_date),
+                        # Modified within the range but for the previous business day
+                        order("z", businessDate=business_date - 1)]
+    )
+    monkeypatch.setattr(client, "_fetch_orders_page", fake.fetch_page)
+
+    first = client.get_orders(start, end)
+    second = client.get_orders(start, end)
+
+    assert fake.requests == ["businessDate", "dateRange"]
+    assert [o["guid"] for o in first["orders"]] == ["a", "b"]
+    assert [o["guid"] for o in second["orders"]] == ["a", "b", "c"]
+    assert second["orders"][1]["voided"] is True
@@ -0,0 +1,113 @@
+"""Tests for ordersBulk pagination and time windows in ToastAPIClient."""
+import random
+import threading
+import time
+
+import pytest
+import requests
+
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from server.window_planner import parse_timestamp
+from tests.conftest import recorded
+
+ORDERS = "/orders/v2/ordersBulk"
+DAY_START = "2025-01-02T00:00:00.000Z"
+DAY_END = "2025-01-02T23:59:59.999Z"
+
+
+def replay_client(config, cassette_path):
+    return ToastAPIClient(location_index=1, transport=ReplayTransport(cassette_path, auth_url=config.TOAST_AUTH_URL))
+
+
+def full_page(prefix, size=100):
+    return [{"guid": f"{prefix}-{i}", "businessDate": 20250102} for i in range(size)]
+
+
+def test_failed_later_page_raises(toast_config, write_cassette):
+    # Page 2 is missing, so the day can only be fetched in part
+    path = write_cassette([
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "1", "pageSize": "100"}, full_page("a")),
+    ])
+    client = replay_client(toast_config, path)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_orders(DAY_START, DAY_END)
+
+
+def test_failed_later_page_with_concurrent_pages_raises(toast_config, write_cassette):
+    path = write_cassette([
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "1", "pageSize": "100"}, full_page("a")),
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "2", "pageSize": "100"}, full_page("b")),
+    ])
+    client = replay_client(toast_config, path)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_orders(DAY_START, DAY_END, max_concurrency=3)
+
+
+def test_failed_date_range_fallback_raises(toast_config, write_cassette):
+    client = replay_client(toast_config, write_cassette([]))
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_orders(DAY_START, DAY_END)
+
+
+class FakeOrders:
+    """Answers ordersBulk date range pages from a fixed set of orders, in a random time."""
+
+    def __init__(self, order_times, page_size):
+        self.order_times = order_times
+        self.page_size = page_size
+        self.ranges = []
+        self.lock = threading.Lock()
+        self.fail_after = None
+
+    def fetch_page(self, param_type, start_date, end_date, page, page_size, projection=None):
+        start, end = parse_timestamp(start_date), parse_timestamp(end_date)
+        with self.lock:
+            self.ranges.append((start_date, end_date, page))
+        # Finish in a different order from one run to the next
+        time.sleep(random.uniform(0, 0.005))
+        if self.fail_after is not None and start >= self.fail_after:
+            raise requests.exceptions.ConnectionError("window failed")
+        matching = [{"guid": str(t)} for t in self.order_times if start <= t <= end]
+        return matching[(page - 1) * page_size:page * page_size]
+
+
+def fetch_in_windows(config, monkeypatch, cassette_path, fake):
+    monkeypatch.setattr(config, 'TOAST_ORDERS_WINDOW_CONCURRENCY', 4)
+    monkeypatch.setattr(config, 'TOAST_PAGE_SIZES', f"{ORDERS}={fake.page_size}")
+    # The cassette only answers authentication; pages come from the fake
+    client = replay_client(config, cassette_path)
+    monkeypatch.setattr(client, "_fetch_orders_page", fake.fetch_page)
+    return client.get_orders("2025-01-01T00:00:00.000Z", "2025-01-07T23:59:59.999Z")
+
+
+def busy_week():
+    # An order every two minutes from 11:00 to 22:00, every day of the week
+    start = parse_timestamp("2025-01-01T00:00:00.000Z")
+    return [start + day * 86400 + hour * 3600 + minute * 60
+            for day in range(7) for hour in range(11, 22) for minute in range(0, 60, 2)]
+
+
+def test_windows_are_the_same_however_requests_race(toast_config, monkeypatch, write_cassette):
+    order_times = busy_week()
+    path = write_cassette([])
+    runs = []
+    for _ in range(3):
+        fake = FakeOrders(order_times, page_size=10)
+        result = fetch_in_windows(toast_config, monkeypatch, path, fake)
+        assert result["totalCount"] == len(order_times)
+        runs.append(sorted(fake.ranges))
+
+    assert runs[0] == runs[1] == runs[2]
+
+
+def test_failed_later_window_raises(toast_config, monkeypatch, write_cassette):
+    fake = FakeOrders(busy_week(), page_size=10)
+    fake.fail_after = parse_timestamp("2025-01-04T00:00:00.000Z")
+
+    with pytest.raises(requests.exceptions.RequestException, match="window failed"):
+        fetch_in_windows(toast_config, monkeypatch, write_cassette([]), fake)
+    assert fake.ranges
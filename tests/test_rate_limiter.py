@@ -0,0 +1,118 @@
+"""Tests for the shared token-bucket rate limiter (server/rate_limiter.py)."""
+import pytest
+
+from server.rate_limiter import TokenBucketRateLimiter, parse_rate_limits, parse_retry_after
+
+ORDERS = "/orders/v2/ordersBulk"
+EMPLOYEES = "/labor/v1/employees"
+JOBS = "/labor/v1/jobs"
+RESTAURANT = "2437b9ff-00d5-4cec-b629-704f72e5f5ae"
+OTHER_RESTAURANT = "b6f3c0e1-0000-4000-8000-000000000000"
+
+
+def limiter(tmp_path, spec):
+    # Rates of one request per ten seconds keep refills out of the way of the test
+    return TokenBucketRateLimiter(str(tmp_path), parse_rate_limits(spec))
+
+
+def take(rate_limiter, endpoint, count, restaurant_guid=RESTAURANT):
+    return [rate_limiter.try_acquire(endpoint, restaurant_guid) == 0 for _ in range(count)]
+
+
+def test_endpoints_share_the_restaurant_budget(tmp_path):
+    rate_limiter = limiter(tmp_path, "default=1/10:3")
+
+    assert take(rate_limiter, EMPLOYEES, 2) == [True, True]
+    assert take(rate_limiter, JOBS, 2) == [True, False]
+
+
+def test_restaurants_have_separate_budgets(tmp_path):
+    rate_limiter = limiter(tmp_path, "default=1/10:2")
+
+    assert take(rate_limiter, EMPLOYEES, 3) == [True, True, False]
+    assert take(rate_limiter, EMPLOYEES, 2, OTHER_RESTAURANT) == [True, True]
+
+
+def test_endpoint_limit_applies_on_top_of_the_restaurant_budget(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=1/10:4;{ORDERS}=1/10:2")
+
+    # ordersBulk runs out of its own budget first...
+    assert take(rate_limiter, ORDERS, 3) == [True, True, False]
+    # ...and what it used came out of the restaurant's budget as well
+    assert take(rate_limiter, EMPLOYEES, 3) == [True, True, False]
+
+
+def test_endpoint_waits_for_an_empty_restaurant_budget(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=1/10:2;{ORDERS}=1/10:5")
+
+    assert take(rate_limiter, EMPLOYEES, 2) == [True, True]
+    assert rate_limiter.try_acquire(ORDERS, RESTAURANT) == pytest.approx(10, abs=0.5)
+
+
+def test_refused_request_takes_no_tokens(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=1/10:1;{ORDERS}=1/10:1")
+
+    assert take(rate_limiter, EMPLOYEES, 1) == [True]
+    # The restaurant budget is empty, so ordersBulk keeps its own token
+    assert take(rate_limiter, ORDERS, 1) == [False]
+    state = rate_limiter._read_state()
+    assert f"{ORDERS}@{RESTAURANT}" not in state
+
+
+def test_limiters_share_buckets_through_the_state_file(tmp_path):
+    first = limiter(tmp_path, "default=1/10:2")
+    second = limiter(tmp_path, "default=1/10:2")
+
+    assert take(first, EMPLOYEES, 1) == [True]
+    assert take(second, JOBS, 2) == [True, False]
+
+
+def test_restaurant_rule_overrides_the_default(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=1/10:5;{RESTAURANT}=1/10:1")
+
+    assert take(rate_limiter, EMPLOYEES, 2) == [True, False]
+    assert take(rate_limiter, EMPLOYEES, 2, OTHER_RESTAURANT) == [True, True]
+
+
+def test_429_on_a_shared_endpoint_slows_the_whole_restaurant(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=20/1;{ORDERS}=5/1")
+
+    rate_limiter.throttled(EMPLOYEES, RESTAURANT)
+
+    assert rate_limiter.current_rate(JOBS, RESTAURANT) == pytest.approx(10, rel=0.05)
+    assert rate_limiter.current_rate(ORDERS, RESTAURANT) == pytest.approx(5, rel=0.05)
+
+
+def test_429_on_a_limited_endpoint_only_slows_that_endpoint(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=20/1;{ORDERS}=5/1")
+
+    rate_limiter.throttled(ORDERS, RESTAURANT)
+
+    assert rate_limiter.current_rate(ORDERS, RESTAURANT) == pytest.approx(2.5, rel=0.05)
+    assert rate_limiter.current_rate(JOBS, RESTAURANT) == pytest.approx(20)
+
+
+def test_retry_after_blocks_the_narrowest_bucket(tmp_path):
+    rate_limiter = limiter(tmp_path, f"default=20/1;{ORDERS}=5/1")
+
+    rate_limiter.defer(ORDERS, RESTAURANT, 30)
+
+    assert rate_limiter.current_rate(ORDERS, RESTAURANT) == 0.0
+    assert rate_limiter.try_acquire(ORDERS, RESTAURANT) == pytest.approx(30, abs=0.5)
+    assert rate_limiter.try_acquire(JOBS, RESTAURANT) == 0
+
+
+def test_parse_rate_limits():
+    limits = parse_rate_limits(f"default=10/2;{ORDERS}=3/1:6")
+
+    assert limits["default"] == (5.0, 10.0)
+    assert limits[ORDERS] == (3.0, 6.0)
+    with pytest.raises(ValueError):
+        parse_rate_limits("default=fast")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,105 @@
+"""Tests for the on-disk response cache (server/response_cache.py)."""
+import pytest
+
+from server.response_cache import ResponseCache
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from tests.conftest import recorded
+
+RESTAURANT = "2437b9ff-00d5-4cec-b629-704f72e5f5ae"
+JOBS = "/labor/v1/jobs"
+JOBS_BODY = [{"guid": "job-1", "title": "Server"}]
+
+
+def test_put_and_get(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+
+    assert cache.get(RESTAURANT, JOBS) is None
+    cache.put(RESTAURANT, JOBS, None, JOBS_BODY, etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+
+    entry = cache.get(RESTAURANT, JOBS)
+    assert entry["body"] == JOBS_BODY
+    assert entry["etag"] == '"v1"'
+    assert entry["last_modified"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert cache.get("other-restaurant", JOBS) is None
+    assert cache.get(RESTAURANT, JOBS, {"jobIds": "job-1"}) is None
+
+
+def test_key_ignores_parameter_order(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put(RESTAURANT, JOBS, {"a": "1", "b": "2"}, JOBS_BODY)
+
+    assert cache.get(RESTAURANT, JOBS, {"b": "2", "a": "1"})["body"] == JOBS_BODY
+
+
+def test_entries_go_stale_and_touch_renews_them(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put(RESTAURANT, JOBS, None, JOBS_BODY, etag='"v1"')
+    assert cache.is_fresh(cache.get(RESTAURANT, JOBS))
+
+    clock.advance(61)
+    entry = cache.get(RESTAURANT, JOBS)
+    assert not cache.is_fresh(entry)
+
+    cache.touch(RESTAURANT, JOBS, None, entry)
+    assert cache.is_fresh(cache.get(RESTAURANT, JOBS))
+    assert cache.get(RESTAURANT, JOBS)["etag"] == '"v1"'
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put(RESTAURANT, JOBS, None, JOBS_BODY)
+    with open(cache._path(RESTAURANT, JOBS, None), "w") as f:
+        f.write("{")
+
+    assert cache.get(RESTAURANT, JOBS) is None
+
+
+@pytest.fixture
+def cache_config(toast_config, monkeypatch):
+    monkeypatch.setattr(toast_config, 'TOAST_RESPONSE_CACHE', True)
+    monkeypatch.setattr(toast_config, 'TOAST_RESPONSE_CACHE_TTL', 60, raising=False)
+    return toast_config
+
+
+def cached_client(config, path, monkeypatch):
+    """Replay client that also records the headers of every request it sends."""
+    transport = ReplayTransport(path, auth_url=config.TOAST_AUTH_URL)
+    sent = []
+    send = transport.send
+
+    def recording_send(request, **kwargs):
+        sent.append(request.headers)
+        return send(request, **kwargs)
+
+    monkeypatch.setattr(transport, "send", recording_send)
+    return ToastAPIClient(location_index=1, transport=transport), sent
+
+
+def test_fresh_entry_is_served_without_a_request(cache_config, write_cassette, monkeypatch, clock):
+    path = write_cassette([recorded("GET", JOBS, body=JOBS_BODY)])
+    client, sent = cached_client(cache_config, path, monkeypatch)
+    sent.clear()
+
+    assert client.get_jobs() == JOBS_BODY
+    assert client.get_jobs() == JOBS_BODY
+    assert len(sent) == 1
+
+
+def test_stale_entry_is_revalidated(cache_config, write_cassette, monkeypatch, clock):
+    fetched = recorded("GET", JOBS, body=JOBS_BODY)
+    fetched["headers"]["ETag"] = '"v1"'
+    not_modified = recorded("GET", JOBS, status=304)
+    not_modified["body"] = ""
+    client, sent = cached_client(cache_config, write_cassette([fetched, not_modified]), monkeypatch)
+    sent.clear()
+
+    client.get_jobs()
+    clock.advance(61)
+
+    assert client.get_jobs() == JOBS_BODY
+    assert "If-None-Match" not in sent[0]
+    assert sent[1]["If-None-Match"] == '"v1"'
+    # The 304 restarted the TTL
+    client.get_jobs()
+    assert len(sent) == 2
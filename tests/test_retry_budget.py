@@ -0,0 +1,89 @@
+"""Tests for the shared retry budget (server/retry_budget.py)."""
+import pytest
+
+from server.retry_budget import RetryBudget, RetryBudgetExhaustedError, full_jitter, shared_retry_budget
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from tests.conftest import recorded
+
+
+def spend(budget, times):
+    return [budget.try_spend() for _ in range(times)]
+
+
+@pytest.fixture(params=["memory", "file"])
+def make_budget(request, tmp_path, clock):
+    state_dir = str(tmp_path) if request.param == "file" else None
+
+    def make(**kwargs):
+        return RetryBudget(state_dir=state_dir, **kwargs)
+    return make
+
+
+def test_starts_full_and_runs_out(make_budget):
+    budget = make_budget(ratio=0.1, min_per_second=0, max_balance=3)
+
+    assert spend(budget, 4) == [True, True, True, False]
+
+
+def test_successes_earn_retries(make_budget):
+    budget = make_budget(ratio=0.5, min_per_second=0, max_balance=3)
+    spend(budget, 3)
+
+    budget.record_success()
+    assert spend(budget, 1) == [False]
+    budget.record_success()
+    budget.record_success()
+    assert spend(budget, 2) == [True, False]
+
+
+def test_allowance_accrues_over_time(make_budget, clock):
+    budget = make_budget(ratio=0, min_per_second=0.5, max_balance=3)
+    spend(budget, 3)
+
+    clock.advance(2)
+
+    assert spend(budget, 2) == [True, False]
+
+
+def test_balance_is_capped(make_budget, clock):
+    budget = make_budget(ratio=1, min_per_second=0.5, max_balance=2)
+    for _ in range(10):
+        budget.record_success()
+    clock.advance(60)
+
+    assert spend(budget, 3) == [True, True, False]
+
+
+def test_budgets_share_the_balance_file(tmp_path, clock):
+    first = RetryBudget(min_per_second=0, max_balance=2, state_dir=str(tmp_path))
+    second = RetryBudget(min_per_second=0, max_balance=2, state_dir=str(tmp_path))
+
+    assert spend(first, 1) == [True]
+    assert spend(second, 2) == [True, False]
+
+
+def test_shared_budget_is_one_per_ratio_and_directory(tmp_path):
+    assert shared_retry_budget(0.1) is shared_retry_budget(0.1)
+    assert shared_retry_budget(0.1) is not shared_retry_budget(0.2)
+    assert shared_retry_budget(0.1, str(tmp_path)) is not shared_retry_budget(0.1)
+
+
+def test_full_jitter_stays_within_the_backoff():
+    delays = [full_jitter(4.0) for _ in range(200)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_client_stops_retrying_when_the_budget_is_spent(toast_config, write_cassette, monkeypatch, clock):
+    monkeypatch.setattr(toast_config, 'TOAST_RETRY_BUDGET', True)
+    # Keep the balance in this test's cache directory rather than in the process
+    monkeypatch.setattr(toast_config, 'TOAST_RETRY_BUDGET_PROCESSES', True, raising=False)
+    path = write_cassette([recorded("GET", "/labor/v1/jobs", body={"message": "oops"}, status=500)])
+    client = ToastAPIClient(location_index=1, transport=ReplayTransport(path, auth_url=toast_config.TOAST_AUTH_URL))
+    while client.retry_budget.try_spend():
+        pass
+
+    with pytest.raises(RetryBudgetExhaustedError):
+        client.get_jobs()
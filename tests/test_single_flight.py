@@ -0,0 +1,110 @@
+"""Tests for single-flight request coalescing (server/single_flight.py)."""
+import threading
+import time
+
+from server.single_flight import SingleFlight
+
+
+def run_together(single_flight, key, fn, callers=5):
+    """Call single_flight.do from several threads at once and collect what each got."""
+    outcomes = [None] * callers
+
+    def call(i):
+        try:
+            outcomes[i] = single_flight.do(key, fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def blocking_call(result=None, error=None):
+    """A call that counts its runs and only finishes once released."""
+    release = threading.Event()
+    runs = []
+
+    def fn():
+        runs.append(1)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+    return fn, release, runs
+
+
+def test_identical_calls_share_one_run():
+    fn, release, runs = blocking_call(result={"orders": [1, 2]})
+    threads, outcomes = run_together(SingleFlight(), "key-shared", fn)
+    # Give every thread time to join the leader's call
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert runs == [1]
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert outcomes[0] == {"orders": [1, 2]}
+
+
+def test_error_reaches_every_caller():
+    error = ValueError("boom")
+    fn, release, runs = blocking_call(error=error)
+    threads, outcomes = run_together(SingleFlight(), "key-error", fn)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert runs == [1]
+    assert all(outcome is error for outcome in outcomes)
+
+
+def test_separate_instances_coalesce():
+    fn, release, runs = blocking_call(result="shared")
+    leader = threading.Thread(target=SingleFlight().do, args=("key-instances", fn))
+    leader.start()
+    time.sleep(0.1)
+    threads, outcomes = run_together(SingleFlight(), "key-instances", fn, callers=2)
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join()
+
+    assert runs == [1]
+    assert outcomes == ["shared", "shared"]
+
+
+def test_different_keys_run_separately():
+    single_flight = SingleFlight()
+
+    assert single_flight.do("key-a", lambda: "a") == "a"
+    assert single_flight.do("key-b", lambda: "b") == "b"
+
+
+def test_finished_call_is_not_reused():
+    single_flight = SingleFlight()
+    runs = []
+
+    for _ in range(2):
+        single_flight.do("key-again", lambda: runs.append(1))
+
+    assert runs == [1, 1]
+
+
+def test_shared_results_are_not_reused_by_later_calls(tmp_path):
+    single_flight = SingleFlight(str(tmp_path))
+    results = iter(["first", "second"])
+
+    assert single_flight.do("key-file", lambda: next(results)) == "first"
+    # A result published before this call started is stale
+    assert SingleFlight(str(tmp_path)).do("key-file", lambda: next(results)) == "second"
+
+
+def test_make_key_ignores_dict_order():
+    key = SingleFlight.make_key("guid", "/orders/v2/ordersBulk", {"page": "1", "pageSize": "100"})
+
+    assert key == SingleFlight.make_key("guid", "/orders/v2/ordersBulk", {"pageSize": "100", "page": "1"})
+    assert key != SingleFlight.make_key("guid", "/orders/v2/ordersBulk", {"page": "2", "pageSize": "100"})
@@ -0,0 +1,38 @@
+"""Tests for get_time_entries on the blocking and async clients."""
+import asyncio
+
+import pytest
+
+from server.async_toast_client import AsyncToastAPIClient
+from server.toast_client import ToastAPIClient
+from server.transport import ReplayTransport
+from tests.conftest import recorded
+
+TIME_ENTRIES = "/labor/v1/timeEntries"
+START = "2025-01-02T00:00:00.000Z"
+END = "2025-01-02T23:59:59.999Z"
+ENTRIES = [{"guid": "t1", "inDate": START}, {"guid": "t2", "inDate": START}]
+PARAMS = {"startDate": START, "endDate": END, "includeArchived": "true", "includeMissedBreaks": "true"}
+
+
+@pytest.mark.parametrize("body", [ENTRIES, {"timeEntries": ENTRIES}])
+def test_blocking_client_returns_a_list(toast_config, write_cassette, body):
+    path = write_cassette([recorded("GET", TIME_ENTRIES, PARAMS, body)])
+    client = ToastAPIClient(location_index=1, transport=ReplayTransport(path, auth_url=toast_config.TOAST_AUTH_URL))
+
+    assert client.get_time_entries(START, END) == ENTRIES
+
+
+@pytest.mark.parametrize("body", [ENTRIES, {"timeEntries": ENTRIES}])
+def test_async_client_returns_the_same_list(toast_config, monkeypatch, body):
+    client = AsyncToastAPIClient()
+    requested = []
+
+    async def make_request(endpoint, params=None, **kwargs):
+        requested.append((endpoint, params))
+        return body
+
+    monkeypatch.setattr(client, "_make_request", make_request)
+
+    assert asyncio.run(client.get_time_entries(START, END)) == ENTRIES
+    assert requested == [(TIME_ENTRIES, PARAMS)]
@@ -0,0 +1,126 @@
+"""Tests for record/replay transports (server/transport.py)."""
+import gzip
+import json
+import time
+
+import pytest
+import requests
+
+from server.toast_client import ToastAPIClient
+from server.transport import CassetteMissError, RecordingTransport, ReplayTransport
+from tests.conftest import recorded
+
+ORDERS = "/orders/v2/ordersBulk"
+DAY_START = "2025-01-02T00:00:00.000Z"
+DAY_END = "2025-01-02T23:59:59.999Z"
+
+
+def replay_client(config, cassette_path):
+    return ToastAPIClient(location_index=1, transport=ReplayTransport(cassette_path, auth_url=config.TOAST_AUTH_URL))
+
+
+def test_cassette_miss_is_a_request_exception():
+    assert issubclass(CassetteMissError, requests.exceptions.RequestException)
+
+
+def test_replay_serves_recorded_responses_in_order(toast_config, write_cassette):
+    params = {"businessDate": "20250102", "page": "1", "pageSize": "100"}
+    path = write_cassette([
+        recorded("GET", ORDERS, params, {"message": "slow down"}, status=429),
+        recorded("GET", ORDERS, params, [{"guid": "a"}]),
+    ])
+    transport = ReplayTransport(path)
+    session = requests.Session()
+    session.mount("https://", transport)
+    headers = {"Toast-Restaurant-External-ID": toast_config.LOCATION_GUID_MAP[1]}
+    url = f"{toast_config.TOAST_API_BASE_URL}{ORDERS}"
+
+    statuses = [session.get(url, params=params, headers=headers).status_code for _ in range(3)]
+
+    # The last recorded response repeats once the recording runs out
+    assert statuses == [429, 200, 200]
+
+
+def test_unrecorded_request_fails_without_retries(toast_config, write_cassette):
+    client = replay_client(toast_config, write_cassette([]))
+
+    started = time.monotonic()
+    with pytest.raises(CassetteMissError):
+        client.get_jobs()
+
+    # A miss would only miss again, so it is not retried with backoff
+    assert time.monotonic() - started < ToastAPIClient.INITIAL_BACKOFF_SECONDS
+
+
+def test_replayed_run_with_unrecorded_request_uses_the_fallback(toast_config, write_cassette):
+    # Recorded while businessDate failed and the date range fallback answered; the
+    # businessDate request itself is not in the cassette
+    path = write_cassette([
+        recorded("GET", ORDERS, {"startDate": DAY_START, "endDate": DAY_END, "page": "1", "pageSize": "100"},
+                 [{"guid": "a", "businessDate": 20250102}, {"guid": "b", "businessDate": 20250102}]),
+    ])
+    client = replay_client(toast_config, path)
+
+    result = client.get_orders(DAY_START, DAY_END)
+
+    assert [order["guid"] for order in result["orders"]] == ["a", "b"]
+
+
+def test_replaying_twice_fetches_the_whole_day_both_times(toast_config, write_cassette, monkeypatch):
+    monkeypatch.setattr(toast_config, 'TOAST_ORDER_SYNC', True)
+    path = write_cassette([
+        recorded("GET", ORDERS, {"businessDate": "20250102", "page": "1", "pageSize": "100"},
+                 [{"guid": "a", "businessDate": 20250102}]),
+    ])
+
+    # The second replay shares the first one's cache directory, where a live run would
+    # have left a synced copy and asked only for the orders modified since then
+    first = replay_client(toast_config, path).get_orders(DAY_START, DAY_END)
+    second_client = replay_client(toast_config, path)
+    second = second_client.get_orders(DAY_START, DAY_END)
+
+    assert second_client.order_sync is None
+    assert first == second == {"orders": [{"guid": "a", "businessDate": 20250102}], "totalCount": 1}
+
+
+def test_employee_batches_do_not_depend_on_input_order(toast_config, write_cassette):
+    guids = [f"{i:08d}-0000-0000-0000-000000000000" for i in range(5)]
+    path = write_cassette([
+        recorded("GET", "/labor/v1/employees", {"employeeIds": ",".join(guids)},
+                 [{"guid": guid, "firstName": f"E{i}"} for i, guid in enumerate(guids)]),
+    ])
+    client = replay_client(toast_config, path)
+
+    employees = client.get_employees(reversed(guids))
+
+    assert [employee["guid"] for employee in employees] == list(reversed(guids))
+
+
+def fake_toast(request):
+    """Answer a request the way Toast would, with a fresh token on every login."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers["Content-Type"] = "application/json"
+    response.url = request.url
+    response.request = request
+    if request.method == "POST":
+        body = {"token": {"accessToken": f"secret-{time.time()}", "expiresIn": 86400, "tokenType": "Bearer"}}
+    else:
+        body = [{"guid": "a", "businessDate": 20250102}, {"guid": "b", "businessDate": 20250102}]
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+def test_recorded_run_replays_the_same_result(toast_config, tmp_path, monkeypatch):
+    path = str(tmp_path / "recorded.jsonl.gz")
+    with monkeypatch.context() as patched:
+        patched.setattr(requests.adapters.HTTPAdapter, "send", lambda self, request, **kwargs: fake_toast(request))
+        live = ToastAPIClient(location_index=1, transport=RecordingTransport(path)).get_orders(DAY_START, DAY_END)
+    replayed = [replay_client(toast_config, path).get_orders(DAY_START, DAY_END) for _ in range(2)]
+
+    assert live["totalCount"] == 2
+    assert replayed == [live, live]
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        cassette = f.read()
+    assert "secret-" not in cassette
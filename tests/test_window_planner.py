@@ -0,0 +1,72 @@
+"""Tests for adaptive date range windows (server/window_planner.py)."""
+import pytest
+
+from server.window_planner import WindowPlanner, parse_timestamp
+
+HOUR = 3600.0
+DAY = 86400.0
+START = parse_timestamp("2025-01-01T00:00:00.000Z")
+
+
+def all_windows(planner, orders_per_hour):
+    """Plan the whole range, counting orders_per_hour orders for each hour of every window."""
+    windows = []
+    while True:
+        window = planner.next_window()
+        if window is None:
+            return windows
+        windows.append(window)
+        planner.record(window, int(orders_per_hour * (window[1] - window[0]) / HOUR))
+
+
+@pytest.mark.parametrize("value", [
+    "2025-01-01T00:00:00.000Z",
+    "2025-01-01T00:00:00.000+0000",
+    "2025-01-01T00:00:00+00:00",
+    "2025-01-01T00:00:00",
+    "2024-12-31T16:00:00.000-0800",
+])
+def test_parse_timestamp(value):
+    assert parse_timestamp(value) == START
+
+
+def test_windows_cover_the_range_without_overlap():
+    planner = WindowPlanner(START, START + 7 * DAY - 0.001, target_orders=100)
+
+    windows = all_windows(planner, orders_per_hour=30)
+
+    assert windows[0][0] == START
+    assert windows[-1][1] == START + 7 * DAY - 0.001
+    for previous, current in zip(windows, windows[1:]):
+        assert current[0] == pytest.approx(previous[1] + 0.001)
+    assert planner.window_count == len(windows)
+
+
+def test_windows_follow_the_order_density():
+    planner = WindowPlanner(START, START + 7 * DAY, target_orders=100, initial_seconds=HOUR)
+    window = planner.next_window()
+    planner.record(window, 50)
+
+    # 50 orders an hour: 100 orders take two hours, give or take the rounding down to
+    # whole minutes
+    start, end = planner.next_window()
+    assert 2 * HOUR - 120 < end - start <= 2 * HOUR
+
+
+def test_window_sizes_are_clamped():
+    busy = WindowPlanner(START, START + 7 * DAY, target_orders=10)
+    busy.record(busy.next_window(), 10_000)
+    quiet = WindowPlanner(START, START + 7 * DAY, target_orders=10)
+    quiet.record(quiet.next_window(), 0)
+
+    busy_start, busy_end = busy.next_window()
+    quiet_start, quiet_end = quiet.next_window()
+    assert busy_end - busy_start == pytest.approx(WindowPlanner.MIN_WINDOW_SECONDS, abs=0.01)
+    assert quiet_end - quiet_start == pytest.approx(WindowPlanner.MAX_WINDOW_SECONDS, abs=0.01)
+
+
+def test_same_counts_plan_the_same_windows():
+    plans = [all_windows(WindowPlanner(START, START + 14 * DAY, target_orders=200), orders_per_hour=45)
+             for _ in range(2)]
+
+    assert plans[0] == plans[1]